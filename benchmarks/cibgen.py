@@ -0,0 +1,191 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+"""Synthetic CIB generator and helpers shared by benchmark runner and stand-in executables."""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import argparse
+import random
+import xml.etree.ElementTree as ET
+
+# operations created by 'pcs resource create' for ocf:pacemaker:Dummy
+DEFAULT_OPS = [
+    ('migrate_from', '0s', '20s'),
+    ('migrate_to', '0s', '20s'),
+    ('monitor', '10s', '20s'),
+    ('reload', '0s', '20s'),
+    ('start', '0s', '20s'),
+    ('stop', '0s', '20s'),
+]
+
+
+def split_resource_type(resource_type):
+    # 'ocf:pacemaker:Dummy' -> ('ocf', 'pacemaker', 'Dummy'), 'stonith:fence_xvm' -> ('stonith', None, 'fence_xvm')
+    parts = resource_type.split(':')
+    if len(parts) == 3:
+        return parts[0], parts[1], parts[2]
+    if len(parts) == 2:
+        return parts[0], None, parts[1]
+    return 'ocf', 'heartbeat', parts[0]
+
+
+def nvset(parent, tag, set_id, nvpairs):
+    element = ET.SubElement(parent, tag, {'id': set_id})
+    for name, value in nvpairs:
+        ET.SubElement(element, 'nvpair', {'id': '%s-%s' % (set_id, name), 'name': name, 'value': value})
+    return element
+
+
+def primitive(parent, resource_id, resource_type, instance_attributes=None, meta_attributes=None):
+    """Create primitive the same way as stand-in 'pcs resource create' does."""
+    rsc_class, provider, rsc_type = split_resource_type(resource_type)
+    attrib = {'id': resource_id, 'class': rsc_class, 'type': rsc_type}
+    if provider is not None:
+        attrib['provider'] = provider
+    element = ET.SubElement(parent, 'primitive', attrib)
+    if instance_attributes:
+        nvset(element, 'instance_attributes', resource_id + '-instance_attributes', instance_attributes)
+    if meta_attributes:
+        nvset(element, 'meta_attributes', resource_id + '-meta_attributes', meta_attributes)
+    operations = ET.SubElement(element, 'operations')
+    ops = DEFAULT_OPS if rsc_class != 'stonith' else [('monitor', '60s', None)]
+    for name, interval, timeout in ops:
+        op = ET.SubElement(operations, 'op', {'id': '%s-%s-interval-%s' % (resource_id, name, interval),
+                                               'name': name, 'interval': interval})
+        if timeout is not None:
+            op.set('timeout', timeout)
+    return element
+
+
+def empty_cib(epoch=1):
+    cib = ET.Element('cib', {'admin_epoch': '0', 'epoch': str(epoch), 'num_updates': '0', 'validate-with': 'pacemaker-3.9',
+                             'crm_feature_set': '3.19.0', 'have-quorum': '1', 'dc-uuid': '1'})
+    configuration = ET.SubElement(cib, 'configuration')
+    for section in ['crm_config', 'nodes', 'resources', 'constraints']:
+        ET.SubElement(configuration, section)
+    nvset(configuration.find('crm_config'), 'cluster_property_set', 'cib-bootstrap-options',
+          [('have-watchdog', 'false'), ('cluster-infrastructure', 'corosync'), ('cluster-name', 'bench')])
+    ET.SubElement(cib, 'status')
+    return cib
+
+
+def generate_cib(resources=100, nodes=3, constraints_ratio=1.0, fencing_levels=True, ops_per_resource=3, seed=42):
+    """Generate CIB with given number of resources and related constraints, fencing levels and status history.
+
+    About 10% of resources are in groups of 5 and 5% are cloned. For every resource there is about
+    constraints_ratio location/order/colocation constraint. Status section contains operation history
+    of ops_per_resource operations for every resource on every node.
+    """
+    rnd = random.Random(seed)
+    cib = empty_cib()
+    configuration = cib.find('configuration')
+    node_names = ['node%d' % (i + 1) for i in range(nodes)]
+    for i, name in enumerate(node_names):
+        ET.SubElement(configuration.find('nodes'), 'node', {'id': str(i + 1), 'uname': name})
+
+    section = configuration.find('resources')
+    resource_ids = []
+    group = None
+    for i in range(resources):
+        resource_id = 'rsc-%d' % i
+        resource_ids.append(resource_id)
+        if i % 10 == 0 and i % 20 != 0:
+            group = ET.SubElement(section, 'group', {'id': 'grp-%d' % i})
+        if group is not None and i % 10 < 5:
+            primitive(group, resource_id, 'ocf:pacemaker:Dummy', [('state', '/run/%s.state' % resource_id)])
+            continue
+        group = None
+        if i % 20 == 19:
+            clone = ET.SubElement(section, 'clone', {'id': resource_id + '-clone'})
+            primitive(clone, resource_id, 'ocf:pacemaker:Dummy', [('state', '/run/%s.state' % resource_id)])
+        else:
+            primitive(section, resource_id, 'ocf:pacemaker:Dummy', [('state', '/run/%s.state' % resource_id)])
+
+    stonith_ids = []
+    for name in node_names:
+        stonith_id = 'fence-' + name
+        stonith_ids.append(stonith_id)
+        primitive(section, stonith_id, 'stonith:fence_xvm', [('pcmk_host_list', name)])
+
+    constraints = configuration.find('constraints')
+    for i in range(int(resources * constraints_ratio)):
+        kind = i % 3
+        resource_id = resource_ids[i % len(resource_ids)]
+        other_id = resource_ids[rnd.randrange(len(resource_ids))]
+        if kind == 0:
+            node = node_names[i % nodes]
+            ET.SubElement(constraints, 'rsc_location', {'id': 'location-%s-%s-%d' % (resource_id, node, i), 'rsc': resource_id,
+                                                        'node': node, 'score': str(rnd.choice([100, 200, 'INFINITY']))})
+        elif kind == 1:
+            ET.SubElement(constraints, 'rsc_order', {'id': 'order-%s-%s-%d' % (resource_id, other_id, i), 'first': resource_id,
+                                                     'first-action': 'start', 'then': other_id, 'then-action': 'start',
+                                                     'kind': 'Mandatory'})
+        else:
+            ET.SubElement(constraints, 'rsc_colocation', {'id': 'colocation-%s-%s-%d' % (resource_id, other_id, i), 'rsc': resource_id,
+                                                          'with-rsc': other_id, 'score': 'INFINITY'})
+
+    if fencing_levels:
+        topology = ET.SubElement(configuration, 'fencing-topology')
+        for i, name in enumerate(node_names):
+            ET.SubElement(topology, 'fencing-level', {'id': 'fl-%s-1' % name, 'index': '1', 'target': name,
+                                                      'devices': stonith_ids[i]})
+
+    status = cib.find('status')
+    call_id = 1
+    for i, name in enumerate(node_names):
+        node_state = ET.SubElement(status, 'node_state', {'id': str(i + 1), 'uname': name, 'in_ccm': 'true', 'crmd': 'online',
+                                                          'join': 'member', 'expected': 'member'})
+        lrm_resources = ET.SubElement(ET.SubElement(node_state, 'lrm', {'id': str(i + 1)}), 'lrm_resources')
+        for resource_id in resource_ids:
+            lrm_resource = ET.SubElement(lrm_resources, 'lrm_resource', {'id': resource_id, 'class': 'ocf',
+                                                                         'provider': 'pacemaker', 'type': 'Dummy'})
+            for op in range(ops_per_resource):
+                operation = ['start', 'monitor', 'stop'][op % 3]
+                ET.SubElement(lrm_resource, 'lrm_rsc_op', {
+                    'id': '%s_%s_%d' % (resource_id, operation, op), 'operation': operation, 'call-id': str(call_id),
+                    'rc-code': '0', 'op-status': '0', 'interval': '10000' if operation == 'monitor' else '0',
+                    'exec-time': str(rnd.randint(5, 2000)), 'queue-time': str(rnd.randint(0, 50)),
+                    'last-rc-change': str(1700000000 + call_id), 'on_node': name})
+                call_id += 1
+    return cib
+
+
+def node_in_standby(node):
+    return any(nvpair.get('name') == 'standby' and nvpair.get('value') == 'on' for nvpair in node.findall('./instance_attributes/nvpair'))
+
+
+def active_node(cib_root, resource_id):
+    # deterministic placement of resource used by stand-in crm_mon, nodes in standby run no resources
+    nodes = [node.attrib['uname'] for node in cib_root.findall('./configuration/nodes/node') if not node_in_standby(node)]
+    # location constraints with infinite scores (such as ones created by 'pcs resource move/ban') are respected
+    # (-INFINITY wins over INFINITY for the same node)
+    constraints = cib_root.findall("./configuration/constraints/rsc_location[@rsc='%s']" % resource_id)
+    for constraint in constraints:
+        if constraint.get('score') == '-INFINITY' and constraint.get('node') in nodes:
+            nodes.remove(constraint.get('node'))
+    for constraint in constraints:
+        if constraint.get('score') in ['INFINITY', '+INFINITY'] and constraint.get('node') in nodes:
+            return constraint.get('node')
+    return nodes[sum(ord(c) for c in resource_id) % len(nodes)] if nodes else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic CIB for benchmarks.')
+    parser.add_argument('--resources', type=int, default=100)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--constraints-ratio', type=float, default=1.0)
+    parser.add_argument('--ops-per-resource', type=int, default=3)
+    parser.add_argument('--no-fencing-levels', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('output')
+    args = parser.parse_args()
+    cib = generate_cib(args.resources, args.nodes, args.constraints_ratio, not args.no_fencing_levels,
+                       args.ops_per_resource, args.seed)
+    ET.ElementTree(cib).write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+"""Stand-in for local pcsd operating on CIB file from BENCH_CIB environment variable.
+
+Serves plain HTTP with keep-alive connections and implements only the parts of
+pcsd used by the pcsd backend of modules ('HA_CLUSTER_PCS_BACKEND=pcsd'):
+
+- GET /remote/get_cib
+- POST /api/v2/task/run - 'resource.enable', 'resource.disable' and
+  'cluster_property.set_properties' change the CIB, other commands succeed
+  without doing anything
+
+Requests without cookie 'token=<--token>' are refused with HTTP 401. Number of
+TCP connections and requests is printed to stderr on every request.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cibgen import nvset  # noqa: E402
+
+STATS = {'connections': 0, 'requests': 0}
+
+
+def load_cib():
+    return ET.parse(os.environ.get('BENCH_CIB', 'cib.xml'))
+
+
+def save_cib(tree):
+    root = tree.getroot()
+    root.set('epoch', str(int(root.get('epoch', '0')) + 1))
+    tree.write(os.environ.get('BENCH_CIB', 'cib.xml'))
+
+
+def set_nvpair(parent, tag, set_id, name, value):
+    # set or remove (empty value) nvpair in first nvset of given tag under parent
+    attributes = parent.find(tag)
+    if attributes is None:
+        if value == '':
+            return
+        attributes = nvset(parent, tag, set_id, [])
+    for nvpair in attributes.findall('nvpair'):
+        if nvpair.get('name') == name:
+            if value == '':
+                attributes.remove(nvpair)
+            else:
+                nvpair.set('value', value)
+            return
+    if value != '':
+        ET.SubElement(attributes, 'nvpair', {'id': '%s-%s' % (set_id, name), 'name': name, 'value': value})
+
+
+def task_error(message):
+    return {'task_finish_type': 'fail', 'result': None,
+            'reports': [{'severity': {'level': 'ERROR'}, 'message': {'message': message}}]}
+
+
+def run_task(command_name, params):
+    if command_name in ['resource.enable', 'resource.disable']:
+        tree = load_cib()
+        resources = tree.getroot().find('configuration/resources')
+        for resource_id in params['resource_or_tag_ids']:
+            resource = [element for element in resources.iter() if element.get('id') == resource_id]
+            if not resource:
+                return task_error("bundle/clone/group/resource '%s' does not exist" % resource_id)
+            role = 'Started' if command_name == 'resource.enable' else 'Stopped'
+            set_nvpair(resource[0], 'meta_attributes', resource_id + '-meta_attributes', 'target-role', role)
+        save_cib(tree)
+    elif command_name == 'cluster_property.set_properties':
+        tree = load_cib()
+        crm_config = tree.getroot().find('configuration/crm_config')
+        for name, value in params['cluster_properties'].items():
+            set_nvpair(crm_config, 'cluster_property_set', 'cib-bootstrap-options', name, value)
+        save_cib(tree)
+    return {'task_finish_type': 'success', 'result': None, 'reports': []}
+
+
+class PcsdHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    token = None
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        STATS['connections'] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body, content_type='application/json'):
+        # stats are written before the reply so they are complete once the client got it
+        STATS['requests'] += 1
+        sys.stderr.write('connections=%(connections)d requests=%(requests)d\n' % STATS)
+        sys.stderr.flush()
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def authorized(self):
+        cookies = [cookie.strip() for cookie in self.headers.get('Cookie', '').split(';')]
+        if 'token=' + self.token in cookies:
+            return True
+        self.reply(401, json.dumps({'notauthorized': 'true'}))
+        return False
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        if self.path != '/remote/get_cib':
+            self.reply(404, 'Not found', 'text/plain')
+            return
+        with open(os.environ.get('BENCH_CIB', 'cib.xml')) as f:
+            self.reply(200, f.read(), 'text/xml')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        if not self.authorized():
+            return
+        if self.path != '/api/v2/task/run':
+            self.reply(404, 'Not found', 'text/plain')
+            return
+        try:
+            request = json.loads(body)
+            result = run_task(request['command_name'], request.get('params', {}))
+        except (ValueError, KeyError, TypeError) as e:
+            self.reply(400, json.dumps(task_error('Invalid request: %s' % e)))
+            return
+        self.reply(200, json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in pcsd serving CIB from BENCH_CIB.')
+    parser.add_argument('--port', type=int, default=2224)
+    parser.add_argument('--token', default='bench-token')
+    args = parser.parse_args()
+
+    PcsdHandler.token = args.token
+    server = HTTPServer(('127.0.0.1', args.port), PcsdHandler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+"""Offline benchmarks of collection modules against synthetic CIBs.
+
+Every module scenario is run in-process in a forked child against a fresh copy
+of the generated CIB, with stand-in pcs/cibadmin/crm_mon/xmllint executables from
+benchmarks/bin placed first in PATH. Reported are wall time, peak RSS of the
+module process and number of commands the module ran.
+
+Scenarios listed in PCSD_SCENARIOS run with 'HA_CLUSTER_PCS_BACKEND=pcsd' against
+stand-in pcsd_server.py started for every run, they fail when the module didn't
+send any request to it.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+from cibgen import generate_cib  # noqa: E402
+
+# (scenario name, module name, module arguments) - '%(workdir)s' is replaced by scenario working directory
+SCENARIOS = [
+    ('resource_unchanged', 'pcs_resource',
+     {'name': 'rsc-0', 'resource_type': 'ocf:pacemaker:Dummy', 'options': 'state=/run/rsc-0.state'}),
+    ('resource_update', 'pcs_resource',
+     {'name': 'rsc-0', 'resource_type': 'ocf:pacemaker:Dummy', 'options': 'state=/run/rsc-0.changed'}),
+    ('resource_create', 'pcs_resource',
+     {'name': 'bench-new', 'resource_type': 'ocf:pacemaker:Dummy', 'options': 'state=/run/bench-new.state'}),
+    ('location_create', 'pcs_constraint_location',
+     {'resource': 'rsc-1', 'node_name': 'node3', 'score': '100'}),
+    ('location_node_scores', 'pcs_constraint_location',
+     {'resource': 'rsc-0', 'node_scores': {'node1': 100, 'node2': -50}}),
+    ('order_create', 'pcs_constraint_order',
+     {'resource1': 'rsc-1', 'resource2': 'rsc-2'}),
+    ('colocation_create', 'pcs_constraint_colocation',
+     {'resource1': 'rsc-1', 'resource2': 'rsc-3', 'score': '100'}),
+    ('stonith_level_unchanged', 'pcs_stonith_level',
+     {'level': 1, 'node_name': 'node1', 'stonith_device': 'fence-node1'}),
+    ('wait_for_started', 'crm_wait_for',
+     {'resource': 'rsc-0', 'state': 'Started', 'sleep': 1, 'timeout': 10}),
+    ('scheduler_benchmark', 'pcs_scheduler_benchmark',
+     {'repeat': 1, 'top': 5}),
+    ('op_stats', 'pcs_op_stats',
+     {'prometheus_textfile': '%(workdir)s/op_stats.prom'}),
+    ('cib_analyze', 'pcs_cib_analyze',
+     {'top': 10}),
+    ('resource_cleanup', 'pcs_resource_cleanup',
+     {'agent': 'Dummy'}),
+    ('transaction_begin', 'pcs_cib_transaction',
+     {'state': 'begin', 'cib_file': '%(workdir)s/transaction.xml'}),
+    ('property_set_pcsd', 'pcs_property',
+     {'name': 'maintenance-mode', 'value': 'true'}),
+    ('location_create_pcsd', 'pcs_constraint_location',
+     {'resource': 'rsc-1', 'node_name': 'node3', 'score': '100'}),
+]
+# scenarios run with pcsd backend against stand-in pcsd
+PCSD_SCENARIOS = ['property_set_pcsd', 'location_create_pcsd']
+PCSD_TOKEN = 'bench-token'
+
+
+def prepare_collection_path(tmpdir):
+    # make this repository importable as ansible_collections.ondrejhome.ha_cluster
+    namespace_dir = os.path.join(tmpdir, 'ansible_collections', 'ondrejhome')
+    os.makedirs(namespace_dir)
+    os.symlink(REPO_DIR, os.path.join(namespace_dir, 'ha_cluster'))
+    return tmpdir
+
+
+def start_pcsd_server(workdir):
+    """Start stand-in pcsd for CIB in BENCH_CIB, return (process, stderr path) once it accepts connections."""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    known_hosts_path = os.path.join(workdir, 'known-hosts')
+    with open(known_hosts_path, 'w') as f:
+        json.dump({'known_hosts': {'localhost': {'token': PCSD_TOKEN}}}, f)
+    os.environ.update({'HA_CLUSTER_PCS_BACKEND': 'pcsd', 'HA_CLUSTER_PCSD_ADDRESS': 'http://127.0.0.1:%d' % port,
+                       'HA_CLUSTER_PCSD_KNOWN_HOSTS': known_hosts_path})
+    stderr_path = os.path.join(workdir, 'pcsd.log')
+    with open(stderr_path, 'w') as stderr:
+        process = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, 'pcsd_server.py'), '--port', str(port),
+                                    '--token', PCSD_TOKEN], stderr=stderr)
+    for attempt in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            break
+        except socket.error:
+            time.sleep(0.05)
+    return process, stderr_path
+
+
+def stop_pcsd_server(process, stderr_path):
+    """Stop stand-in pcsd, return number of requests it got."""
+    process.terminate()
+    process.wait()
+    for name in ['HA_CLUSTER_PCS_BACKEND', 'HA_CLUSTER_PCSD_ADDRESS', 'HA_CLUSTER_PCSD_KNOWN_HOSTS']:
+        os.environ.pop(name, None)
+    with open(stderr_path) as f:
+        lines = f.read().split()
+    requests = [int(item.split('=')[1]) for item in lines if item.startswith('requests=')]
+    return requests[-1] if requests else 0
+
+
+def run_scenario(module_name, module_args, workdir):
+    """Run module main() in forked child, return (wall time, peak RSS in KiB, commands run, module result)."""
+    args_path = os.path.join(workdir, 'args.json')
+    stdout_path = os.path.join(workdir, 'stdout.json')
+    stats_path = os.path.join(workdir, 'stats.json')
+    with open(args_path, 'w') as f:
+        json.dump({'ANSIBLE_MODULE_ARGS': module_args}, f)
+
+    start = time.time()
+    pid = os.fork()
+    if pid == 0:
+        commands = []
+        try:
+            from ansible.module_utils.basic import AnsibleModule
+            run_command = AnsibleModule.run_command
+
+            def counting_run_command(self, args, *pargs, **kwargs):
+                commands.append(args if isinstance(args, str) else ' '.join(args))
+                return run_command(self, args, *pargs, **kwargs)
+
+            AnsibleModule.run_command = counting_run_command
+            sys.argv = [module_name, args_path]
+            stdout_fd = os.open(stdout_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+            os.dup2(stdout_fd, 1)
+            module = importlib.import_module('ansible_collections.ondrejhome.ha_cluster.plugins.modules.' + module_name)
+            try:
+                module.main()
+            except SystemExit:
+                pass
+            sys.stdout.flush()
+        finally:
+            with open(stats_path, 'w') as f:
+                json.dump({'commands': commands}, f)
+            os._exit(0)
+    pid, status, rusage = os.wait4(pid, 0)
+    wall = time.time() - start
+
+    with open(stats_path) as f:
+        commands = json.load(f)['commands']
+    result = {}
+    with open(stdout_path) as f:
+        output = f.read()
+    try:
+        result = json.loads(output[output.index('{'):])
+    except ValueError:
+        result = {'failed': True, 'msg': 'unparsable module output', 'output': output[-2000:]}
+    return wall, rusage.ru_maxrss, commands, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run offline benchmarks of ondrejhome.ha_cluster modules.')
+    parser.add_argument('--scales', default='100,1000,5000',
+                        help='comma separated numbers of resources in generated CIBs (default: 100,1000,5000)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs of each scenario, best run is reported')
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--ops-per-resource', type=int, default=3, help='operation history entries per resource and node')
+    parser.add_argument('--scenarios', default=None, help='comma separated scenario names to run (default: all)')
+    parser.add_argument('--pcs-version', default='0.11.7', help='version reported by stand-in pcs')
+    parser.add_argument('--json', dest='json_output', default=None, help='write results to this JSON file')
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        wanted = args.scenarios.split(',')
+        scenarios = [scenario for scenario in SCENARIOS if scenario[0] in wanted]
+
+    tmpdir = tempfile.mkdtemp(prefix='ha_cluster_bench_')
+    sys.path.insert(0, prepare_collection_path(tmpdir))
+    os.environ['PATH'] = os.path.join(BENCH_DIR, 'bin') + os.pathsep + os.environ.get('PATH', '')
+    os.environ['BENCH_PCS_VERSION'] = args.pcs_version
+    # import ansible once in parent so children measure only the module run
+    importlib.import_module('ansible.module_utils.basic')
+
+    results = []
+    print('%-8s %-26s %10s %10s %9s %s' % ('scale', 'scenario', 'seconds', 'rss_kib', 'commands', 'result'))
+    try:
+        for scale in [int(scale) for scale in args.scales.split(',')]:
+            cib_path = os.path.join(tmpdir, 'cib-%d.xml' % scale)
+            ET.ElementTree(generate_cib(scale, args.nodes, ops_per_resource=args.ops_per_resource)).write(cib_path)
+            cib_size = os.path.getsize(cib_path)
+            for name, module_name, module_args in scenarios:
+                best = None
+                for run in range(args.repeat):
+                    workdir = tempfile.mkdtemp(dir=tmpdir)
+                    os.environ['BENCH_CIB'] = os.path.join(workdir, 'cib.xml')
+                    shutil.copyfile(cib_path, os.environ['BENCH_CIB'])
+                    scenario_args = json.loads(json.dumps(module_args) % {'workdir': workdir})
+                    pcsd = start_pcsd_server(workdir) if name in PCSD_SCENARIOS else None
+                    try:
+                        wall, rss, commands, result = run_scenario(module_name, scenario_args, workdir)
+                    finally:
+                        pcsd_requests = stop_pcsd_server(*pcsd) if pcsd is not None else None
+                    if pcsd_requests == 0 and not result.get('failed'):
+                        result = {'failed': True, 'msg': 'module sent no request to pcsd'}
+                    if best is None or wall < best['seconds']:
+                        best = {'scale': scale, 'cib_bytes': cib_size, 'scenario': name, 'module': module_name,
+                                'seconds': round(wall, 4), 'peak_rss_kib': rss, 'commands_count': len(commands),
+                                'commands': commands, 'failed': bool(result.get('failed')),
+                                'changed': bool(result.get('changed')), 'msg': result.get('msg'),
+                                'pcsd_requests': pcsd_requests}
+                    shutil.rmtree(workdir)
+                results.append(best)
+                state = 'FAILED: %s' % best['msg'] if best['failed'] else ('changed' if best['changed'] else 'ok')
+                print('%-8d %-26s %10.3f %10d %9d %s' % (scale, name, best['seconds'], best['peak_rss_kib'],
+                                                         best['commands_count'], state))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+name: ha_cluster_profile
+type: aggregate
+short_description: "aggregate durations of tasks, modules and commands run by modules into performance report"
+description:
+  - "Measures duration of each task on each host and aggregates it per task, per role and per module."
+  - "Picks up C(timings) returned by modules of this collection when profiling is enabled
+    (module option C(profile=true) or environment variable C(HA_CLUSTER_PROFILE=1)) and aggregates commands run by modules."
+  - "At the end of playbook prints the top N slowest tasks and commands and writes JSON report and
+    folded stacks file that can be used as input for flamegraph.pl or speedscope."
+version_added: "2.10"
+requirements:
+  - "enable in configuration, for example 'callbacks_enabled = ondrejhome.ha_cluster.ha_cluster_profile' in ansible.cfg"
+options:
+  output_dir:
+    description:
+      - "Directory where 'ha_cluster_profile.json' and 'ha_cluster_profile.folded' are written."
+      - "When not set, the reports are not written and only the summary is printed."
+    type: path
+    env:
+      - name: HA_CLUSTER_PROFILE_OUTPUT_DIR
+    ini:
+      - section: callback_ha_cluster_profile
+        key: output_dir
+  top:
+    description:
+      - "Number of slowest tasks and commands shown in summary and stored in JSON report."
+    type: int
+    default: 20
+    env:
+      - name: HA_CLUSTER_PROFILE_TOP
+    ini:
+      - section: callback_ha_cluster_profile
+        key: top
+'''
+
+import json
+import os
+import time
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.plugins.callback import CallbackBase
+
+
+class TaskStats:
+    """Durations of one task across all hosts."""
+    __slots__ = ('name', 'role', 'action', 'play', 'hosts', 'commands')
+
+    def __init__(self, name, role, action, play):
+        self.name = name
+        self.role = role
+        self.action = action
+        self.play = play
+        # host -> duration in seconds
+        self.hosts = {}
+        # commands from 'timings' returned by module
+        self.commands = []
+
+    def total(self):
+        return sum(self.hosts.values())
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'role': self.role,
+            'action': self.action,
+            'play': self.play,
+            'total_seconds': round(self.total(), 6),
+            'max_seconds': round(max(self.hosts.values()) if self.hosts else 0, 6),
+            'hosts': dict((host, round(seconds, 6)) for host, seconds in self.hosts.items()),
+            'commands_count': len(self.commands),
+        }
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'ondrejhome.ha_cluster.ha_cluster_profile'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self.play_name = None
+        # task uuid -> TaskStats in order of execution
+        self.tasks = {}
+        self.task_order = []
+        # (task uuid, host) -> start time
+        self.starts = {}
+
+    def v2_playbook_on_play_start(self, play):
+        self.play_name = play.get_name().strip()
+
+    def _task_stats(self, task):
+        uuid = task._uuid
+        if uuid not in self.tasks:
+            role = task._role.get_name() if task._role else None
+            self.tasks[uuid] = TaskStats(task.get_name().strip(), role, task.action, self.play_name)
+            self.task_order.append(uuid)
+        return self.tasks[uuid]
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task_stats(task)
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._task_stats(task)
+
+    def v2_runner_on_start(self, host, task):
+        self.starts[(task._uuid, host.get_name())] = time.time()
+
+    def _record(self, result):
+        task = result._task
+        host = result._host.get_name()
+        stats = self._task_stats(task)
+        start = self.starts.pop((task._uuid, host), None)
+        if start is None:
+            return
+        stats.hosts[host] = stats.hosts.get(host, 0) + time.time() - start
+        results = result._result.get('results', [result._result])
+        for item_result in results:
+            timings = item_result.get('timings') if isinstance(item_result, dict) else None
+            if not isinstance(timings, dict):
+                continue
+            for command in timings.get('commands', []):
+                stats.commands.append(dict(command, host=host))
+
+    def v2_runner_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result)
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result)
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result)
+
+    def _folded_stacks(self):
+        # lines 'play;role;task;command <microseconds>' in format of flamegraph.pl/speedscope input
+        lines = {}
+        for uuid in self.task_order:
+            stats = self.tasks[uuid]
+            frames = [stats.play or 'play', stats.role or 'no role', '%s (%s)' % (stats.name, stats.action)]
+            commands_seconds = 0
+            for command in stats.commands:
+                program = ' '.join(to_text(command.get('cmd', '')).split()[:3])
+                key = ';'.join(frames + [program]).replace('\n', ' ')
+                lines[key] = lines.get(key, 0) + command.get('seconds', 0)
+                commands_seconds += command.get('seconds', 0)
+            # remaining time of task is spent in Ansible and module itself
+            key = ';'.join(frames).replace('\n', ' ')
+            lines[key] = lines.get(key, 0) + max(stats.total() - commands_seconds, 0)
+        return ['%s %d' % (key, int(seconds * 1000000)) for key, seconds in lines.items() if seconds > 0]
+
+    def v2_playbook_on_stats(self, stats):
+        top = self.get_option('top')
+        output_dir = self.get_option('output_dir')
+
+        tasks = [self.tasks[uuid] for uuid in self.task_order]
+        slowest_tasks = sorted(tasks, key=lambda t: t.total(), reverse=True)[:top]
+        commands = [dict(command, task=t.name) for t in tasks for command in t.commands]
+        slowest_commands = sorted(commands, key=lambda c: c.get('seconds', 0), reverse=True)[:top]
+
+        per_module = {}
+        per_role = {}
+        for t in tasks:
+            per_module[t.action] = per_module.get(t.action, 0) + t.total()
+            per_role[t.role or 'no role'] = per_role.get(t.role or 'no role', 0) + t.total()
+
+        self._display.banner('HA CLUSTER PROFILE')
+        for t in slowest_tasks:
+            self._display.display('%-70s %10.2fs (%d hosts)' % ('%s : %s' % (t.role or t.play, t.name), t.total(), len(t.hosts)))
+        if slowest_commands:
+            self._display.display('')
+            for command in slowest_commands:
+                self._display.display('%-70s %10.2fs rc=%s' % (to_text(command.get('cmd', ''))[:70], command.get('seconds', 0), command.get('rc')))
+        self._display.display('')
+        for action, seconds in sorted(per_module.items(), key=lambda item: item[1], reverse=True):
+            self._display.display('%-70s %10.2fs' % (action, seconds))
+
+        if output_dir is None:
+            return
+        report = {
+            'tasks': [t.to_dict() for t in tasks],
+            'slowest_tasks': [t.to_dict() for t in slowest_tasks],
+            'slowest_commands': slowest_commands,
+            'per_module_seconds': dict((k, round(v, 6)) for k, v in per_module.items()),
+            'per_role_seconds': dict((k, round(v, 6)) for k, v in per_role.items()),
+        }
+        try:
+            if not os.path.isdir(output_dir):
+                os.makedirs(output_dir)
+            with open(os.path.join(output_dir, 'ha_cluster_profile.json'), 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            with open(os.path.join(output_dir, 'ha_cluster_profile.folded'), 'w') as f:
+                f.write('\n'.join(self._folded_stacks()) + '\n')
+        except (IOError, OSError) as e:
+            self._display.warning('Failed to write ha_cluster_profile report into %s - %s' % (output_dir, e))
@@ -0,0 +1,21 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # profiling of module commands and phases, see module_utils/profiling.py
+    DOCUMENTATION = '''
+options:
+  profile:
+    description:
+      - "Return duration, exit code and output size of commands run by module and duration of its internal phases in C(timings)."
+      - "Profiling can be enabled also for all modules at once by setting environment variable C(HA_CLUSTER_PROFILE=1)."
+    required: false
+    default: false
+    type: bool
+'''
@@ -0,0 +1,184 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import copy
+import os
+import random
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import profile_phase
+
+# errors from pcs/pacemaker indicating that CIB changed while we were computing our change
+CIB_CONFLICT_PATTERNS = [
+    # EL6: cib_replace waiting for the CIB timed out
+    'Call cib_replace failed (-62): Timer expired',
+    # pcs refusing to push configuration with older epoch
+    'pushed configuration is older than existing one',
+    # pacemaker rejecting update (pcmk_err_old_data -205)
+    'Update was older than existing configuration',
+    # pacemaker failing to apply diff (pcmk_err_diff_failed -206, pcmk_err_diff_resync -207)
+    'Application of an update diff failed',
+    # epoch check done by push_cib() before pushing
+    'CIB configuration changed since it was fetched',
+]
+
+# how many times to refetch the CIB, recompute the change and retry the push on conflict
+CIB_PUSH_RETRIES = 5
+# delay in seconds before first retry, doubled with every next retry up to CIB_PUSH_BACKOFF_MAX
+CIB_PUSH_BACKOFF = 0.5
+CIB_PUSH_BACKOFF_MAX = 8
+
+
+def get_cib_version(cib_root):
+    # version of CIB as tuple that can be compared (admin_epoch, epoch, num_updates)
+    return tuple(int(cib_root.attrib.get(attr, '0')) for attr in ['admin_epoch', 'epoch', 'num_updates'])
+
+
+def format_cib_version(cib_version):
+    return ':'.join(str(item) for item in cib_version)
+
+
+def is_cib_conflict(out, err):
+    output = (out or '') + (err or '')
+    return any(pattern in output for pattern in CIB_CONFLICT_PATTERNS)
+
+
+def cib_push_backoff(attempt):
+    # exponential backoff with jitter so concurrent runs don't retry in lockstep
+    delay = min(CIB_PUSH_BACKOFF * (2 ** attempt), CIB_PUSH_BACKOFF_MAX)
+    time.sleep(delay * random.uniform(0.5, 1.0))
+
+
+def fetch_live_cib(module):
+    # get running cluster configuration
+    rc, out, err = module.run_command('pcs cluster cib')
+    if rc != 0:
+        module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
+    with profile_phase(module, 'parse_cib'):
+        return ET.fromstring(out)
+
+
+def fetch_live_cib_version(module):
+    # query only attributes of the 'cib' element to avoid transferring whole CIB
+    rc, out, err = module.run_command('cibadmin --query --xpath /cib --no-children')
+    if rc == 0:
+        try:
+            return get_cib_version(ET.fromstring(out))
+        except Exception:
+            pass
+    return get_cib_version(fetch_live_cib(module))
+
+
+def write_cib_tmp_file(module, cib_root):
+    cib_fd, cib_path = tempfile.mkstemp()
+    module.add_cleanup_file(cib_path)
+    with os.fdopen(cib_fd, 'wb') as f:
+        ET.ElementTree(cib_root).write(f)
+    return cib_path
+
+
+def push_cib(module, base_cib_root, new_cib_root, scope=None):
+    """Push new_cib_root computed from base_cib_root into running cluster.
+
+    Push is refused when the configuration epoch of running cluster differs from
+    the one of base_cib_root. Without scope only the diff between base_cib_root and
+    new_cib_root is pushed so unrelated changes done meanwhile are not overwritten.
+    """
+    base_version = get_cib_version(base_cib_root)
+    live_version = fetch_live_cib_version(module)
+    if live_version[0:2] != base_version[0:2]:
+        return 1, '', 'CIB configuration changed since it was fetched (%s -> %s)' % (
+            format_cib_version(base_version), format_cib_version(live_version)), 'pcs cluster cib-push'
+
+    new_cib_path = write_cib_tmp_file(module, new_cib_root)
+    if scope is not None:
+        push_cmd = 'pcs cluster cib-push scope=' + scope + ' ' + new_cib_path
+    else:
+        base_cib_path = write_cib_tmp_file(module, base_cib_root)
+        push_cmd = 'pcs cluster cib-push ' + new_cib_path + ' diff-against=' + base_cib_path
+    rc, out, err = module.run_command(push_cmd)
+    return rc, out, err, push_cmd
+
+
+def update_live_cib(module, compute_change, scope=None, cib_root=None):
+    """Read-modify-write of running cluster CIB with optimistic concurrency.
+
+    compute_change(cib_root) modifies the given CIB in place and returns True,
+    or returns False when no change is needed. On conflict the CIB is fetched again,
+    the change is recomputed on top of it and push is retried with backoff.
+    When cib_root is given it is used (unmodified) as the base of first attempt.
+    Returns (rc, out, err, push_cmd), push_cmd is None when nothing was pushed.
+    """
+    for attempt in range(CIB_PUSH_RETRIES + 1):
+        if attempt == 0 and cib_root is not None:
+            base_cib_root = cib_root
+        else:
+            base_cib_root = fetch_live_cib(module)
+        new_cib_root = copy.deepcopy(base_cib_root)
+        if not compute_change(new_cib_root):
+            return 0, '', '', None
+        rc, out, err, push_cmd = push_cib(module, base_cib_root, new_cib_root, scope)
+        if rc == 0 or not is_cib_conflict(out, err) or attempt == CIB_PUSH_RETRIES:
+            return rc, out, err, push_cmd
+        cib_push_backoff(attempt)
+
+
+def update_cib_file(module, cib_file, compute_change):
+    """Read-modify-write of CIB stored in cib_file, counterpart of update_live_cib()."""
+    try:
+        cib = ET.parse(cib_file)
+    except Exception as e:
+        module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
+    if compute_change(cib.getroot()):
+        try:
+            cib.write(cib_file)
+        except Exception as e:
+            module.fail_json(msg="Error encountered writing result to cib_file - %s" % (e))
+
+
+def run_pcs_command(module, cmd):
+    # pcs fetches the CIB on every run so retrying the command recomputes the change on top of current CIB
+    for attempt in range(CIB_PUSH_RETRIES + 1):
+        rc, out, err = module.run_command(cmd)
+        if rc == 0 or not is_cib_conflict(out, err) or attempt == CIB_PUSH_RETRIES:
+            return rc, out, err
+        cib_push_backoff(attempt)
+
+
+def update_cib(module, cib_file, compute_change, scope=None, cib_root=None):
+    """Apply compute_change() to CIB in cib_file when given or to the running cluster CIB otherwise."""
+    if cib_file is not None:
+        update_cib_file(module, cib_file, compute_change)
+        return 0, '', '', None
+    return update_live_cib(module, compute_change, scope, cib_root)
+
+
+def constraint_attributes_change(module, constraint_id, attributes, child_tag=None):
+    """Return compute_change() function for update_cib() that sets attributes of existing constraint.
+
+    Attributes with value None are removed. When child_tag is given the attributes are set
+    on the first child element with this tag (for example 'rule' of location constraint).
+    Constraint keeps its id so it is updated in single CIB update without being removed first.
+    """
+    def compute_change(cib_root):
+        element = cib_root.find("./configuration/constraints/*[@id='%s']" % constraint_id)
+        if element is not None and child_tag is not None:
+            element = element.find(child_tag)
+        if element is None:
+            module.fail_json(msg="Constraint '%s' disappeared from cluster configuration while updating it." % constraint_id)
+        changed = False
+        for name, value in attributes.items():
+            if value is None and name in element.attrib:
+                del element.attrib[name]
+                changed = True
+            elif value is not None and element.attrib.get(name) != value:
+                element.set(name, value)
+                changed = True
+        return changed
+    return compute_change
@@ -0,0 +1,182 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+# elements of 'resources' section that are resources and can contain other resources
+RESOURCE_TAGS = ['primitive', 'group', 'clone', 'master', 'bundle']
+CONSTRAINT_TAGS = ['rsc_location', 'rsc_colocation', 'rsc_order', 'rsc_ticket']
+# attributes of constraints referring to resources
+CONSTRAINT_RESOURCE_ATTRIBUTES = ['rsc', 'with-rsc', 'first', 'then']
+NVSET_TAGS = ['meta_attributes', 'instance_attributes', 'utilization', 'cluster_property_set']
+
+
+class Resource:
+    __slots__ = ('id', 'tag', 'element', 'parent_id', 'children_ids')
+
+    def __init__(self, element, parent_id=None):
+        self.id = element.attrib.get('id')
+        self.tag = element.tag
+        self.element = element
+        self.parent_id = parent_id
+        self.children_ids = []
+
+    def __repr__(self):
+        return "Resource(%s, %s, parent:%s)" % (self.tag, self.id, self.parent_id)
+
+
+class Constraint:
+    __slots__ = ('id', 'tag', 'element', 'resources', 'has_resource_sets')
+
+    def __init__(self, element):
+        self.id = element.attrib.get('id')
+        self.tag = element.tag
+        self.element = element
+        resource_sets = element.findall('resource_set')
+        self.has_resource_sets = bool(resource_sets)
+        if resource_sets:
+            self.resources = [ref.attrib.get('id') for rset in resource_sets for ref in rset.findall('resource_ref')]
+        else:
+            self.resources = [element.attrib[attr] for attr in CONSTRAINT_RESOURCE_ATTRIBUTES if attr in element.attrib]
+
+    def __repr__(self):
+        return "Constraint(%s, %s, resources:%s)" % (self.tag, self.id, self.resources)
+
+
+class FencingLevel:
+    __slots__ = ('id', 'element', 'index', 'target', 'devices')
+
+    def __init__(self, element):
+        self.id = element.attrib.get('id')
+        self.element = element
+        self.index = element.attrib.get('index')
+        # levels can also target nodes by pattern or node attribute
+        self.target = element.attrib.get('target') or element.attrib.get('target-pattern') or element.attrib.get('target-attribute')
+        self.devices = element.attrib.get('devices')
+
+    def __repr__(self):
+        return "FencingLevel(%s, %s, %s)" % (self.index, self.target, self.devices)
+
+
+class NvSet:
+    __slots__ = ('id', 'tag', 'element', 'owner_id', 'nvpairs')
+
+    def __init__(self, element, owner_id=None):
+        self.id = element.attrib.get('id')
+        self.tag = element.tag
+        self.element = element
+        self.owner_id = owner_id
+        self.nvpairs = dict((nvpair.attrib.get('name'), nvpair.attrib.get('value')) for nvpair in element.findall('nvpair'))
+
+    def __repr__(self):
+        return "NvSet(%s, %s, owner:%s)" % (self.tag, self.id, self.owner_id)
+
+
+class Node:
+    __slots__ = ('id', 'uname', 'element', 'attributes')
+
+    def __init__(self, element):
+        self.id = element.attrib.get('id')
+        self.uname = element.attrib.get('uname')
+        self.element = element
+        self.attributes = {}
+        for nvset in element.findall('instance_attributes'):
+            for nvpair in nvset.findall('nvpair'):
+                self.attributes[nvpair.attrib.get('name')] = nvpair.attrib.get('value')
+
+    def __repr__(self):
+        return "Node(%s, %s)" % (self.id, self.uname)
+
+
+class CibModel:
+    """Read model of CIB 'configuration' section built in one pass with hash indexes.
+
+    Records keep reference to their ElementTree element so modules can still modify the CIB.
+    The model is not updated by such modifications, build a new one for modified CIB.
+    """
+    __slots__ = ('cib_root', 'by_id', 'resources', 'constraints', 'constraints_by_resource',
+                 'fencing_levels', 'fencing_levels_by_target', 'nvsets', 'nodes', 'nodes_by_uname')
+
+    def __init__(self, cib_root):
+        self.cib_root = cib_root
+        # any record by id
+        self.by_id = {}
+        self.resources = {}
+        self.constraints = []
+        self.constraints_by_resource = {}
+        self.fencing_levels = []
+        self.fencing_levels_by_target = {}
+        self.nvsets = []
+        self.nodes = {}
+        self.nodes_by_uname = {}
+
+        configuration = cib_root.find('./configuration')
+        if configuration is None:
+            return
+        for section in configuration:
+            if section.tag == 'resources':
+                for element in section:
+                    self._add_resource(element, None)
+            elif section.tag == 'constraints':
+                for element in section:
+                    if element.tag in CONSTRAINT_TAGS:
+                        self._add_constraint(element)
+            elif section.tag == 'fencing-topology':
+                for element in section.findall('fencing-level'):
+                    self._add_fencing_level(element)
+            elif section.tag == 'nodes':
+                for element in section.findall('node'):
+                    self._add_node(element)
+            elif section.tag in ['crm_config', 'rsc_defaults', 'op_defaults']:
+                for element in section:
+                    self._add_nvset(element, section.tag)
+
+    def _add_nvset(self, element, owner_id):
+        if element.tag in NVSET_TAGS:
+            record = NvSet(element, owner_id)
+            self.nvsets.append(record)
+            self.by_id[record.id] = record
+
+    def _add_resource(self, element, parent_id):
+        if element.tag not in RESOURCE_TAGS:
+            self._add_nvset(element, parent_id)
+            return
+        record = Resource(element, parent_id)
+        self.resources[record.id] = record
+        self.by_id[record.id] = record
+        if parent_id is not None:
+            self.resources[parent_id].children_ids.append(record.id)
+        for child in element:
+            self._add_resource(child, record.id)
+
+    def _add_constraint(self, element):
+        record = Constraint(element)
+        self.constraints.append(record)
+        self.by_id[record.id] = record
+        for resource_id in set(record.resources):
+            self.constraints_by_resource.setdefault(resource_id, []).append(record)
+
+    def _add_fencing_level(self, element):
+        record = FencingLevel(element)
+        self.fencing_levels.append(record)
+        self.by_id[record.id] = record
+        self.fencing_levels_by_target.setdefault(record.target, []).append(record)
+
+    def _add_node(self, element):
+        record = Node(element)
+        self.nodes[record.id] = record
+        self.nodes_by_uname[record.uname] = record
+
+    def resource_element(self, resource_id):
+        record = self.resources.get(resource_id)
+        return None if record is None else record.element
+
+    def constraint_elements(self, tag, resource=None):
+        # constraint elements with given tag (optionally only those referring to resource) in CIB order
+        constraints = self.constraints if resource is None else self.constraints_by_resource.get(resource, [])
+        return [constr.element for constr in constraints if constr.tag == tag]
+
+    def fencing_level_elements(self, target):
+        return [level.element for level in self.fencing_levels_by_target.get(target, [])]
@@ -0,0 +1,140 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import os
+import re
+import tempfile
+import time
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.pcs_inprocess import enable_pcs_inprocess
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.pcsd_client import enable_pcsd_backend
+
+# append every command run by modules with its output into this file (JSON lines)
+RECORD_ENV = 'HA_CLUSTER_RECORD_FILE'
+# return recorded outputs from this file instead of running commands
+REPLAY_ENV = 'HA_CLUSTER_REPLAY_FILE'
+# when replaying sleep for recorded duration of command multiplied by this factor (for example '1')
+REPLAY_LATENCY_ENV = 'HA_CLUSTER_REPLAY_LATENCY'
+# fail the module when it runs more commands than this
+COMMAND_BUDGET_ENV = 'HA_CLUSTER_COMMAND_BUDGET'
+# how are 'pcs' commands executed - 'cli' (default), 'inprocess' (pcs library imported into module)
+# or 'pcsd' (commands with API equivalent are sent to local pcsd)
+PCS_BACKEND_ENV = 'HA_CLUSTER_PCS_BACKEND'
+
+# temporary files created by modules have random names, they are replaced by placeholders in recorded commands
+TMP_FILE_RE = re.compile(re.escape(tempfile.gettempdir()) + r'/[\w.-]+')
+
+
+def normalize_command(args):
+    """Return command as string with temporary file paths replaced by placeholders and list of those paths."""
+    cmd = args if isinstance(args, str) else ' '.join(str(arg) for arg in args)
+    cmd = ' '.join(cmd.split())
+    paths = []
+
+    def placeholder(match):
+        if match.group(0) not in paths:
+            paths.append(match.group(0))
+        return '<tmp%d>' % paths.index(match.group(0))
+    return TMP_FILE_RE.sub(placeholder, cmd), paths
+
+
+def read_files(paths):
+    # content of files written by command (for example 'pcs -f <tmp0> resource create ...')
+    files = {}
+    for index, path in enumerate(paths):
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path) as f:
+                files[str(index)] = f.read()
+    return files
+
+
+def load_recording(path):
+    # recorded commands grouped by (module name, normalized command) in order of recording
+    records = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            records.setdefault((record.get('module'), record['cmd']), []).append(record)
+    return records
+
+
+class CommandRunner:
+    """Records or replays commands run by module and enforces budget of commands."""
+    __slots__ = ('module', 'module_name', 'run_command', 'record_file', 'replay', 'latency', 'budget', 'count')
+
+    def __init__(self, module, run_command):
+        self.module = module
+        self.module_name = getattr(module, '_name', None)
+        self.run_command = run_command
+        self.record_file = os.environ.get(RECORD_ENV)
+        self.replay = None
+        if os.environ.get(REPLAY_ENV):
+            try:
+                self.replay = load_recording(os.environ[REPLAY_ENV])
+            except (IOError, OSError, ValueError) as e:
+                module.fail_json(msg="Failed to load recorded commands from %s - %s" % (os.environ[REPLAY_ENV], e))
+        self.latency = float(os.environ.get(REPLAY_LATENCY_ENV) or 0)
+        self.budget = int(os.environ[COMMAND_BUDGET_ENV]) if os.environ.get(COMMAND_BUDGET_ENV) else None
+        self.count = 0
+
+    def __call__(self, args, *pargs, **kwargs):
+        self.count += 1
+        cmd, paths = normalize_command(args)
+        if self.budget is not None and self.count > self.budget:
+            self.module.fail_json(msg="Command budget of %d commands exceeded by command '%s'" % (self.budget, cmd))
+        if self.replay is not None:
+            return self.replay_command(cmd, paths)
+        start = time.time()
+        rc, out, err = self.run_command(args, *pargs, **kwargs)
+        if self.record_file:
+            self.record_command(cmd, paths, rc, out, err, time.time() - start)
+        return rc, out, err
+
+    def record_command(self, cmd, paths, rc, out, err, seconds):
+        record = {'module': self.module_name, 'cmd': cmd, 'rc': rc, 'stdout': out, 'stderr': err,
+                  'seconds': round(seconds, 6), 'files': read_files(paths)}
+        try:
+            with open(self.record_file, 'a') as f:
+                f.write(json.dumps(record, sort_keys=True) + '\n')
+        except (IOError, OSError) as e:
+            self.module.warn("Failed to record command into %s - %s" % (self.record_file, e))
+
+    def replay_command(self, cmd, paths):
+        records = self.replay.get((self.module_name, cmd))
+        if not records:
+            self.module.fail_json(msg="No recorded output for command '%s' in %s" % (cmd, os.environ[REPLAY_ENV]))
+        # same command run multiple times returns recorded outputs in order, last one is repeated
+        record = records.pop(0) if len(records) > 1 else records[0]
+        for index, content in record.get('files', {}).items():
+            with open(paths[int(index)], 'w') as f:
+                f.write(content)
+        if self.latency:
+            time.sleep(record.get('seconds', 0) * self.latency)
+        return record['rc'], record['stdout'], record['stderr']
+
+
+def enable_command_runner(module):
+    """Set up how module runs commands based on environment variables.
+
+    pcs backend selected by HA_CLUSTER_PCS_BACKEND replaces module.run_command() first (falling back
+    to the pcs CLI when it can't be used), then CommandRunner is put on top of it when recording,
+    replay or command budget is requested.
+    """
+    replay = os.environ.get(REPLAY_ENV)
+    backend = os.environ.get(PCS_BACKEND_ENV)
+    if backend == 'inprocess' and not replay:
+        enable_pcs_inprocess(module)
+    elif backend == 'pcsd' and not replay:
+        enable_pcsd_backend(module)
+    if not (os.environ.get(RECORD_ENV) or replay or os.environ.get(COMMAND_BUDGET_ENV)):
+        return None
+    runner = CommandRunner(module, module.run_command)
+    module.run_command = runner
+    return runner
@@ -0,0 +1,144 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import copy
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import fetch_live_cib, write_cib_tmp_file
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import profile_phase
+
+# line of 'Transition Summary' from crm_simulate, for example:
+#   * Move       rsc1    ( node1 -> node2 )
+#   * Restart    rsc2    ( node1 )  due to resource definition change
+#   * Fence (reboot) node3 'peer is no longer part of the cluster'
+TRANSITION_SUMMARY_RE = re.compile(r'^\s*\*\s+(?P<action>[A-Z]\w*)(?:\s+\([\w-]+\))?\s+(?P<target>\S+)\s*(?P<details>.*)$')
+
+
+def impact_preview_requested(module):
+    # impact is previewed only with 'ansible-playbook --check --diff' against running cluster
+    return module.check_mode and module._diff and not module.params.get('cib_file_param')
+
+
+def parse_transition_summary(output):
+    """Return list of actions from 'Transition Summary' section of crm_simulate output."""
+    actions = []
+    in_summary = False
+    for line in output.splitlines():
+        if line.startswith('Transition Summary'):
+            in_summary = True
+            continue
+        if not in_summary:
+            continue
+        match = TRANSITION_SUMMARY_RE.match(line)
+        if match:
+            actions.append({
+                'action': match.group('action').lower(),
+                'resource': match.group('target'),
+                'details': ' '.join(match.group('details').split()),
+            })
+        elif line.strip() and not line[0].isspace():
+            # next section of output
+            break
+    return actions
+
+
+def simulate_transition(module, cib_path):
+    """Run scheduler on CIB in cib_path, return (actions, number of actions in transition graph)."""
+    graph_fd, graph_path = tempfile.mkstemp()
+    os.close(graph_fd)
+    module.add_cleanup_file(graph_path)
+    cmd = 'crm_simulate --run --xml-file ' + cib_path + ' --save-graph ' + graph_path
+    rc, out, err = module.run_command(cmd)
+    if rc != 0:
+        module.warn("Impact preview incomplete, command '%s' failed: %s" % (cmd, (err or out).strip()))
+        return None, None
+    try:
+        transition_size = len(ET.parse(graph_path).getroot().findall('synapse'))
+    except Exception:
+        transition_size = None
+    return parse_transition_summary(out), transition_size
+
+
+def verify_cib(module, cib_path):
+    # (rc, messages) of crm_verify for CIB in cib_path
+    if find_executable('crm_verify') is None:
+        return None, []
+    rc, out, err = module.run_command('crm_verify --xml-file ' + cib_path)
+    return rc, [line.strip() for line in (out + err).splitlines() if line.strip()]
+
+
+def format_impact(impact):
+    # human readable summary shown by 'ansible-playbook --diff'
+    lines = ['Cluster impact of change (crm_simulate):']
+    for action in impact['actions']:
+        lines.append('  * %s %s %s' % (action['action'].capitalize(), action['resource'], action['details']))
+    if not impact['actions']:
+        lines.append('  no resource will start, stop, move or restart')
+    lines.append('Transition size: %s actions (without change: %s)' % (impact['transition_actions'], impact['baseline_transition_actions']))
+    if impact['verify_rc']:
+        lines.append('crm_verify reports errors:')
+        lines.extend('  ' + message for message in impact['verify_messages'])
+    return '\n'.join(lines) + '\n'
+
+
+def preview_impact(module, result, cib_root=None, pcs_cmds=None, compute_change=None):
+    """Store in result['impact'] what scheduler would do after the change that module would apply.
+
+    The change is applied to a copy of running cluster CIB (cib_root or freshly fetched one) by running
+    pcs_cmds against it with 'pcs -f' and then by compute_change(cib_root) same as for update_cib().
+    Actions that scheduler would do also without the change (for example pending recovery) are not reported.
+    Does nothing unless module runs in check mode with diff against running cluster.
+    """
+    if not impact_preview_requested(module):
+        return None
+    if find_executable('crm_simulate') is None:
+        module.warn("Impact preview skipped, 'crm_simulate' executable not found.")
+        return None
+    with profile_phase(module, 'impact_preview'):
+        if cib_root is None:
+            cib_root = fetch_live_cib(module)
+        base_cib_path = write_cib_tmp_file(module, cib_root)
+        new_cib_path = write_cib_tmp_file(module, copy.deepcopy(cib_root))
+        for cmd in pcs_cmds or []:
+            cmd = re.sub(r'^pcs\b', 'pcs -f ' + new_cib_path, cmd.strip())
+            rc, out, err = module.run_command(cmd)
+            if rc != 0:
+                module.warn("Impact preview skipped, command '%s' failed: %s" % (cmd, (err or out).strip()))
+                return None
+        if compute_change is not None:
+            new_cib = ET.parse(new_cib_path)
+            compute_change(new_cib.getroot())
+            new_cib.write(new_cib_path)
+
+        baseline_actions, baseline_size = simulate_transition(module, base_cib_path)
+        actions, transition_size = simulate_transition(module, new_cib_path)
+        if actions is None:
+            return None
+        baseline = set((action['action'], action['resource'], action['details']) for action in baseline_actions or [])
+        verify_rc, verify_messages = verify_cib(module, new_cib_path)
+    impact = {
+        'actions': [action for action in actions if (action['action'], action['resource'], action['details']) not in baseline],
+        'transition_actions': transition_size,
+        'baseline_transition_actions': baseline_size,
+        'verify_rc': verify_rc,
+        'verify_messages': verify_messages,
+    }
+    impact['summary'] = {}
+    for action in impact['actions']:
+        impact['summary'][action['action']] = impact['summary'].get(action['action'], 0) + 1
+    if verify_rc:
+        module.warn("Configuration after change fails crm_verify: %s" % '; '.join(verify_messages))
+    result['impact'] = impact
+    if isinstance(result.get('diff'), dict):
+        result['diff']['prepared'] = format_impact(impact)
+    else:
+        result['diff'] = {'prepared': format_impact(impact)}
+    return impact
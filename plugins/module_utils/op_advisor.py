@@ -0,0 +1,168 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import re
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_stats import agent_name, aggregate_op_records, element_op_records
+
+# timeout used by pacemaker when neither operation nor op_defaults specify it
+PACEMAKER_DEFAULT_TIMEOUT_MS = 20000
+# operations with timeouts the advisor checks
+ADVISED_OPERATIONS = ['start', 'stop', 'monitor', 'promote', 'demote']
+# recommended values are rounded up to multiples of this
+ROUND_TO_MS = 5000
+# configured timeout above this multiple of recommended one only delays detection of failures
+TOO_HIGH_FACTOR = 3
+DURATION_RE = re.compile(r'^\s*(\d+)\s*(ms|msec|us|usec|s|sec|m|min|h|hr)?\s*$')
+DURATION_UNITS_MS = {None: 1000, 's': 1000, 'sec': 1000, 'ms': 1, 'msec': 1, 'us': 0.001, 'usec': 0.001,
+                     'm': 60000, 'min': 60000, 'h': 3600000, 'hr': 3600000}
+
+
+def parse_duration_ms(value):
+    # pacemaker duration ('20s', '1m', '500ms', '20' means seconds) in milliseconds, None when not parsable
+    if value is None:
+        return None
+    match = DURATION_RE.match(value)
+    if match is None:
+        return None
+    return int(int(match.group(1)) * DURATION_UNITS_MS[match.group(2)])
+
+
+def format_duration(milliseconds):
+    if milliseconds % 60000 == 0 and milliseconds >= 120000:
+        return '%dmin' % (milliseconds // 60000)
+    # rounded up so sub-second values don't become zero timeout
+    return '%ds' % -(-int(milliseconds) // 1000)
+
+
+def round_up(milliseconds):
+    return max(ROUND_TO_MS, -(-int(milliseconds) // ROUND_TO_MS) * ROUND_TO_MS)
+
+
+def agent_metadata_timeouts(module, agent):
+    """Return {(action, interval_ms): timeout_ms} from metadata of resource agent, empty dict when unavailable."""
+    if find_executable('crm_resource') is None:
+        return {}
+    rc, out, err = module.run_command(['crm_resource', '--show-metadata', agent])
+    if rc != 0:
+        return {}
+    try:
+        actions = ET.fromstring(out).findall('./actions/action')
+    except Exception:
+        return {}
+    timeouts = {}
+    for action in actions:
+        timeout = parse_duration_ms(action.attrib.get('timeout'))
+        if timeout is not None:
+            interval = parse_duration_ms(action.attrib.get('interval', '0')) or 0
+            timeouts[(action.attrib.get('name'), interval)] = timeout
+            timeouts.setdefault((action.attrib.get('name'), None), timeout)
+    return timeouts
+
+
+def op_defaults_timeout(cib_root):
+    for nvpair in cib_root.findall('./configuration/op_defaults/meta_attributes/nvpair'):
+        if nvpair.attrib.get('name') == 'timeout':
+            return parse_duration_ms(nvpair.attrib.get('value'))
+    return None
+
+
+def advise_op_timeouts(module, cib_root, resource, margin):
+    """Compare timeouts and intervals of operations of primitives in resource with their operation history.
+
+    Recommended timeout is the longest observed execution time multiplied by margin (history of the resource
+    itself or of other resources with same agent when resource has none), but at least the timeout suggested
+    by agent metadata. Recommended monitor interval is at least twice the longest observed monitor time.
+    Failed and timed out operations are only counted, their execution time is not used for recommendations.
+    """
+    primitives = [resource] if resource.tag == 'primitive' else list(resource.iter('primitive'))
+    primitive_ids = set(primitive.attrib.get('id') for primitive in primitives)
+    agents = set(agent_name(primitive) for primitive in primitives)
+    # history of resources with same agent is used for resources without own history
+    records = [record for record in element_op_records(cib_root) if record.resource in primitive_ids or record.agent in agents]
+    by_resource, by_agent = aggregate_op_records(record for record in records if not record.failed)
+    all_by_resource, all_by_agent = aggregate_op_records(records)
+    default_timeout = op_defaults_timeout(cib_root) or PACEMAKER_DEFAULT_TIMEOUT_MS
+    metadata = {}
+
+    advice = []
+    for primitive in primitives:
+        primitive_id = primitive.attrib.get('id')
+        agent = agent_name(primitive)
+        if agent not in metadata:
+            metadata[agent] = agent_metadata_timeouts(module, agent)
+        for op in primitive.findall('./operations/op'):
+            name = op.attrib.get('name')
+            if name not in ADVISED_OPERATIONS:
+                continue
+            interval = parse_duration_ms(op.attrib.get('interval', '0')) or 0
+            configured_timeout = parse_duration_ms(op.attrib.get('timeout'))
+            effective_timeout = configured_timeout or default_timeout
+            metadata_timeout = metadata[agent].get((name, interval), metadata[agent].get((name, None)))
+            history_name = 'probe' if name == 'monitor' and interval == 0 else name
+            history, history_source = by_resource.get(primitive_id, {}).get(history_name), 'resource'
+            all_history = all_by_resource.get(primitive_id, {}).get(history_name)
+            if history is None:
+                history, history_source = by_agent.get(agent, {}).get(history_name), 'agent'
+                all_history = all_by_agent.get(agent, {}).get(history_name)
+            item = {
+                'resource': primitive_id,
+                'operation': name,
+                'interval': op.attrib.get('interval', '0'),
+                'configured_timeout': op.attrib.get('timeout'),
+                'effective_timeout': format_duration(effective_timeout),
+                'metadata_timeout': format_duration(metadata_timeout) if metadata_timeout else None,
+            }
+            if history is None:
+                item['status'] = 'no_history'
+                if all_history is not None:
+                    # only failed operations, their execution time doesn't tell how long the operation takes
+                    item['observed'] = {'count': all_history.count, 'failures': all_history.failures}
+                advice.append(item)
+                continue
+            max_exec = max(history.exec_times)
+            recommended_timeout = max(round_up(max_exec * margin), metadata_timeout or 0)
+            item.update({
+                'history_source': history_source,
+                'observed': {'count': all_history.count, 'failures': all_history.failures,
+                             'max_exec_time_ms': max_exec, 'mean_exec_time_ms': round(float(sum(history.exec_times)) / history.count, 1)},
+                'recommended_timeout': format_duration(recommended_timeout),
+            })
+            if effective_timeout < max_exec * margin:
+                item['status'] = 'too_low'
+            elif effective_timeout > recommended_timeout * TOO_HIGH_FACTOR:
+                item['status'] = 'too_high'
+            else:
+                item['status'] = 'ok'
+            if name == 'monitor' and interval and interval < 2 * max_exec:
+                item['recommended_interval'] = format_duration(round_up(2 * max_exec))
+                item['status'] = 'interval_too_short' if item['status'] == 'ok' else item['status']
+            advice.append(item)
+    return advice
+
+
+def apply_op_advice(resource, advice):
+    """Set recommended timeouts on operations of resource, returns number of changed operations.
+
+    Only timeouts of existing operations marked 'too_low' or 'too_high' are changed, intervals are
+    only reported as changing them creates different operation.
+    """
+    changed = 0
+    for item in advice:
+        if item['status'] not in ['too_low', 'too_high']:
+            continue
+        for primitive in resource.iter('primitive'):
+            if primitive.attrib.get('id') != item['resource']:
+                continue
+            for op in primitive.findall('./operations/op'):
+                if (op.attrib.get('name') == item['operation'] and
+                        parse_duration_ms(op.attrib.get('interval', '0')) == parse_duration_ms(item['interval'])):
+                    op.set('timeout', item['recommended_timeout'])
+                    changed += 1
+    return changed
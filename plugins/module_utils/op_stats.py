@@ -0,0 +1,166 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+DEFAULT_PERCENTILES = [50, 90, 99]
+
+
+class OpRecord:
+    """One operation from operation history (lrm_rsc_op) in status section of CIB."""
+    __slots__ = ('node', 'resource', 'agent', 'operation', 'interval', 'rc', 'expected_rc', 'op_status',
+                 'exec_time', 'queue_time', 'last_rc_change', 'call_id')
+
+    def __init__(self, node, resource, agent, element):
+        self.node = node
+        self.resource = resource
+        self.agent = agent
+        self.interval = int(element.attrib.get('interval', '0') or 0)
+        self.operation = element.attrib.get('operation')
+        # one-time monitor is probe checking if resource runs on node
+        if self.operation == 'monitor' and self.interval == 0:
+            self.operation = 'probe'
+        self.rc = int(element.attrib.get('rc-code', '0'))
+        self.op_status = int(element.attrib.get('op-status', '0'))
+        # 'transition-key' is '<action>:<transition>:<expected rc>:<uuid>'
+        transition_key = element.attrib.get('transition-key', '').split(':')
+        if len(transition_key) > 2 and transition_key[2].isdigit():
+            self.expected_rc = int(transition_key[2])
+        else:
+            self.expected_rc = 7 if self.operation == 'probe' and self.rc == 7 else 0
+        self.exec_time = int(element.attrib.get('exec-time', '0') or 0)
+        self.queue_time = int(element.attrib.get('queue-time', '0') or 0)
+        self.last_rc_change = int(element.attrib.get('last-rc-change', '0') or 0)
+        self.call_id = element.attrib.get('call-id')
+
+    @property
+    def failed(self):
+        return self.op_status != 0 or self.rc != self.expected_rc
+
+    def __repr__(self):
+        return "OpRecord(%s, %s, %s, %sms)" % (self.node, self.resource, self.operation, self.exec_time)
+
+
+def agent_name(element):
+    # 'ocf:pacemaker:Dummy', 'systemd:httpd', 'stonith:fence_xvm'
+    parts = [element.attrib.get('class'), element.attrib.get('provider'), element.attrib.get('type')]
+    return ':'.join(part for part in parts if part)
+
+
+def iter_op_records(source, resources=None):
+    """Stream OpRecord objects from CIB or its status section in source (path or file object).
+
+    Processed elements are removed from the tree while parsing so memory use doesn't grow with size of
+    status section. The same operation present also as '_last_failure' entry is returned only once.
+    """
+    stack = []
+    node = resource = agent = None
+    call_ids = set()
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(element)
+            if element.tag == 'node_state':
+                node = element.attrib.get('uname') or element.attrib.get('id')
+            elif element.tag == 'lrm_resource':
+                resource = element.attrib.get('id')
+                agent = agent_name(element)
+                call_ids = set()
+            continue
+        stack.pop()
+        if element.tag == 'lrm_rsc_op':
+            if (resources is None or resource in resources) and element.attrib.get('call-id') not in call_ids:
+                call_ids.add(element.attrib.get('call-id'))
+                yield OpRecord(node, resource, agent, element)
+        elif element.tag in ['lrm_resource', 'node_state', 'configuration'] and stack:
+            # drop processed elements, otherwise the parent would keep all of them until the end of parsing
+            stack[-1].remove(element)
+
+
+def element_op_records(cib_root, resources=None):
+    """Return OpRecord objects from status section of already parsed CIB in cib_root."""
+    records = []
+    for node_state in cib_root.findall('./status/node_state'):
+        node = node_state.attrib.get('uname') or node_state.attrib.get('id')
+        for lrm_resource in node_state.findall('./lrm/lrm_resources/lrm_resource'):
+            resource = lrm_resource.attrib.get('id')
+            if resources is not None and resource not in resources:
+                continue
+            agent = agent_name(lrm_resource)
+            call_ids = set()
+            for element in lrm_resource.findall('./lrm_rsc_op'):
+                if element.attrib.get('call-id') not in call_ids:
+                    call_ids.add(element.attrib.get('call-id'))
+                    records.append(OpRecord(node, resource, agent, element))
+    return records
+
+
+def percentile(sorted_values, percent):
+    # nearest-rank percentile of already sorted values
+    if not sorted_values:
+        return None
+    rank = int(-(-percent * len(sorted_values) // 100))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def distribution(values, percentiles=None):
+    values = sorted(values)
+    if not values:
+        return {}
+    stats = {'min': values[0], 'max': values[-1], 'mean': round(float(sum(values)) / len(values), 1)}
+    for percent in percentiles or DEFAULT_PERCENTILES:
+        stats['p%d' % percent] = percentile(values, percent)
+    return stats
+
+
+class OpStats:
+    """Aggregated operation history of one resource or agent and operation."""
+    __slots__ = ('count', 'failures', 'exec_times', 'queue_times', 'intervals', 'nodes', 'last_failure')
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.exec_times = []
+        self.queue_times = []
+        self.intervals = set()
+        self.nodes = set()
+        self.last_failure = None
+
+    def add(self, record):
+        self.count += 1
+        self.exec_times.append(record.exec_time)
+        self.queue_times.append(record.queue_time)
+        self.intervals.add(record.interval)
+        self.nodes.add(record.node)
+        if record.failed:
+            self.failures += 1
+            if self.last_failure is None or record.last_rc_change > self.last_failure['last_rc_change']:
+                self.last_failure = {'node': record.node, 'rc': record.rc, 'op_status': record.op_status,
+                                     'last_rc_change': record.last_rc_change}
+
+    def as_dict(self, percentiles=None):
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'exec_time_ms': distribution(self.exec_times, percentiles),
+            'queue_time_ms': distribution(self.queue_times, percentiles),
+            'intervals_ms': sorted(self.intervals),
+            'nodes': sorted(self.nodes),
+            'last_failure': self.last_failure,
+        }
+
+
+def aggregate_op_records(records):
+    """Return (per resource, per agent) dicts {name: {operation: OpStats}} from OpRecord objects."""
+    by_resource = {}
+    by_agent = {}
+    for record in records:
+        for aggregate, name in [(by_resource, record.resource), (by_agent, record.agent)]:
+            operations = aggregate.setdefault(name, {})
+            if record.operation not in operations:
+                operations[record.operation] = OpStats()
+            operations[record.operation].add(record)
+    return by_resource, by_agent
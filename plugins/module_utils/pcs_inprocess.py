@@ -0,0 +1,129 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import io
+import os
+import re
+import shlex
+import sys
+from distutils.spawn import find_executable
+
+
+def read_pcs_cli():
+    # content of 'pcs' executable, it is small python script importing pcs library
+    pcs_path = find_executable('pcs')
+    if pcs_path is None:
+        return None
+    try:
+        with open(pcs_path, 'rb') as f:
+            return f.read(65536).decode('utf-8', 'replace')
+    except (IOError, OSError):
+        return None
+
+
+def pcs_cli_interpreter(pcs_cli):
+    # python interpreter from shebang of 'pcs' executable
+    first_line = pcs_cli.split('\n', 1)[0].strip()
+    if not first_line.startswith('#!'):
+        return None
+    interpreter = first_line[2:].split()
+    if not interpreter:
+        return None
+    # '#!/usr/bin/env python3' style shebang
+    if os.path.basename(interpreter[0]) == 'env' and len(interpreter) > 1:
+        return find_executable(interpreter[1])
+    return interpreter[0]
+
+
+def pcs_cli_version(pcs_cli):
+    # version pinned by setuptools generated script ('pcs==0.10.8'), None when not present
+    match = re.search(r'pcs==([\w.]+)', pcs_cli)
+    return match.group(1) if match else None
+
+
+class PcsInProcess:
+    """Run 'pcs ...' commands by calling pcs.app.main() inside of module process.
+
+    Saves startup of python interpreter and import of pcs for every pcs command.
+    Commands other than 'pcs' are passed to the original run_command().
+    """
+    __slots__ = ('module', 'run_command', 'pcs_app', 'pcs_utils', 'version')
+
+    def __init__(self, module, run_command, pcs_app, pcs_utils, version):
+        self.module = module
+        self.run_command = run_command
+        self.pcs_app = pcs_app
+        self.pcs_utils = pcs_utils
+        self.version = version
+
+    def __call__(self, args, *pargs, **kwargs):
+        argv = shlex.split(args) if isinstance(args, str) else [str(arg) for arg in args]
+        # commands with input data or custom environment are left to CLI
+        if not argv or argv[0] != 'pcs' or pargs or set(kwargs) - set(['check_rc']):
+            return self.run_command(args, *pargs, **kwargs)
+        rc, out, err = self.run_pcs(argv[1:])
+        if rc != 0 and kwargs.get('check_rc'):
+            self.module.fail_json(cmd=args, rc=rc, stdout=out, stderr=err, msg=err.rstrip())
+        return rc, out, err
+
+    def run_pcs(self, argv):
+        # pcs keeps options of last run in module globals, they are set only when present on command line
+        self.pcs_utils.pcs_options = {}
+        self.pcs_utils.usefile = False
+        self.pcs_utils.filename = ''
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stderr = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        old_stdout, old_stderr, old_argv = sys.stdout, sys.stderr, sys.argv
+        sys.stdout, sys.stderr, sys.argv = stdout, stderr, ['pcs'] + argv
+        rc = 0
+        try:
+            self.pcs_app.main(argv)
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                rc = e.code
+            elif e.code is not None:
+                stderr.write(str(e.code) + '\n')
+                rc = 1
+        except Exception as e:
+            stderr.write('Error: %s\n' % e)
+            rc = 1
+        finally:
+            sys.stdout, sys.stderr, sys.argv = old_stdout, old_stderr, old_argv
+        return rc, self._read(stdout), self._read(stderr)
+
+    @staticmethod
+    def _read(stream):
+        stream.flush()
+        return stream.buffer.getvalue().decode('utf-8', 'replace')
+
+
+def enable_pcs_inprocess(module):
+    """Replace module.run_command() with PcsInProcess when pcs library matching the pcs CLI can be imported.
+
+    Returns None and leaves module untouched (using pcs CLI) when pcs can't be used in-process.
+    """
+    pcs_cli = read_pcs_cli()
+    interpreter = None if pcs_cli is None else pcs_cli_interpreter(pcs_cli)
+    if interpreter is None or os.path.realpath(interpreter) != os.path.realpath(sys.executable):
+        module.debug('pcs in-process backend not used: pcs CLI uses different python interpreter (%s)' % interpreter)
+        return None
+    try:
+        from pcs import app as pcs_app
+        from pcs import settings as pcs_settings
+        from pcs import utils as pcs_utils
+    except Exception as e:
+        module.debug('pcs in-process backend not used: failed to import pcs - %s' % e)
+        return None
+    # imported library must be the one used by pcs CLI as parsing of pcs output depends on its version
+    version = getattr(pcs_settings, 'pcs_version', None)
+    cli_version = pcs_cli_version(pcs_cli)
+    if version is None or (cli_version is not None and cli_version != version):
+        module.debug('pcs in-process backend not used: pcs library version %s differs from pcs CLI %s' % (version, cli_version))
+        return None
+    backend = PcsInProcess(module, module.run_command, pcs_app, pcs_utils, version)
+    module.run_command = backend
+    return backend
@@ -0,0 +1,267 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import re
+
+# tokens of pcs rule: parentheses, quoted strings and words optionally followed by '=' and (quoted) value
+RULE_TOKEN_RE = re.compile(r"""\s*(\(|\)|"[^"]*"|'[^']*'|[^\s()"'=]+=(?:"[^"]*"|'[^']*'|[^\s()]*)|[^\s()]+)""")
+COMPARISON_OPERATIONS = ['lt', 'gt', 'lte', 'gte', 'eq', 'ne']
+VALUE_TYPES = ['string', 'integer', 'number', 'version']
+
+# cache of already parsed rules, the same rule string is often used by many constraints
+_parsed_rules = {}
+
+
+class RuleParseError(Exception):
+    pass
+
+
+class BoolExpression:
+    """Rule combining sub-expressions with same boolean operation ('and'/'or')."""
+    __slots__ = ('operation', 'children')
+
+    def __init__(self, operation, children):
+        self.operation = operation
+        self.children = children
+
+    def __repr__(self):
+        return "BoolExpression(%s, %s)" % (self.operation, self.children)
+
+
+class AttributeExpression:
+    """'defined|not_defined <attribute>' or '<attribute> <operation> [<type>] <value>' expression."""
+    __slots__ = ('operation', 'attribute', 'value', 'value_type')
+
+    def __init__(self, operation, attribute, value=None, value_type=None):
+        self.operation = operation
+        self.attribute = attribute
+        self.value = value
+        self.value_type = value_type
+
+    def __repr__(self):
+        return "AttributeExpression(%s, %s, %s, %s)" % (self.operation, self.attribute, self.value, self.value_type)
+
+
+class DateExpression:
+    """'date gt|lt <date>', 'date in_range <date> to <date>|duration <options>' or 'date-spec <options>' expression."""
+    __slots__ = ('operation', 'start', 'end', 'options')
+
+    def __init__(self, operation, start=None, end=None, options=None):
+        self.operation = operation
+        self.start = start
+        self.end = end
+        # options of 'duration' or 'date_spec' element
+        self.options = options
+
+    def __repr__(self):
+        return "DateExpression(%s, %s, %s, %s)" % (self.operation, self.start, self.end, self.options)
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ['"', "'"]:
+        return value[1:-1]
+    return value
+
+
+def tokenize_rule(rule_string):
+    tokens = []
+    position = 0
+    rule_string = rule_string.strip()
+    while position < len(rule_string):
+        match = RULE_TOKEN_RE.match(rule_string, position)
+        if match is None:
+            raise RuleParseError("Unable to parse rule at: %s" % rule_string[position:])
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+
+class RuleParser:
+    """Recursive descent parser of pcs rule expressions.
+
+    pcs-0.9 evaluates 'and'/'or' with same precedence from left to right,
+    newer pcs versions bind 'and' tighter than 'or'.
+    """
+
+    def __init__(self, tokens, and_binds_tighter=True):
+        self.tokens = tokens
+        self.position = 0
+        self.and_binds_tighter = and_binds_tighter
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise RuleParseError("Unexpected end of rule")
+        self.position += 1
+        return token
+
+    def expect(self, expected):
+        token = self.next()
+        if token != expected:
+            raise RuleParseError("Expected '%s' but got '%s'" % (expected, token))
+
+    def parse(self):
+        expression = self.parse_expression()
+        if self.peek() is not None:
+            raise RuleParseError("Unexpected '%s' in rule" % self.peek())
+        return expression
+
+    def parse_expression(self):
+        if self.and_binds_tighter:
+            return self.parse_bool(['or'], lambda: self.parse_bool(['and'], self.parse_atom))
+        return self.parse_bool(['and', 'or'], self.parse_atom)
+
+    def parse_bool(self, operations, parse_operand):
+        expression = parse_operand()
+        while self.peek() in operations:
+            operation = self.next()
+            operand = parse_operand()
+            # chains of same operation are flattened into one rule like pcs does
+            if type(expression) is BoolExpression and expression.operation == operation:
+                expression.children.append(operand)
+            else:
+                expression = BoolExpression(operation, [expression, operand])
+        return expression
+
+    def parse_atom(self):
+        token = self.peek()
+        if token == '(':
+            self.next()
+            expression = self.parse_expression()
+            self.expect(')')
+            # parenthesized expression is separate (nested) rule that must not be merged with surrounding one
+            if isinstance(expression, BoolExpression):
+                return ParenthesizedExpression(expression.operation, expression.children)
+            return expression
+        if token in ['defined', 'not_defined']:
+            self.next()
+            return AttributeExpression(token, unquote(self.next()))
+        if token == 'date':
+            return self.parse_date()
+        if token == 'date-spec':
+            self.next()
+            return DateExpression('date_spec', options=self.parse_options())
+        # <attribute> <operation> [<type>] <value>
+        attribute = unquote(self.next())
+        operation = self.next()
+        if operation not in COMPARISON_OPERATIONS:
+            raise RuleParseError("Unknown operation '%s' in rule" % operation)
+        value = self.next()
+        value_type = None
+        if value in VALUE_TYPES and self.peek() not in [None, 'and', 'or', ')']:
+            value_type = value
+            value = self.next()
+        return AttributeExpression(operation, attribute, unquote(value), value_type)
+
+    def parse_date(self):
+        self.expect('date')
+        operation = self.next()
+        if operation == 'gt':
+            return DateExpression('gt', start=unquote(self.next()))
+        if operation == 'lt':
+            return DateExpression('lt', end=unquote(self.next()))
+        if operation != 'in_range':
+            raise RuleParseError("Unknown date operation '%s' in rule" % operation)
+        start = None
+        if self.peek() != 'to':
+            start = unquote(self.next())
+        self.expect('to')
+        if self.peek() == 'duration':
+            self.next()
+            return DateExpression('in_range', start=start, options=self.parse_options())
+        return DateExpression('in_range', start=start, end=unquote(self.next()))
+
+    def parse_options(self):
+        options = {}
+        while self.peek() is not None and '=' in self.peek() and self.peek() not in ['(', ')']:
+            name, value = self.next().split('=', 1)
+            options[name] = unquote(value)
+        if not options:
+            raise RuleParseError("Expected options in form name=value")
+        return options
+
+
+class ParenthesizedExpression(BoolExpression):
+    """BoolExpression from parentheses - behaves the same, only prevents flattening into parent."""
+    __slots__ = ()
+
+
+def parse_rule(rule_string, and_binds_tighter=True):
+    """Compile rule string into expression tree, results are memoized."""
+    key = (rule_string, and_binds_tighter)
+    if key not in _parsed_rules:
+        _parsed_rules[key] = RuleParser(tokenize_rule(rule_string), and_binds_tighter).parse()
+    return _parsed_rules[key]
+
+
+def _attribute_expression_matches(expression, xml):
+    if xml.tag != 'expression':
+        return False
+    if xml.get('operation') != expression.operation or xml.get('attribute') != expression.attribute:
+        return False
+    if xml.get('value') != expression.value:
+        return False
+    # type is compared only when requested, pcs may add it automatically for numeric values
+    # 'integer' is called 'number' in older pacemaker versions
+    if expression.value_type is not None:
+        value_types = ['integer', 'number'] if expression.value_type in ['integer', 'number'] else [expression.value_type]
+        if xml.get('type') not in value_types:
+            return False
+    return True
+
+
+def _date_expression_matches(expression, xml):
+    if xml.tag != 'date_expression' or xml.get('operation') != expression.operation:
+        return False
+    if expression.operation == 'lt':
+        # date for 'lt' is stored in 'end', but accept also 'start' used by some pcs versions
+        if expression.end not in [xml.get('end'), xml.get('start')]:
+            return False
+    elif xml.get('start') != expression.start or xml.get('end') != expression.end:
+        return False
+    options_element = xml.find('duration')
+    if options_element is None:
+        options_element = xml.find('date_spec')
+    if expression.options is None:
+        return options_element is None
+    if options_element is None:
+        return False
+    options = dict((name, value) for name, value in options_element.attrib.items() if name != 'id')
+    return options == expression.options
+
+
+def _xml_children(xml_rule):
+    return [child for child in xml_rule if child.tag in ['expression', 'date_expression', 'rule']]
+
+
+def expression_matches_element(expression, xml):
+    """Structurally match compiled rule expression against CIB element (rule, expression, date_expression)."""
+    if xml.tag == 'rule':
+        children = _xml_children(xml)
+        if not isinstance(expression, BoolExpression):
+            # single expression can be wrapped in (nested) rule
+            return len(children) == 1 and expression_matches_element(expression, children[0])
+        if xml.get('boolean-op', 'and') != expression.operation or len(children) != len(expression.children):
+            return False
+        # order of sub-expressions doesn't matter for and/or so each must match a different element
+        unmatched = list(children)
+        for sub_expression in expression.children:
+            for child in unmatched:
+                if expression_matches_element(sub_expression, child):
+                    unmatched.remove(child)
+                    break
+            else:
+                return False
+        return True
+    if isinstance(expression, AttributeExpression):
+        return _attribute_expression_matches(expression, xml)
+    if isinstance(expression, DateExpression):
+        return _date_expression_matches(expression, xml)
+    return False
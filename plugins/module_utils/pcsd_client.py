@@ -0,0 +1,240 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import os
+import shlex
+import socket
+import ssl
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+    from urllib.parse import urlparse
+except ImportError:
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+    from urlparse import urlparse
+
+# address of local pcsd, can be changed for testing against stand-in server
+PCSD_ADDRESS_ENV = 'HA_CLUSTER_PCSD_ADDRESS'
+PCSD_ADDRESS = 'https://localhost:2224'
+# file with tokens of pcsd on cluster nodes created by 'pcs host auth'
+PCSD_KNOWN_HOSTS_ENV = 'HA_CLUSTER_PCSD_KNOWN_HOSTS'
+PCSD_KNOWN_HOSTS = '/var/lib/pcsd/known-hosts'
+# certificate (or CA) to verify pcsd against, without it the token is sent only to unverified pcsd on localhost
+PCSD_CA_FILE_ENV = 'HA_CLUSTER_PCSD_CA_FILE'
+LOCAL_ADDRESSES = ['localhost', '127.0.0.1', '::1']
+PCSD_TIMEOUT = 60
+
+
+class PcsdError(Exception):
+    """pcsd can't be used (not reachable, API not available, authentication failed)."""
+    pass
+
+
+def load_local_token(known_hosts_path):
+    # token of local node from pcsd known-hosts file
+    try:
+        with open(known_hosts_path) as f:
+            known_hosts = json.load(f).get('known_hosts', {})
+    except (IOError, OSError, ValueError) as e:
+        raise PcsdError("Unable to read pcsd tokens from %s - %s" % (known_hosts_path, e))
+    hostname = socket.gethostname()
+    for name in [hostname, hostname.split('.')[0], socket.getfqdn(), 'localhost']:
+        if name in known_hosts and known_hosts[name].get('token'):
+            return known_hosts[name]['token']
+    for host in known_hosts.values():
+        for dest in host.get('dest_list', []):
+            if dest.get('addr') in ['localhost', '127.0.0.1', '::1'] and host.get('token'):
+                return host['token']
+    raise PcsdError("No token for local node in %s" % known_hosts_path)
+
+
+def wait_param(options):
+    # '--wait' or '--wait=N' -> value of 'wait' parameter of pcs library commands
+    for option in options:
+        if option == '--wait':
+            return True
+        if option.startswith('--wait='):
+            return option.split('=', 1)[1]
+    return False
+
+
+def pcs_command_to_task(argv):
+    """Translate pcs CLI arguments to (API v2 command name, params), None when command has no API equivalent."""
+    options = [arg for arg in argv if arg.startswith('--')]
+    args = [arg for arg in argv if not arg.startswith('--')]
+    if set(option.split('=', 1)[0] for option in options) - set(['--wait']):
+        return None
+    wait = wait_param(options)
+    if args[:2] == ['resource', 'enable'] and len(args) > 2:
+        return 'resource.enable', {'resource_or_tag_ids': args[2:], 'wait': wait}
+    if args[:2] == ['resource', 'disable'] and len(args) > 2:
+        return 'resource.disable', {'resource_or_tag_ids': args[2:], 'wait': wait}
+    if args[:2] in [['node', 'standby'], ['node', 'unstandby']] and len(args) > 2:
+        return 'node.standby_unstandby', {'standby': args[1] == 'standby', 'node_names': args[2:], 'wait': wait}
+    # 'resource move' is not sent to pcsd as it keeps its constraint only with pcs 0.9/0.10 and options
+    # such as 'lifetime=' don't fit into positional node argument
+    if args[:2] == ['resource', 'ban'] and len(args) in [3, 4] and not any('=' in arg for arg in args[2:]):
+        return 'resource.ban', {'resource_id': args[2], 'node': args[3] if len(args) == 4 else None, 'wait': wait}
+    if args[:2] == ['resource', 'clear'] and len(args) in [3, 4] and not any('=' in arg for arg in args[2:]):
+        return 'resource.unmove_unban', {'resource_id': args[2], 'node': args[3] if len(args) == 4 else None, 'wait': wait}
+    if args[:2] == ['property', 'set'] and len(args) > 2 and all('=' in arg for arg in args[2:]) and not options:
+        return 'cluster_property.set_properties', {'cluster_properties': dict(arg.split('=', 1) for arg in args[2:]), 'force_flags': []}
+    return None
+
+
+def reports_to_text(reports):
+    lines = []
+    for report in reports or []:
+        message = report.get('message', {})
+        text = message.get('message') if isinstance(message, dict) else str(message)
+        severity = report.get('severity', {})
+        level = severity.get('level') if isinstance(severity, dict) else severity
+        lines.append('%s: %s' % ('Error' if level == 'ERROR' else 'Warning', text))
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def unknown_command(reports):
+    # pcsd of older pcs doesn't know some API v2 commands
+    for report in reports or []:
+        message = report.get('message', {})
+        code = message.get('code', '') if isinstance(message, dict) else ''
+        text = message.get('message', '') if isinstance(message, dict) else str(message)
+        if 'UNKNOWN_COMMAND' in code or 'unknown command' in text.lower():
+            return True
+    return False
+
+
+class PcsdClient:
+    """Client of local pcsd keeping one keep-alive connection for all requests of module."""
+    __slots__ = ('address', 'token', 'ca_file', 'connection')
+
+    def __init__(self, address, token, ca_file=None):
+        self.address = urlparse(address)
+        self.token = token
+        self.ca_file = ca_file
+        self.connection = None
+
+    def _connect(self):
+        local = self.address.hostname in LOCAL_ADDRESSES
+        if self.address.scheme == 'https':
+            if self.ca_file:
+                context = ssl.create_default_context(cafile=self.ca_file)
+                # certificate of pcsd is issued for node name, not for 'localhost'
+                context.check_hostname = not local
+            elif local:
+                # pcsd uses self-signed certificate by default, connection to local node is not verified
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            else:
+                raise PcsdError("Refusing to send token to pcsd at %s without certificate verification, set %s"
+                                % (self.address.hostname, PCSD_CA_FILE_ENV))
+            return HTTPSConnection(self.address.hostname, self.address.port or 2224, timeout=PCSD_TIMEOUT, context=context)
+        if not local:
+            raise PcsdError("Refusing to send token to pcsd at %s over plain HTTP" % self.address.hostname)
+        return HTTPConnection(self.address.hostname, self.address.port or 2224, timeout=PCSD_TIMEOUT)
+
+    def request(self, method, path, body=None, content_type='application/json'):
+        headers = {'Cookie': 'token=' + self.token, 'Connection': 'keep-alive'}
+        if body is not None:
+            headers['Content-Type'] = content_type
+        # reconnect once when the kept connection was closed by pcsd meanwhile
+        for attempt in range(2):
+            try:
+                if self.connection is None:
+                    self.connection = self._connect()
+                self.connection.request(method, path, body, headers)
+                response = self.connection.getresponse()
+                data = response.read().decode('utf-8', 'replace')
+                return response.status, data
+            except (HTTPException, socket.error, ssl.SSLError) as e:
+                self.close()
+                if attempt == 1:
+                    raise PcsdError("Request %s %s to pcsd failed - %s" % (method, path, e))
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def run_task(self, command_name, params):
+        """Run pcs library command synchronously using API v2, returns (rc, out, err).
+
+        PcsdError is raised whenever the task didn't run (so the command can be run by pcs CLI instead),
+        rc=1 is returned only when the task ran and failed.
+        """
+        body = json.dumps({'command_name': command_name, 'params': params, 'options': {}})
+        status, data = self.request('POST', '/api/v2/task/run', body)
+        if status in [401, 403]:
+            raise PcsdError("pcsd refused the token (HTTP %d)" % status)
+        if status == 404:
+            raise PcsdError("pcsd doesn't provide API v2")
+        if status != 200:
+            raise PcsdError("pcsd didn't run command %s (HTTP %d): %s" % (command_name, status, data[:200]))
+        try:
+            result = json.loads(data)
+        except ValueError:
+            raise PcsdError("Unexpected response from pcsd (HTTP %d): %s" % (status, data[:200]))
+        if result.get('task_finish_type') != 'success':
+            if result.get('task_finish_type') != 'fail' or unknown_command(result.get('reports')):
+                raise PcsdError("pcsd didn't run command %s: %s" % (command_name, reports_to_text(result.get('reports')) or data[:200]))
+            return 1, '', reports_to_text(result.get('reports')) or data
+        out = result.get('result')
+        return 0, '' if out is None else (out if isinstance(out, str) else json.dumps(out)), reports_to_text(result.get('reports'))
+
+    def get_cib(self):
+        status, data = self.request('GET', '/remote/get_cib')
+        if status != 200 or not data.lstrip().startswith('<'):
+            raise PcsdError("Unable to get CIB from pcsd (HTTP %d)" % status)
+        return 0, data, ''
+
+
+class PcsdBackend:
+    """run_command() replacement sending 'pcs' commands with pcsd API equivalent to local pcsd.
+
+    Other commands and any command after pcsd turns out to be unusable go to the original run_command().
+    """
+    __slots__ = ('module', 'run_command', 'client', 'available')
+
+    def __init__(self, module, run_command, client):
+        self.module = module
+        self.run_command = run_command
+        self.client = client
+        self.available = True
+
+    def __call__(self, args, *pargs, **kwargs):
+        if self.available and not pargs and not set(kwargs) - set(['check_rc']):
+            argv = shlex.split(args) if isinstance(args, str) else [str(arg) for arg in args]
+            if argv[:1] == ['pcs']:
+                try:
+                    if argv[1:] == ['cluster', 'cib']:
+                        return self.client.get_cib()
+                    task = pcs_command_to_task(argv[1:])
+                    if task is not None:
+                        rc, out, err = self.client.run_task(*task)
+                        if rc != 0 and kwargs.get('check_rc'):
+                            self.module.fail_json(cmd=args, rc=rc, stdout=out, stderr=err, msg=err.rstrip())
+                        return rc, out, err
+                except PcsdError as e:
+                    self.module.debug('pcsd backend not used anymore: %s' % e)
+                    self.available = False
+                    self.client.close()
+        return self.run_command(args, *pargs, **kwargs)
+
+
+def enable_pcsd_backend(module):
+    """Replace module.run_command() with PcsdBackend when token for local pcsd is available."""
+    try:
+        token = load_local_token(os.environ.get(PCSD_KNOWN_HOSTS_ENV, PCSD_KNOWN_HOSTS))
+    except PcsdError as e:
+        module.debug('pcsd backend not used: %s' % e)
+        return None
+    client = PcsdClient(os.environ.get(PCSD_ADDRESS_ENV, PCSD_ADDRESS), token, os.environ.get(PCSD_CA_FILE_ENV))
+    backend = PcsdBackend(module, module.run_command, client)
+    module.run_command = backend
+    return backend
@@ -0,0 +1,96 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import time
+from contextlib import contextmanager
+
+# environment variable enabling profiling for all modules without setting their 'profile' option
+PROFILE_ENV = 'HA_CLUSTER_PROFILE'
+
+
+def profiling_requested(module):
+    if module.params.get('profile'):
+        return True
+    return os.environ.get(PROFILE_ENV, '').lower() in ['1', 'true', 'yes', 'on']
+
+
+class ModuleProfiler:
+    """Records commands run by module and timed phases, returns them as 'timings' in module result."""
+    __slots__ = ('start', 'commands', 'phases')
+
+    def __init__(self):
+        self.start = time.time()
+        self.commands = []
+        self.phases = []
+
+    def record_command(self, args, rc, out, err, seconds):
+        self.commands.append({
+            'cmd': args if isinstance(args, str) else ' '.join(str(arg) for arg in args),
+            'rc': rc,
+            'seconds': round(seconds, 6),
+            'stdout_bytes': len(out or ''),
+            'stderr_bytes': len(err or ''),
+        })
+
+    def record_phase(self, name, seconds):
+        self.phases.append({'name': name, 'seconds': round(seconds, 6)})
+
+    def timings(self):
+        return {
+            'total_seconds': round(time.time() - self.start, 6),
+            'commands_seconds': round(sum(command['seconds'] for command in self.commands), 6),
+            'commands': self.commands,
+            'phases': self.phases,
+        }
+
+
+def enable_profiling(module):
+    """Wrap run_command(), exit_json() and fail_json() of module when profiling was requested.
+
+    When profiling is not requested the module is left untouched.
+    """
+    if not profiling_requested(module):
+        return None
+    profiler = ModuleProfiler()
+    run_command = module.run_command
+    exit_json = module.exit_json
+    fail_json = module.fail_json
+
+    def timed_run_command(args, *pargs, **kwargs):
+        start = time.time()
+        rc, out, err = run_command(args, *pargs, **kwargs)
+        profiler.record_command(args, rc, out, err, time.time() - start)
+        return rc, out, err
+
+    def exit_json_with_timings(**kwargs):
+        kwargs['timings'] = profiler.timings()
+        exit_json(**kwargs)
+
+    def fail_json_with_timings(msg, **kwargs):
+        kwargs['timings'] = profiler.timings()
+        fail_json(msg=msg, **kwargs)
+
+    module.run_command = timed_run_command
+    module.exit_json = exit_json_with_timings
+    module.fail_json = fail_json_with_timings
+    module.profiler = profiler
+    return profiler
+
+
+@contextmanager
+def profile_phase(module, name):
+    """Time in-process phase of module (parsing, comparing, ...), no-op when profiling is disabled."""
+    profiler = getattr(module, 'profiler', None)
+    if profiler is None:
+        yield
+        return
+    start = time.time()
+    try:
+        yield
+    finally:
+        profiler.record_phase(name, time.time() - start)
@@ -0,0 +1,122 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+# resource set option name in module -> (attribute of 'resource_set' element in CIB, default value used by pacemaker)
+RESOURCE_SET_ATTRIBUTES = {
+    'sequential': ('sequential', 'true'),
+    'require_all': ('require-all', 'true'),
+    'action': ('action', 'start'),
+    'role': ('role', 'Started'),
+}
+# attribute of 'resource_set' element in CIB -> default value used by pacemaker
+RESOURCE_SET_ATTRIBUTES_DEFAULTS = dict(RESOURCE_SET_ATTRIBUTES.values())
+
+
+def resource_set_attributes(resource_set):
+    # desired attributes of 'resource_set' element for resource set from module parameters
+    attributes = {}
+    for option, (attribute, default) in RESOURCE_SET_ATTRIBUTES.items():
+        value = resource_set.get(option)
+        if value is None:
+            value = default
+        elif isinstance(value, bool):
+            value = 'true' if value else 'false'
+        attributes[attribute] = value
+    return attributes
+
+
+def resource_sets_cmd(resource_sets):
+    # 'set <resource>... [options]' part of 'pcs constraint order/colocation set' command
+    cmd = ''
+    for resource_set in resource_sets:
+        cmd += ' set ' + ' '.join(resource_set['resources'])
+        for option, (attribute, default) in RESOURCE_SET_ATTRIBUTES.items():
+            value = resource_set.get(option)
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            cmd += ' ' + attribute + '=' + value
+    return cmd
+
+
+def validate_resource_sets(module, resource_sets):
+    """Fail module when resource_sets is empty or some set has no resources."""
+    if not resource_sets:
+        module.fail_json(msg="Option 'resource_sets' must contain at least one resource set.")
+    for index, resource_set in enumerate(resource_sets):
+        if not resource_set.get('resources'):
+            module.fail_json(msg="Resource set %d in 'resource_sets' must contain at least one resource in 'resources'." % (index + 1))
+
+
+def set_constraint_candidates(cib_model, resource_sets):
+    # constraints referring to any resource from any of resource sets, each only once
+    candidates = []
+    seen_ids = set()
+    for resource_set in resource_sets:
+        for resource_id in resource_set['resources']:
+            for constraint in cib_model.constraints_by_resource.get(resource_id, []):
+                if constraint.id not in seen_ids:
+                    seen_ids.add(constraint.id)
+                    candidates.append(constraint)
+    return candidates
+
+
+def element_resource_sets(constraint):
+    # list of resource lists of all 'resource_set' elements in constraint
+    return [
+        [resource_ref.attrib.get('id') for resource_ref in resource_set.findall('resource_ref')]
+        for resource_set in constraint.findall('resource_set')
+    ]
+
+
+def find_set_constraint(constraints, resource_sets, constraint_id=None):
+    """Find set constraint matching constraint_id or (when not given) with same resources in same sets."""
+    wanted_resource_sets = [list(resource_set['resources']) for resource_set in resource_sets]
+    for constr in constraints:
+        if constraint_id is not None:
+            if constr.attrib.get('id') == constraint_id:
+                return constr
+        elif element_resource_sets(constr) == wanted_resource_sets:
+            return constr
+    return None
+
+
+def resource_sets_differ(constraint, resource_sets):
+    """Check if resources or options of sets in constraint differ from requested resource_sets.
+
+    Returns None when they are same, 'options' when only options of sets differ
+    and 'resources' when the sets contain different resources.
+    """
+    wanted_resource_sets = [list(resource_set['resources']) for resource_set in resource_sets]
+    if element_resource_sets(constraint) != wanted_resource_sets:
+        return 'resources'
+    for element, resource_set in zip(constraint.findall('resource_set'), resource_sets):
+        for attribute, value in resource_set_attributes(resource_set).items():
+            if element.attrib.get(attribute, RESOURCE_SET_ATTRIBUTES_DEFAULTS[attribute]) != value:
+                return 'options'
+    return None
+
+
+def resource_sets_change(module, constraint_id, resource_sets, constraint_attributes):
+    """Return compute_change() function for update_cib() that updates options of set constraint in place."""
+    def compute_change(cib_root):
+        constraint = cib_root.find("./configuration/constraints/*[@id='%s']" % constraint_id)
+        if constraint is None:
+            module.fail_json(msg="Constraint '%s' disappeared from cluster configuration while updating it." % constraint_id)
+        changed = False
+        for name, value in constraint_attributes.items():
+            if constraint.attrib.get(name) != value:
+                constraint.set(name, value)
+                changed = True
+        for element, resource_set in zip(constraint.findall('resource_set'), resource_sets):
+            for attribute, value in resource_set_attributes(resource_set).items():
+                if element.attrib.get(attribute, RESOURCE_SET_ATTRIBUTES_DEFAULTS[attribute]) != value:
+                    element.set(attribute, value)
+                    changed = True
+        return changed
+    return compute_change
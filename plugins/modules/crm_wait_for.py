@@ -70,9 +70,13 @@ options:
     default: []
     type: list
     elements: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - tested on XXX
    - This modules requires the C(crm_mon) binary to be present on target system.
+   - "When installed C(crm_mon) supports C(--include)/C(--exclude) and C(--resource) options (pacemaker 2.0.3 and newer)
+     the module queries only the sections and resource it needs. Older versions fall back to the full C(crm_mon -1r --as-xml) output."
    - "LIMITATION: module gets list of nodes only once it starts."
 '''
 
@@ -143,21 +147,53 @@ rsc_inactive_node_set:
 '''
 
 import os.path
+import re
 import xml.etree.ElementTree as ET
 import datetime
 import time
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
 
 
-def get_crm_data(module):
+def detect_crm_mon_filters(module):
+    # detect which output filtering options are supported by installed crm_mon
+    # --include/--exclude and --resource were introduced in pacemaker 2.0.3
+    crm_mon_filters = {'include': False, 'resource': False}
+    rc, out, err = module.run_command('crm_mon --help-all')
+    if rc == 0:
+        crm_mon_filters['include'] = re.search(r'--include[=\s]', out) is not None
+        crm_mon_filters['resource'] = re.search(r'--resource[=\s]', out) is not None
+    return crm_mon_filters
+
+
+def get_crm_mon_cmd(crm_mon_filters, sections, resource=None):
+    # without section filtering support we have to retrieve complete cluster state
+    if not crm_mon_filters['include']:
+        return 'crm_mon -1r --as-xml'
+    cmd = 'crm_mon -1r --output-as=xml --exclude=all --include=' + ','.join(sections)
+    if resource is not None and crm_mon_filters['resource']:
+        cmd += ' --resource=' + resource
+    return cmd
+
+
+def get_crm_data(module, crm_mon_filters, sections, resource=None):
     # get running cluster crm_mon state informantion
-    rc, out, err = module.run_command('crm_mon -1r --as-xml')
+    cmd = get_crm_mon_cmd(crm_mon_filters, sections, resource)
+    rc, out, err = module.run_command(cmd)
+    if rc != 0 and crm_mon_filters['include']:
+        # filtered query failed, fall back to full crm_mon output for this and all following checks
+        crm_mon_filters['include'] = False
+        crm_mon_filters['resource'] = False
+        cmd = get_crm_mon_cmd(crm_mon_filters, sections, resource)
+        rc, out, err = module.run_command(cmd)
     if rc == 0:
-        return ET.fromstring(out)
+        with profile_phase(module, 'parse_cib'):
+            return ET.fromstring(out)
     else:
-        module.fail_json(msg='Failed to get current cluster state from crm_mon', out=out, error=err)
+        module.fail_json(msg='Failed to get current cluster state from crm_mon', cmd=cmd, out=out, error=err)
 
 
 def run_module():
@@ -169,9 +205,12 @@ def run_module():
             timeout=dict(type='int', default=60),
             sleep=dict(type='int', default=2),
             node_list=dict(required=False, type='list', elements='str', default=[]),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     resource = module.params['resource']
@@ -195,8 +234,11 @@ def run_module():
     if delay:
         time.sleep(delay)
 
+    # detect which parts of crm_mon output we can skip when checking the resource state
+    crm_mon_filters = detect_crm_mon_filters(module)
+
     # construct set of cluster nodes
-    crm_root = get_crm_data(module)
+    crm_root = get_crm_data(module, crm_mon_filters, ['nodes'])
     cluster_nodes = crm_root.findall(".//nodes/node")
     result['cluster_nodes'] = set()
     for node in cluster_nodes:
@@ -213,7 +255,7 @@ def run_module():
 
     # BEGIN - MAIN WAITING LOOP
     while datetime.datetime.utcnow() < end:
-        crm_root = get_crm_data(module)
+        crm_root = get_crm_data(module, crm_mon_filters, ['resources'], resource)
         crm_resource = crm_root.findall(".//resource[@id='" + resource + "']")
         # additional variables
         result['rsc_active_node_set'] = set()
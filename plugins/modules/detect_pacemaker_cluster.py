@@ -24,6 +24,8 @@ notes:
    - Tested on CentOS 7.5
    - works only with pacemaker clusters that uses /etc/corosync/corosync.conf
 requirements: [ ]
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 '''
 
 EXAMPLES = '''
@@ -33,13 +35,19 @@ EXAMPLES = '''
 
 import re
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
         module = AnsibleModule(
-            argument_spec=dict(),
+            argument_spec=dict(
+                profile=dict(required=False, default=False, type='bool'),
+            ),
             supports_check_mode=True
         )
+        enable_command_runner(module)
+        enable_profiling(module)
 
         result = {}
 
@@ -45,6 +45,8 @@ options:
       - "password of 'cluster user' for cluster authentication"
     required: false
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
   - This module is (de)authenticating nodes only 1-way == authenticating node 1 agains
     node 2 doesn't mean that node 2 is authenticated agains node 1!
@@ -78,6 +80,8 @@ import json
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
@@ -86,10 +90,13 @@ def run_module():
             state=dict(default="present", choices=['present', 'absent']),
             node_name=dict(required=True),
             username=dict(required=False, default="hacluster"),
-            password=dict(required=False, no_log=True)
+            password=dict(required=False, no_log=True),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     node_name = module.params['node_name']
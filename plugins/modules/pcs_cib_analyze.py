@@ -0,0 +1,577 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_cib_analyze
+short_description: "report size of cluster CIB, find redundant constraints and compact the configuration"
+description:
+  - "Module reports size in bytes and number of elements of every section of cluster CIB and of resources with
+    biggest configuration and operation history."
+  - "It finds constraints referring to resources that don't exist, duplicate constraints (same except their id),
+    location constraints of same resource and node that shadow or conflict with each other, colocation constraints
+    with opposite scores and order constraints forming a loop, empty meta_attributes/instance_attributes/utilization
+    elements and operation history of resources that are no longer configured."
+  - "From these findings module computes a compaction plan. Selected kinds of plan items can be applied
+    with C(compact), all of them are applied in one CIB update."
+version_added: "2.10"
+options:
+  compact:
+    description:
+      - "Kinds of plan items to apply, by default the plan is only reported."
+      - "'orphans' - remove constraints (or resources from resource sets of constraints) referring to resources that don't exist"
+      - "'duplicates' - remove duplicate constraints keeping the first one"
+      - "'empty_nvsets' - remove empty meta_attributes, instance_attributes and utilization elements"
+      - "'merge_locations' - replace location constraints of same resource and node with one constraint with their combined score"
+      - "'tags' - replace location constraints of 3 or more resources with same node and score with one constraint for tag of these resources"
+      - "'rules' - replace location constraints of resource with same score on 3 or more nodes with one constraint with rule matching these nodes"
+      - "'sets' - replace 3 or more colocation or order constraints with same resource on one side by one constraint with resource sets"
+    required: false
+    default: []
+    type: list
+    elements: str
+    choices: ['orphans', 'duplicates', 'empty_nvsets', 'merge_locations', 'tags', 'rules', 'sets']
+  top:
+    description:
+      - "Number of resources with biggest configuration and operation history to return in C(cib.resources)."
+    required: false
+    default: 20
+    type: int
+  cib_file:
+    description:
+      - "Analyze and compact CIB in specified file instead of running cluster
+        (for example file from M(ondrejhome.ha_cluster.pcs_cib_transaction))."
+    required: false
+    type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(pcs) binary to be present on target system when C(cib_file) is not used.
+   - "Every plan item keeps the meaning of configuration - scores of location constraints for same resource and node
+     add up in pacemaker, so merged constraint gets their sum. Conflicting colocation and order constraints are only reported."
+   - "Constraints referring to tags require pacemaker-1.1.12 or newer."
+   - "Operation history of resources that are no longer configured is only reported, it is part of cluster status and
+     it is removed by 'pcs resource cleanup'."
+   - "In check mode with diff (C(--check --diff)) the impact of C(compact) on running resources is returned in C(impact)."
+'''
+
+EXAMPLES = '''
+- name: report size of CIB and compaction plan
+  pcs_cib_analyze:
+  register: cib_analysis
+
+- name: show the biggest resources
+  debug:
+    var: cib_analysis.cib.resources
+
+- name: remove orphaned, duplicate and merge shadowed constraints
+  pcs_cib_analyze:
+    compact: ['orphans', 'duplicates', 'empty_nvsets', 'merge_locations']
+
+- name: compact constraints in CIB transaction
+  pcs_cib_analyze:
+    compact: ['tags', 'rules', 'sets']
+    cib_file: "{{ cib_transaction.cib_file }}"
+'''
+
+RETURN = '''
+cib:
+  description:
+    - "C(bytes) - size of whole CIB, C(sections) - size and number of elements of every section of configuration and of status section."
+    - "C(resources) - top-level resources with biggest size of configuration together with operation history (C(status_bytes))
+      and number of constraints referring to them or to their children."
+  returned: always
+  type: dict
+  sample: {'bytes': 1843200, 'elements': 31000,
+           'sections': {'resources': {'bytes': 921000, 'elements': 16000}, 'status': {'bytes': 650000, 'elements': 9000}},
+           'resources': [{'id': 'db-clone', 'bytes': 2100, 'elements': 25, 'status_bytes': 4400, 'constraints': 12}]}
+findings:
+  description:
+    - "C(missing_references) - constraints with resources that don't exist, C(duplicate_constraints) - constraints with same
+      definition, C(conflicting_constraints) - constraints that shadow or conflict with each other, C(empty_nvsets) - number
+      of empty attribute sets, C(orphan_history) - resources in operation history that are not configured."
+  returned: always
+  type: dict
+  sample: {'missing_references': [{'constraint': 'location-old-node1-INFINITY', 'missing': ['old']}],
+           'duplicate_constraints': [{'kept': 'order-a-b-mandatory', 'duplicates': ['order-a-b-mandatory-1']}],
+           'conflicting_constraints': [{'type': 'conflicting', 'constraints': ['location-a-node1-INFINITY', 'location-a-node1--INFINITY']}],
+           'empty_nvsets': 3, 'orphan_history': ['old']}
+plan:
+  description:
+    - "Compaction plan, every item has C(kind) (value for C(compact)), C(action), C(constraints) replaced or removed by it,
+      C(description) and estimated C(saved_bytes)."
+  returned: always
+  type: list
+  elements: dict
+  sample: [{'kind': 'tags', 'action': 'location_tag', 'constraints': ['location-a-node1-100', 'location-b-node1-100', 'location-c-node1-100'],
+            'description': 'location of 3 resources on node1 with score 100 by tag location-a-node1-100-resources', 'saved_bytes': 120}]
+saved_bytes:
+  description: "Estimated size reduction of CIB by plan items selected by C(compact)."
+  returned: always
+  type: int
+  sample: 120
+'''
+
+import os.path
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import fetch_live_cib, update_cib
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel, NVSET_TAGS
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+COMPACT_KINDS = ['orphans', 'duplicates', 'empty_nvsets', 'merge_locations', 'tags', 'rules', 'sets']
+# smallest number of constraints replaced by one constraint with tag, rule or resource sets
+MIN_GROUP_SIZE = 3
+# score value of INFINITY in pacemaker
+INFINITY = 1000000
+# elements whose 'id' attribute refers to other element instead of identifying the element itself
+REFERENCE_TAGS = ['resource_ref', 'obj_ref']
+# attributes of plain colocation and order constraints that can be expressed by resource sets
+COLOCATION_SET_ATTRIBUTES = ['id', 'rsc', 'with-rsc', 'score', 'rsc-role', 'with-rsc-role']
+ORDER_SET_ATTRIBUTES = ['id', 'first', 'then', 'kind', 'score', 'symmetrical', 'first-action', 'then-action']
+
+
+def element_size(element):
+    # (bytes, number of elements)
+    return len(ET.tostring(element)), sum(1 for e in element.iter())
+
+
+def parse_score(score):
+    score = (score or '0').lstrip('+')
+    if score.lstrip('-') == 'INFINITY':
+        return -INFINITY if score.startswith('-') else INFINITY
+    return max(-INFINITY, min(INFINITY, int(score)))
+
+
+def format_score(score):
+    if abs(score) >= INFINITY:
+        return '-INFINITY' if score < 0 else 'INFINITY'
+    return str(score)
+
+
+def combined_score(scores):
+    # pacemaker adds scores, -INFINITY wins over INFINITY
+    values = [parse_score(score) for score in scores]
+    if -INFINITY in values:
+        return '-INFINITY'
+    if INFINITY in values:
+        return 'INFINITY'
+    return format_score(sum(values))
+
+
+def canonical(element):
+    # comparable form of element ignoring ids of the element and its children
+    attributes = tuple(sorted((name, value) for name, value in element.attrib.items() if name != 'id' or element.tag in REFERENCE_TAGS))
+    return (element.tag, attributes, tuple(canonical(child) for child in element))
+
+
+def attributes_key(element, *ignored):
+    return tuple(sorted((name, value) for name, value in element.attrib.items() if name not in ('id',) + ignored))
+
+
+class CompactionPlanner:
+    """Compute size report, findings and compaction plan for CIB in cib_root.
+
+    Plan items keep in '_apply' function that applies them to cib_root, so the plan for CIB
+    fetched again on conflict can be computed and applied same way as the reported one.
+    """
+
+    def __init__(self, cib_root):
+        self.cib_root = cib_root
+        self.configuration = cib_root.find('./configuration')
+        self.constraints_element = self.configuration.find('./constraints')
+        self.model = CibModel(cib_root)
+        self.tags = set(tag.attrib.get('id') for tag in self.configuration.findall('./tags/tag'))
+        self.used_ids = set(element.attrib.get('id') for element in self.configuration.iter() if element.attrib.get('id'))
+        # constraints already covered by some plan item
+        self.handled = set()
+        self.findings = {'missing_references': [], 'duplicate_constraints': [], 'conflicting_constraints': [],
+                         'empty_nvsets': 0, 'orphan_history': []}
+        self.plan = []
+
+    def unique_id(self, base):
+        new_id = base
+        counter = 0
+        while new_id in self.used_ids:
+            counter += 1
+            new_id = '%s-%d' % (base, counter)
+        self.used_ids.add(new_id)
+        return new_id
+
+    def add_item(self, kind, action, constraints, description, removed, added, apply_change):
+        self.plan.append({
+            'kind': kind,
+            'action': action,
+            'constraints': [constraint.attrib.get('id') for constraint in constraints],
+            'description': description,
+            'saved_bytes': sum(len(ET.tostring(element)) for element in removed) - sum(len(ET.tostring(element)) for element in added),
+            '_apply': apply_change,
+        })
+        self.handled.update(constraint.attrib.get('id') for constraint in constraints)
+
+    def replace_constraints(self, kind, action, constraints, new_constraint, description, new_tag=None):
+        """Plan replacing constraints with new_constraint placed where the first of them is."""
+        def apply_change():
+            index = list(self.constraints_element).index(constraints[0])
+            for constraint in constraints:
+                self.constraints_element.remove(constraint)
+            self.constraints_element.insert(index, new_constraint)
+            if new_tag is not None:
+                tags = self.configuration.find('./tags')
+                if tags is None:
+                    tags = ET.SubElement(self.configuration, 'tags')
+                tags.append(new_tag)
+        added = [new_constraint] + ([new_tag] if new_tag is not None else [])
+        # replacement of group with longer one is not worth it (short ids and few constraints in group)
+        if kind in ['tags', 'rules', 'sets'] and sum(len(ET.tostring(element)) for element in constraints) <= sum(len(ET.tostring(element)) for element in added):
+            return
+        self.add_item(kind, action, constraints, description, constraints, added, apply_change)
+
+    def remove_constraints(self, kind, constraints, description):
+        def apply_change():
+            for constraint in constraints:
+                self.constraints_element.remove(constraint)
+        self.add_item(kind, 'remove_constraint', constraints, description, constraints, [], apply_change)
+
+    def pending_constraints(self, tag):
+        return [constraint.element for constraint in self.model.constraints
+                if constraint.tag == tag and constraint.id not in self.handled]
+
+    def sizes(self, top):
+        cib_bytes, cib_elements = element_size(self.cib_root)
+        sections = {}
+        for section in list(self.configuration) + self.cib_root.findall('./status'):
+            section_bytes, section_elements = element_size(section)
+            sections[section.tag] = {'bytes': section_bytes, 'elements': section_elements}
+
+        # size of operation history of every resource on all nodes
+        status_bytes = {}
+        for lrm_resource in self.cib_root.findall('./status/node_state/lrm/lrm_resources/lrm_resource'):
+            resource_id = lrm_resource.attrib.get('id')
+            status_bytes[resource_id] = status_bytes.get(resource_id, 0) + len(ET.tostring(lrm_resource))
+        # history of clone instances is stored as 'resource:N'
+        configured = set(self.model.resources)
+        self.findings['orphan_history'] = sorted(resource_id for resource_id in status_bytes
+                                                 if resource_id.split(':')[0] not in configured)
+
+        def descendants(resource_id):
+            result = [resource_id]
+            for child_id in self.model.resources[resource_id].children_ids:
+                result.extend(descendants(child_id))
+            return result
+
+        resources = []
+        for resource in self.model.resources.values():
+            if resource.parent_id is not None:
+                continue
+            resource_bytes, resource_elements = element_size(resource.element)
+            resource_ids = descendants(resource.id)
+            constraint_ids = set(constraint.id for resource_id in resource_ids for constraint in self.model.constraints_by_resource.get(resource_id, []))
+            resources.append({
+                'id': resource.id,
+                'bytes': resource_bytes,
+                'elements': resource_elements,
+                'status_bytes': sum(size for history_id, size in status_bytes.items() if history_id.split(':')[0] in resource_ids),
+                'constraints': len(constraint_ids),
+            })
+        resources.sort(key=lambda resource: -(resource['bytes'] + resource['status_bytes']))
+        return {'bytes': cib_bytes, 'elements': cib_elements, 'sections': sections, 'resources': resources[:top]}
+
+    def plan_orphans(self):
+        # constraints can refer also to resource templates and tags
+        existing = set(self.model.resources) | self.tags
+        existing.update(template.attrib.get('id') for template in self.configuration.findall('./resources/template'))
+        for constraint in self.model.constraints:
+            if 'rsc-pattern' in constraint.element.attrib:
+                continue
+            missing = [resource_id for resource_id in constraint.resources if resource_id not in existing]
+            if not missing:
+                continue
+            self.findings['missing_references'].append({'constraint': constraint.id, 'missing': missing})
+            if not constraint.has_resource_sets or len(missing) == len(constraint.resources):
+                self.remove_constraints('orphans', [constraint.element], 'remove constraint %s of missing %s' % (constraint.id, ', '.join(missing)))
+                continue
+
+            def remove_references(element=constraint.element, missing=set(missing)):
+                for resource_set in element.findall('resource_set'):
+                    for resource_ref in resource_set.findall('resource_ref'):
+                        if resource_ref.attrib.get('id') in missing:
+                            resource_set.remove(resource_ref)
+                    if len(resource_set.findall('resource_ref')) == 0:
+                        element.remove(resource_set)
+            removed = [resource_ref for resource_ref in constraint.element.iter('resource_ref') if resource_ref.attrib.get('id') in missing]
+            self.add_item('orphans', 'remove_references', [constraint.element],
+                          'remove missing %s from resource sets of %s' % (', '.join(missing), constraint.id), removed, [], remove_references)
+
+    def plan_duplicates(self):
+        first_by_key = {}
+        duplicates = {}
+        for constraint in self.model.constraints:
+            if constraint.id in self.handled:
+                continue
+            key = canonical(constraint.element)
+            if key in first_by_key:
+                duplicates.setdefault(first_by_key[key], []).append(constraint.element)
+            else:
+                first_by_key[key] = constraint.element
+        for first, elements in duplicates.items():
+            ids = [element.attrib.get('id') for element in elements]
+            self.findings['duplicate_constraints'].append({'kept': first.attrib.get('id'), 'duplicates': ids})
+            self.remove_constraints('duplicates', elements, 'remove duplicates of %s' % first.attrib.get('id'))
+
+    def plan_merge_locations(self):
+        groups = {}
+        for element in self.pending_constraints('rsc_location'):
+            if len(element) == 0 and 'node' in element.attrib and 'score' in element.attrib:
+                groups.setdefault(attributes_key(element, 'score'), []).append(element)
+        for elements in groups.values():
+            if len(elements) < 2:
+                continue
+            scores = [parse_score(element.attrib['score']) for element in elements]
+            ids = [element.attrib.get('id') for element in elements]
+            if min(scores) < 0 < max(scores):
+                self.findings['conflicting_constraints'].append({'type': 'conflicting', 'constraints': ids})
+            elif INFINITY in [abs(score) for score in scores]:
+                self.findings['conflicting_constraints'].append({'type': 'shadowed', 'constraints': ids})
+            new_constraint = ET.Element('rsc_location', dict(elements[0].attrib))
+            new_constraint.set('score', combined_score(element.attrib['score'] for element in elements))
+            self.replace_constraints('merge_locations', 'merge_locations', elements, new_constraint,
+                                     'merge %d location constraints into one with score %s' % (len(elements), new_constraint.attrib['score']))
+
+    def find_conflicts(self):
+        # colocation of same resources with opposite scores and order loops are reported only
+        colocation_scores = {}
+        for constraint in self.model.constraints:
+            if constraint.tag == 'rsc_colocation' and not constraint.has_resource_sets and len(constraint.resources) == 2:
+                pair = tuple(sorted(constraint.resources))
+                colocation_scores.setdefault(pair, []).append((constraint.id, parse_score(constraint.element.attrib.get('score'))))
+        for pair, scores in colocation_scores.items():
+            values = [score for constraint_id, score in scores]
+            if min(values) < 0 < max(values):
+                self.findings['conflicting_constraints'].append({'type': 'conflicting', 'constraints': [constraint_id for constraint_id, score in scores]})
+        orders = {}
+        for constraint in self.model.constraints:
+            if constraint.tag == 'rsc_order' and not constraint.has_resource_sets and len(constraint.resources) == 2:
+                orders.setdefault(tuple(constraint.resources), []).append(constraint.id)
+        for (first, then), constraint_ids in orders.items():
+            if first < then and (then, first) in orders:
+                self.findings['conflicting_constraints'].append({'type': 'order_loop', 'constraints': constraint_ids + orders[(then, first)]})
+
+    def group_candidates(self):
+        """Groups of constraints that can be replaced by one constraint, as (constraints, build function)."""
+        candidates = []
+        by_tag_key = {}
+        by_rule_key = {}
+        for element in self.pending_constraints('rsc_location'):
+            if len(element) == 0 and 'node' in element.attrib and 'score' in element.attrib and 'rsc' in element.attrib:
+                if element.attrib['rsc'] not in self.tags:
+                    by_tag_key.setdefault(attributes_key(element, 'rsc'), []).append(element)
+                by_rule_key.setdefault(attributes_key(element, 'node'), []).append(element)
+        candidates.extend((elements, self.build_location_tag) for elements in by_tag_key.values())
+        candidates.extend((elements, self.build_location_rule) for elements in by_rule_key.values())
+
+        by_with_rsc = {}
+        for element in self.pending_constraints('rsc_colocation'):
+            if len(element) == 0 and set(element.attrib) <= set(COLOCATION_SET_ATTRIBUTES):
+                by_with_rsc.setdefault(attributes_key(element, 'rsc'), []).append(element)
+        candidates.extend((elements, self.build_colocation_set) for elements in by_with_rsc.values())
+
+        by_first = {}
+        by_then = {}
+        for element in self.pending_constraints('rsc_order'):
+            if len(element) == 0 and set(element.attrib) <= set(ORDER_SET_ATTRIBUTES):
+                by_first.setdefault(attributes_key(element, 'then'), []).append(element)
+                by_then.setdefault(attributes_key(element, 'first'), []).append(element)
+        candidates.extend((elements, self.build_order_set_after) for elements in by_first.values())
+        candidates.extend((elements, self.build_order_set_before) for elements in by_then.values())
+        return candidates
+
+    def plan_groups(self):
+        # biggest groups first, every constraint is replaced at most once
+        for elements, build in sorted(self.group_candidates(), key=lambda candidate: -len(candidate[0])):
+            elements = [element for element in elements if element.attrib.get('id') not in self.handled]
+            if len(elements) >= MIN_GROUP_SIZE:
+                build(elements)
+
+    def build_location_tag(self, elements):
+        first = elements[0]
+        tag = ET.Element('tag', {'id': self.unique_id(first.attrib['id'] + '-resources')})
+        for element in elements:
+            ET.SubElement(tag, 'obj_ref', {'id': element.attrib['rsc']})
+        new_constraint = ET.Element('rsc_location', dict(first.attrib))
+        new_constraint.set('rsc', tag.attrib['id'])
+        self.replace_constraints('tags', 'location_tag', elements, new_constraint,
+                                 'location of %d resources on %s with score %s by tag %s' % (
+                                     len(elements), first.attrib['node'], first.attrib['score'], tag.attrib['id']), tag)
+
+    def build_location_rule(self, elements):
+        first = elements[0]
+        attributes = dict((name, value) for name, value in first.attrib.items() if name not in ['node', 'score'])
+        new_constraint = ET.Element('rsc_location', attributes)
+        rule = ET.SubElement(new_constraint, 'rule', {'id': self.unique_id(first.attrib['id'] + '-rule'),
+                                                      'boolean-op': 'or', 'score': first.attrib['score']})
+        for element in elements:
+            ET.SubElement(rule, 'expression', {'id': self.unique_id(rule.attrib['id'] + '-expr'), 'attribute': '#uname',
+                                               'operation': 'eq', 'value': element.attrib['node']})
+        self.replace_constraints('rules', 'location_rule', elements, new_constraint,
+                                 'location of %s on %d nodes with score %s by rule' % (first.attrib['rsc'], len(elements), first.attrib['score']))
+
+    def resource_set(self, constraint_id, resource_ids, attributes):
+        resource_set = ET.Element('resource_set', dict([('id', self.unique_id(constraint_id + '-set'))] + list(attributes.items())))
+        for resource_id in resource_ids:
+            ET.SubElement(resource_set, 'resource_ref', {'id': resource_id})
+        return resource_set
+
+    def build_sets(self, elements, common_attributes, first_set, second_set, description):
+        first = elements[0]
+        new_constraint = ET.Element(first.tag, dict((name, value) for name, value in first.attrib.items() if name in common_attributes))
+        new_constraint.append(self.resource_set(first.attrib['id'], *first_set))
+        new_constraint.append(self.resource_set(first.attrib['id'], *second_set))
+        self.replace_constraints('sets', 'resource_sets', elements, new_constraint, description)
+
+    def build_colocation_set(self, elements):
+        # members of earlier set are placed relative to the later set, 'sequential=false' keeps them independent of each other
+        first = elements[0]
+        dependent = {'sequential': 'false'}
+        if 'rsc-role' in first.attrib:
+            dependent['role'] = first.attrib['rsc-role']
+        anchor = {'role': first.attrib['with-rsc-role']} if 'with-rsc-role' in first.attrib else {}
+        self.build_sets(elements, ['id', 'score'], ([element.attrib['rsc'] for element in elements], dependent),
+                        ([first.attrib['with-rsc']], anchor),
+                        'colocation of %d resources with %s by resource sets' % (len(elements), first.attrib['with-rsc']))
+
+    def build_order_set_after(self, elements):
+        first = elements[0]
+        before = {'action': first.attrib['first-action']} if 'first-action' in first.attrib else {}
+        after = {'sequential': 'false'}
+        if 'then-action' in first.attrib:
+            after['action'] = first.attrib['then-action']
+        self.build_sets(elements, ['id', 'kind', 'score', 'symmetrical'], ([first.attrib['first']], before),
+                        ([element.attrib['then'] for element in elements], after),
+                        'order of %d resources after %s by resource sets' % (len(elements), first.attrib['first']))
+
+    def build_order_set_before(self, elements):
+        first = elements[0]
+        before = {'sequential': 'false'}
+        if 'first-action' in first.attrib:
+            before['action'] = first.attrib['first-action']
+        after = {'action': first.attrib['then-action']} if 'then-action' in first.attrib else {}
+        self.build_sets(elements, ['id', 'kind', 'score', 'symmetrical'], ([element.attrib['first'] for element in elements], before),
+                        ([first.attrib['then']], after),
+                        'order of %d resources before %s by resource sets' % (len(elements), first.attrib['then']))
+
+    def plan_empty_nvsets(self):
+        # attribute sets referenced by 'id-ref' and the references themselves are never empty
+        referenced = set(element.attrib['id-ref'] for element in self.configuration.iter() if 'id-ref' in element.attrib)
+        empty = []
+        for parent in self.configuration.iter():
+            for child in parent:
+                if (child.tag in NVSET_TAGS and len(child) == 0 and 'id-ref' not in child.attrib and
+                        child.attrib.get('id') not in referenced):
+                    empty.append((parent, child))
+        self.findings['empty_nvsets'] = len(empty)
+        if not empty:
+            return
+
+        def remove_nvsets():
+            for parent, child in empty:
+                parent.remove(child)
+        self.add_item('empty_nvsets', 'remove_nvsets', [], 'remove %d empty attribute sets' % len(empty),
+                      [child for parent, child in empty], [], remove_nvsets)
+
+    def compute(self):
+        if self.constraints_element is not None:
+            self.plan_orphans()
+            self.plan_duplicates()
+            self.plan_merge_locations()
+            self.find_conflicts()
+            self.plan_groups()
+        self.plan_empty_nvsets()
+        return self.plan
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            compact=dict(required=False, type='list', elements='str', default=[], choices=COMPACT_KINDS),
+            top=dict(required=False, default=20, type='int'),
+            cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    cib_file = module.params['cib_file']
+    compact = module.params['compact']
+    result = {'changed': False}
+
+    module.params['cib_file_param'] = ''
+    if cib_file is not None:
+        if not os.path.isfile(cib_file):
+            module.fail_json(msg="%(cib_file)s is not a file or doesn't exists" % module.params)
+        try:
+            with profile_phase(module, 'parse_cib'):
+                cib_root = ET.parse(cib_file).getroot()
+        except Exception as e:
+            module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
+        module.params['cib_file_param'] = '-f ' + cib_file
+    else:
+        if find_executable('pcs') is None:
+            module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
+        cib_root = fetch_live_cib(module)
+    if cib_root.find('./configuration') is None:
+        module.fail_json(msg="CIB doesn't contain 'configuration' section.")
+
+    with profile_phase(module, 'index_cib'):
+        planner = CompactionPlanner(cib_root)
+    with profile_phase(module, 'compare'):
+        result['cib'] = planner.sizes(module.params['top'])
+        plan = planner.compute()
+    result['findings'] = planner.findings
+    result['plan'] = [dict((key, value) for key, value in item.items() if not key.startswith('_')) for item in plan]
+    selected = [item for item in plan if item['kind'] in compact]
+    result['saved_bytes'] = sum(item['saved_bytes'] for item in selected)
+
+    if selected:
+        result['changed'] = True
+
+        def apply_plan(cib_root):
+            # plan is computed again for CIB that will be changed
+            items = [item for item in CompactionPlanner(cib_root).compute() if item['kind'] in compact]
+            for item in items:
+                item['_apply']()
+            return bool(items)
+
+        preview_impact(module, result, cib_root if cib_file is None else None, compute_change=apply_plan)
+        if not module.check_mode:
+            rc, out, err, push_cmd = update_cib(module, cib_file, apply_plan, cib_root=cib_root if cib_file is None else None)
+            if rc != 0:
+                module.fail_json(msg="Failed to push compacted configuration to cluster using command '" + push_cmd + "'", output=out, error=err)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
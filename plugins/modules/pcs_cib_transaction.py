@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_cib_transaction
+short_description: "batch changes to cluster CIB in a node-local file and push them to cluster at once"
+description:
+  - "Module for fetching the cluster CIB into a node-local file ('begin'), so that following pcs_* modules can apply
+    their changes to this file using their C(cib_file) option, and then pushing all accumulated changes
+    into running cluster as a single diff ('commit') or throwing them away ('abort')."
+  - "Pushing changes at once results in one CIB update and one scheduler transition instead of one per task."
+  - "All tasks using the C(cib_file) returned by 'begin' must run on the same node as this module."
+version_added: "2.10"
+options:
+  state:
+    description:
+      - "'begin' - fetch running cluster CIB into C(cib_file) and keep its copy for computing the diff on commit"
+      - "'commit' - push changes made to C(cib_file) since 'begin' to running cluster and remove transaction files"
+      - "'abort' - remove transaction files without pushing anything to cluster"
+    required: true
+    choices: ['begin', 'commit', 'abort']
+    type: str
+  cib_file:
+    description:
+      - "Path to node-local file holding the CIB of transaction."
+      - "When not specified with 'begin', new temporary file is created and its path is returned as C(cib_file)."
+      - "Required for 'commit' and 'abort'."
+    required: false
+    type: str
+  on_conflict:
+    description:
+      - "What to do on 'commit' when configuration of running cluster changed (its epoch increased) since 'begin'."
+      - "'fail' - don't push anything and fail. Transaction files are kept so the transaction can be aborted or committed with 'merge'."
+      - "'merge' - push the diff anyway on top of the current cluster configuration."
+    required: false
+    default: 'fail'
+    choices: ['fail', 'merge']
+    type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - "The 'begin' operation only reads the cluster configuration and is executed also in check mode
+     so the following tasks in check mode can work with C(cib_file). In check mode it writes the transaction files
+     but reports no change, 'commit' and 'abort' in check mode don't remove them."
+   - "Copy of the CIB from 'begin' is stored next to the C(cib_file) with '.orig' suffix."
+   - "Commit in check mode with diff (C(--check --diff)) returns in C(impact) the resources that would start, stop, move
+     or restart after the commit, computed by 'crm_simulate' on copy of running cluster CIB."
+'''
+
+EXAMPLES = '''
+- name: start CIB transaction
+  pcs_cib_transaction:
+    state: 'begin'
+  register: cib_transaction
+  run_once: true
+
+- name: create resources in transaction
+  pcs_resource:
+    name: "{{ item }}"
+    resource_type: 'ocf:pacemaker:Dummy'
+    cib_file: "{{ cib_transaction.cib_file }}"
+  loop: ['resA', 'resB', 'resC']
+  run_once: true
+
+- name: push all changes to cluster at once
+  pcs_cib_transaction:
+    state: 'commit'
+    cib_file: "{{ cib_transaction.cib_file }}"
+  run_once: true
+'''
+
+RETURN = '''
+cib_file:
+  description: Path to the node-local file with CIB of transaction.
+  returned: always
+  type: str
+  sample: '/tmp/pcs_cib_transaction_k2m1xq.xml'
+cib_version:
+  description: Version (admin_epoch:epoch:num_updates) of cluster CIB when transaction was started.
+  returned: when transaction file exists
+  type: str
+  sample: '0:42:3'
+live_cib_version:
+  description: Version (admin_epoch:epoch:num_updates) of running cluster CIB at time of 'commit'.
+  returned: on commit
+  type: str
+  sample: '0:43:1'
+impact:
+  description:
+    - "Actions that cluster would take after commit of the transaction as computed by 'crm_simulate' on copy of running cluster CIB
+      with configuration from transaction. Actions that cluster would take also without the transaction are not included."
+    - "C(transition_actions) is number of actions in transition graph after commit, C(baseline_transition_actions) without it.
+      C(verify_rc) and C(verify_messages) are results of 'crm_verify' on the configuration after commit."
+  returned: on commit in check mode with diff (C(--check --diff)) when C(crm_simulate) is available
+  type: dict
+  sample: {'actions': [{'action': 'move', 'resource': 'vip', 'details': '( node1 -> node2 )'}], 'summary': {'move': 1},
+           'transition_actions': 6, 'baseline_transition_actions': 0, 'verify_rc': 0, 'verify_messages': []}
+timings:
+  description: Commands run by module with their duration, exit code and output size and durations of module phases.
+  returned: when profiling is enabled
+  type: dict
+  sample: {'total_seconds': 1.52, 'commands_seconds': 1.49, 'commands': [{'cmd': 'pcs cluster cib', 'rc': 0, 'seconds': 0.61,
+           'stdout_bytes': 20310, 'stderr_bytes': 0}], 'phases': []}
+'''
+
+import os
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import (
+    fetch_live_cib_version,
+    format_cib_version,
+    get_cib_version,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
+
+
+def remove_transaction_files(module, cib_file, orig_cib_file):
+    for path in [cib_file, orig_cib_file]:
+        if os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                module.fail_json(msg="Failed to remove transaction file %s - %s" % (path, e))
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            state=dict(required=True, choices=['begin', 'commit', 'abort']),
+            cib_file=dict(required=False),
+            on_conflict=dict(required=False, default='fail', choices=['fail', 'merge']),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True,
+        required_if=[('state', 'commit', ['cib_file']), ('state', 'abort', ['cib_file'])],
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    state = module.params['state']
+    cib_file = module.params['cib_file']
+    on_conflict = module.params['on_conflict']
+
+    result = {'changed': False}
+
+    if find_executable('pcs') is None:
+        module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
+
+    if state == 'begin':
+        if cib_file is None:
+            cib_file_fd, cib_file = tempfile.mkstemp(prefix='pcs_cib_transaction_', suffix='.xml')
+            os.close(cib_file_fd)
+        orig_cib_file = cib_file + '.orig'
+        result['cib_file'] = cib_file
+
+        # snapshot the running cluster configuration (this is read-only so it is done also in check mode)
+        rc, out, err = module.run_command('pcs cluster cib')
+        if rc != 0:
+            module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
+        try:
+            cib_root = ET.fromstring(out)
+        except Exception as e:
+            module.fail_json(msg="Error encountered parsing the cluster configuration - %s" % (e))
+        try:
+            with open(cib_file, 'w') as f:
+                f.write(out)
+            shutil.copyfile(cib_file, orig_cib_file)
+        except (IOError, OSError) as e:
+            module.fail_json(msg="Error encountered writing transaction files - %s" % (e))
+        result['cib_version'] = format_cib_version(get_cib_version(cib_root))
+        # node-local transaction files are written also in check mode, but nothing is changed in the cluster
+        result['changed'] = not module.check_mode
+        module.exit_json(**result)
+
+    orig_cib_file = cib_file + '.orig'
+    result['cib_file'] = cib_file
+
+    if state == 'abort':
+        if os.path.isfile(cib_file) or os.path.isfile(orig_cib_file):
+            result['changed'] = True
+            if not module.check_mode:
+                remove_transaction_files(module, cib_file, orig_cib_file)
+        module.exit_json(**result)
+
+    # state == 'commit'
+    if not (os.path.isfile(cib_file) and os.path.isfile(orig_cib_file)):
+        module.fail_json(msg="Transaction files %s and %s doesn't exists. Was the transaction started with state 'begin'?" % (cib_file, orig_cib_file))
+    try:
+        new_cib_root = ET.parse(cib_file).getroot()
+        orig_cib_root = ET.parse(orig_cib_file).getroot()
+    except Exception as e:
+        module.fail_json(msg="Error encountered parsing the transaction files - %s" % (e))
+    result['cib_version'] = format_cib_version(get_cib_version(orig_cib_root))
+
+    # if nothing changed in configuration there is nothing to push
+    if ET.tostring(new_cib_root.find('./configuration')) == ET.tostring(orig_cib_root.find('./configuration')):
+        if not module.check_mode:
+            remove_transaction_files(module, cib_file, orig_cib_file)
+        module.exit_json(**result)
+
+    # detect changes made to running cluster configuration since the transaction started
+    live_cib_version = fetch_live_cib_version(module)
+    result['live_cib_version'] = format_cib_version(live_cib_version)
+    # num_updates is changing also with cluster status updates so only admin_epoch and epoch are compared
+    if live_cib_version[0:2] != get_cib_version(orig_cib_root)[0:2] and on_conflict == 'fail':
+        result['msg'] = ("Cluster configuration changed since the transaction started (%(cib_version)s -> %(live_cib_version)s). "
+                         "Abort the transaction or commit it with 'on_conflict=merge'." % result)
+        module.fail_json(**result)
+
+    result['changed'] = True
+
+    def apply_transaction(cib_root):
+        # configuration from transaction together with current status of cluster
+        cib_root.remove(cib_root.find('./configuration'))
+        cib_root.insert(0, new_cib_root.find('./configuration'))
+        return True
+
+    preview_impact(module, result, compute_change=apply_transaction)
+    if not module.check_mode:
+        push_cmd = 'pcs cluster cib-push ' + cib_file + ' diff-against=' + orig_cib_file
+        rc, out, err = module.run_command(push_cmd)
+        if rc != 0:
+            module.fail_json(msg="Failed to push transaction to cluster using command '" + push_cmd + "'", output=out, error=err)
+        remove_transaction_files(module, cib_file, orig_cib_file)
+
+    # END of module
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -68,6 +68,8 @@ options:
     required: false
     choices: ['none', 'add', 'remove']
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - Tested on CentOS 6.8, 6.9, 7.3, 7.4, 7.5
    - Tested on Red Hat Enterprise Linux 7.3, 7.4, 7.6
@@ -138,6 +140,8 @@ import re
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
@@ -150,9 +154,12 @@ def run_module():
             transport=dict(required=False, default="default", choices=['default', 'udp', 'udpu', 'knet']),
             transport_options=dict(required=False, default="", type='str'),
             allowed_node_changes=dict(required=False, default="none", choices=['none', 'add', 'remove']),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     allowed_node_changes = module.params['allowed_node_changes']
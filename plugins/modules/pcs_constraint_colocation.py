@@ -32,12 +32,14 @@ options:
   resource1:
     description:
       - first resource for constraint
-    required: true
+      - Required unless I(resource_sets) is specified
+    required: false
     type: str
   resource2:
     description:
       - second resource for constraint
-    required: true
+      - Required unless I(resource_sets) is specified
+    required: false
     type: str
   resource1_role:
     description:
@@ -65,15 +67,58 @@ options:
     required: false
     default: true
     type: bool
+  resource_sets:
+    description:
+      - "list of resource sets for creating set colocation constraint ('pcs constraint colocation set')"
+      - Mutually exclusive with I(resource1) and I(resource2)
+      - I(influence) is not used for set constraints
+    required: false
+    type: list
+    elements: dict
+    suboptions:
+      resources:
+        description:
+          - list of resources in set
+        required: true
+        type: list
+        elements: str
+      role:
+        description:
+          - role of resources in set
+        required: false
+        choices: ['Master', 'Slave', 'Promoted', 'Unpromoted', 'Started']
+        type: str
+      sequential:
+        description:
+          - whether the resources in set are colocated among themselves (pacemaker default is C(true))
+        required: false
+        type: bool
+      require_all:
+        description:
+          - whether all resources in set must be active (pacemaker default is C(true))
+        required: false
+        type: bool
+  constraint_id:
+    description:
+      - "id of set colocation constraint. When specified the set constraint is matched by it,
+        otherwise it is matched by the resources in its sets."
+      - Used only with I(resource_sets)
+    required: false
+    type: str
   cib_file:
     description:
       - "Apply changes to specified file containing cluster CIB instead of running cluster."
       - "This module requires the file to already contain cluster configuration."
     required: false
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - tested on CentOS 7.6, Fedora 29
    - no extra options allowed for constraints
+   - constraint that differs only in I(score) or I(influence) is updated in place keeping its id
+   - "in check mode with diff (C(--check --diff)) the resources that would start, stop, move or restart because of the
+     change are computed by 'crm_simulate' on copy of cluster CIB and returned in C(impact)"
    - "TODO: validation of resource names, score values"
 '''
 
@@ -107,6 +152,11 @@ EXAMPLES = '''
     resource1: 'resA'
     resource2: 'resB'
     influenece: false
+
+- name: keep all resources of application stack on the same node in one constraint
+  pcs_constraint_colocation:
+    resource_sets:
+      - resources: ['lvm1', 'fs1', 'ip1', 'app1']
 '''
 
 import os.path
@@ -114,22 +164,52 @@ import xml.etree.ElementTree as ET
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import (
+    constraint_attributes_change,
+    run_pcs_command,
+    update_cib,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.resource_sets import (
+    find_set_constraint,
+    resource_sets_change,
+    resource_sets_cmd,
+    resource_sets_differ,
+    set_constraint_candidates,
+    validate_resource_sets,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
 
 
 def run_module():
     module = AnsibleModule(
         argument_spec=dict(
             state=dict(default="present", choices=['present', 'absent']),
-            resource1=dict(required=True),
-            resource2=dict(required=True),
+            resource1=dict(required=False),
+            resource2=dict(required=False),
             resource1_role=dict(required=False, choices=['Master', 'Slave', 'Promoted', 'Unpromoted', 'Started'], default='Started'),
             resource2_role=dict(required=False, choices=['Master', 'Slave', 'Promoted', 'Unpromoted', 'Started'], default='Started'),
             score=dict(required=False, default="INFINITY"),
             influence=dict(required=False, type='bool', default=True),
+            resource_sets=dict(required=False, type='list', elements='dict', options=dict(
+                resources=dict(required=True, type='list', elements='str'),
+                role=dict(required=False, choices=['Master', 'Slave', 'Promoted', 'Unpromoted', 'Started']),
+                sequential=dict(required=False, type='bool'),
+                require_all=dict(required=False, type='bool'),
+            )),
+            constraint_id=dict(required=False),
             cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
         ),
-        supports_check_mode=True
+        supports_check_mode=True,
+        required_one_of=[('resource1', 'resource_sets')],
+        required_together=[('resource1', 'resource2')],
+        mutually_exclusive=[('resource1', 'resource_sets'), ('resource2', 'resource_sets')],
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     resource1 = module.params['resource1']
@@ -137,10 +217,15 @@ def run_module():
     resource1_role = module.params['resource1_role']
     resource2_role = module.params['resource2_role']
     score = module.params['score']
+    resource_sets = module.params['resource_sets']
+    constraint_id = module.params['constraint_id']
     cib_file = module.params['cib_file']
 
     result = {}
 
+    if resource_sets is not None:
+        validate_resource_sets(module, resource_sets)
+
     if find_executable('pcs') is None:
         module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
 
@@ -166,7 +251,8 @@ def run_module():
         # use cib_file if specified
         if os.path.isfile(cib_file):
             try:
-                current_cib = ET.parse(cib_file)
+                with profile_phase(module, 'parse_cib'):
+                    current_cib = ET.parse(cib_file)
             except Exception as e:
                 module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
             current_cib_root = current_cib.getroot()
@@ -177,7 +263,8 @@ def run_module():
         # get running cluster configuration
         rc, out, err = module.run_command('pcs cluster cib')
         if rc == 0:
-            current_cib_root = ET.fromstring(out)
+            with profile_phase(module, 'parse_cib'):
+                current_cib_root = ET.fromstring(out)
         else:
             module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
 
@@ -188,7 +275,19 @@ def run_module():
     # check if we have requested a non-default roles
     if resource1_role != 'Started' or resource2_role != 'Started':
         with_roles = True
-    constraints = current_cib_root.findall("./configuration/constraints/rsc_colocation")
+    with profile_phase(module, 'index_cib'):
+        cib_model = CibModel(current_cib_root)
+    if resource_sets is not None:
+        # set constraints are matched by constraint_id or by resources in sets
+        if constraint_id is not None:
+            candidates = [cib_model.by_id[constraint_id]] if constraint_id in cib_model.by_id else []
+        else:
+            candidates = set_constraint_candidates(cib_model, resource_sets)
+        constraint = find_set_constraint([constr.element for constr in candidates if constr.tag == 'rsc_colocation' and constr.has_resource_sets],
+                                         resource_sets, constraint_id)
+        constraints = []
+    else:
+        constraints = cib_model.constraint_elements('rsc_colocation', resource=resource1)
     for constr in constraints:
         # constraint is matched using following criteria:
         # - resource order (resource1 with resource2)
@@ -205,8 +304,8 @@ def run_module():
         result.update({
             'constraint_was_matched': True,
             'score': constraint.attrib.get('score'),
-            'resource1_role': constr.attrib.get('rsc-role'),
-            'resource2_role': constr.attrib.get('with-rsc-role'),
+            'resource1_role': constraint.attrib.get('rsc-role'),
+            'resource2_role': constraint.attrib.get('with-rsc-role'),
         })
     else:
         result.update({'constraint_was_matched': False})
@@ -217,7 +316,11 @@ def run_module():
         module.params['score_prefix'] = 'score='
     # colocation constraint creation command
     # TODO: check which old versions requires this, the 0.9.162 seems to handle 'Started' role correctly
-    if with_roles is True:
+    if resource_sets is not None:
+        module.params['constraint_id_option'] = '' if constraint_id is None else 'id=' + constraint_id
+        cmd_create = 'pcs %(cib_file_param)s constraint colocation' % module.params + resource_sets_cmd(resource_sets) + \
+            ' setoptions score=%(score)s %(constraint_id_option)s' % module.params
+    elif with_roles is True:
         if resource1_role != 'Started' and resource2_role != 'Started':
             cmd_create = """ pcs %(cib_file_param)s constraint colocation
                              add %(resource1_role)s %(resource1)s
@@ -241,8 +344,9 @@ def run_module():
     if state == 'present' and constraint is None:
         # constraint should be present, but we don't see it in configuration - lets create it
         result['changed'] = True
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_create])
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_create)
+            rc, out, err = run_pcs_command(module, cmd_create)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -250,24 +354,46 @@ def run_module():
 
     elif state == 'present' and constraint is not None:
         # constraint should be present, lets see if it has different score from requested, if yes, then we do update
-        if constraint.attrib.get('score', 'INFINITY') != score or (pcs_version == '0.11' and 'influence=' + constraint.attrib.get('influence', 'true') != influence):
+        # for set constraints also the options of resource sets (sequential, require-all, role) are compared
+        sets_difference = None if resource_sets is None else resource_sets_differ(constraint, resource_sets)
+        if sets_difference == 'resources':
+            # set constraint matched by constraint_id contains different resources, we need to recreate it
             result['changed'] = True
+            preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_delete, cmd_create])
             if not module.check_mode:
-                rc, out, err = module.run_command(cmd_delete)
+                rc, out, err = run_pcs_command(module, cmd_delete)
                 if rc != 0:
                     module.fail_json(msg="Failed to delete constraint for replacement with cmd: '" + cmd_delete + "'", output=out, error=err)
+                rc, out, err = run_pcs_command(module, cmd_create)
+                if rc == 0:
+                    module.exit_json(**result)
+                else:
+                    module.fail_json(msg="Failed to create constraint replacement with cmd: '" + cmd_create + "'", output=out, error=err)
+        elif (sets_difference == 'options' or constraint.attrib.get('score', 'INFINITY') != score
+                or (resource_sets is None and pcs_version == '0.11' and 'influence=' + constraint.attrib.get('influence', 'true') != influence)):
+            result['changed'] = True
+            # update the existing constraint in place so the cluster is never left without it
+            constraint_attributes = {'score': score}
+            if resource_sets is not None:
+                compute_change = resource_sets_change(module, constraint.attrib.get('id'), resource_sets, constraint_attributes)
+            else:
+                if pcs_version == '0.11':
+                    constraint_attributes['influence'] = influence.split('=')[1]
+                compute_change = constraint_attributes_change(module, constraint.attrib.get('id'), constraint_attributes)
+            preview_impact(module, result, current_cib_root, compute_change=compute_change)
+            if not module.check_mode:
+                rc, out, err, push_cmd = update_cib(module, cib_file, compute_change, cib_root=current_cib_root)
+                if rc == 0:
+                    module.exit_json(**result)
                 else:
-                    rc, out, err = module.run_command(cmd_create)
-                    if rc == 0:
-                        module.exit_json(**result)
-                    else:
-                        module.fail_json(msg="Failed to create constraint replacement with cmd: '" + cmd_create + "'", output=out, error=err)
+                    module.fail_json(msg="Failed to update constraint with cmd: '" + push_cmd + "'", output=out, error=err)
 
     elif state == 'absent' and constraint is not None:
         # constraint should not be present but we have found something - lets remove that
         result['changed'] = True
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_delete])
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_delete)
+            rc, out, err = run_pcs_command(module, cmd_delete)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -38,17 +38,30 @@ options:
   node_name:
     description:
       - node name for constraints
-      - One of C(rule) or C(node_name) is required
-      - Mutually exclusive with C(rule)
+      - One of C(rule), C(node_name) or C(node_scores) is required
+      - Mutually exclusive with C(rule) and C(node_scores)
     required: false
     type: str
   rule:
     description:
       - rule expression for constraints
-      - One of C(rule) or C(node_name) is required
-      - Mutually exclusive with C(node_name)
+      - One of C(rule), C(node_name) or C(node_scores) is required
+      - Mutually exclusive with C(node_name) and C(node_scores)
     required: false
     type: str
+  node_scores:
+    description:
+      - "map of node name -> score of all node based location constraints of C(resource)"
+      - "With I(state=present) the node based location constraints of C(resource) are reconciled in one run:
+        missing ones are created, ones with different score are updated and ones for nodes not present in map are removed."
+      - "With I(state=absent) the node based location constraints of C(resource) for nodes in map are removed."
+      - "Constraints 'cli-prefer-*' and 'cli-ban-*' created by 'pcs resource move/ban' are left alone in both states."
+      - "New constraints are created using single 'pcs constraint location prefers' (positive scores)
+        and single 'avoids' (negative scores) command for all nodes."
+      - One of C(rule), C(node_name) or C(node_scores) is required
+      - Mutually exclusive with C(node_name), C(rule) and C(score)
+    required: false
+    type: dict
   constraint_id:
     description:
       - unique name for the constraint
@@ -74,11 +87,17 @@ options:
     type: str
     required: false
     choices: ['always', 'never', 'exclusive']
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - tested on CentOS 7.6, Fedora 29
    - specifying non-existing node_name for Fedora 29 produces error. Use only existing node names.
-   - note that 'date in_range ... to duration ...' is not idempotent
+   - rule is compared with existing constraint by its structure (nested parentheses, 'and'/'or', date expressions),
+     rules that can't be parsed by module are always considered different and constraint is re-created
    - presence/absence of resource_discovery option is not considered when checking if constrain should be changed
+   - constraint that differs only in I(score) is updated in place keeping its id
+   - "in check mode with diff (C(--check --diff)) the resources that would start, stop, move or restart because of the
+     change are computed by 'crm_simulate' on copy of cluster CIB and returned in C(impact)"
 '''
 
 EXAMPLES = '''
@@ -106,6 +125,14 @@ EXAMPLES = '''
     score: '-INFINITY'
     state: 'absent'
 
+- name: resource resA prefers node1, can run on node2 and must not run on node3 (other node constraints of resA are removed)
+  pcs_constraint_location:
+    resource: 'resA'
+    node_scores:
+      node1: '100'
+      node2: '0'
+      node3: '-INFINITY'
+
 - name: moving resources due to connectivity changes (needs ocf:pacemaker:ping resource)
   pcs_constraint_location:
     resource: 'resA'
@@ -137,176 +164,98 @@ EXAMPLES = '''
 '''
 
 import os.path
-import re
 import xml.etree.ElementTree as ET
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
-
-class DateSpec:
-    hours = None
-    monthdays = None
-    weekdays = None
-    yeardays = None
-    months = None
-    weeks = None
-    years = None
-    weekyears = None
-    moon = None
-
-    def __init__(self, expression):
-        for match_group in re.findall(
-            r"(hours|monthdays|weekdays|yeardays|months|weeks|years|weekyears|moon)=['\"]?([\w-]+)['\"]?\s*",
-            expression,
-        ):
-            setattr(self, match_group[0], match_group[1])
-
-    def compare(self, xml):
-        """Check if given XML element matches the date-spec expression."""
-        if any(
-            [
-                xml.get("hours") != self.hours,
-                xml.get("monthdays") != self.monthdays,
-                xml.get("weekdays") != self.weekdays,
-                xml.get("yeardays") != self.yeardays,
-                xml.get("months") != self.months,
-                xml.get("weeks") != self.weeks,
-                xml.get("years") != self.years,
-                xml.get("weekyears") != self.weekyears,
-                xml.get("moon") != self.moon,
-            ]
-        ):
-            return False
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import (
+    constraint_attributes_change,
+    run_pcs_command,
+    update_cib,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.pcs_rule import (
+    RuleParseError,
+    expression_matches_element,
+    parse_rule,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+
+def reconcile_node_scores(module, cib_root, resource, node_scores, state, cib_file):
+    """Create/update/remove all node based location constraints of resource in one run."""
+    node_scores = dict((node, str(score)) for node, score in node_scores.items())
+    result = {'changed': False, 'nodes_added': [], 'nodes_updated': [], 'nodes_removed': []}
+
+    # node based location constraints of resource (constraints with rules and ones created by move/ban are not touched)
+    constraint_updates = {}
+    constraints_to_remove = []
+    seen_nodes = set()
+    for constr in CibModel(cib_root).constraint_elements('rsc_location', resource=resource):
+        constr_node = constr.attrib.get('node')
+        constraint_id = constr.attrib.get('id')
+        if constr_node is None or constraint_id.startswith('cli-prefer-') or constraint_id.startswith('cli-ban-'):
+            continue
+        if state == 'absent':
+            if constr_node in node_scores:
+                constraints_to_remove.append(constraint_id)
+                result['nodes_removed'].append(constr_node)
+        elif constr_node not in node_scores or constr_node in seen_nodes:
+            # constraint for node that is not in map or duplicate constraint for same node
+            constraints_to_remove.append(constraint_id)
+            result['nodes_removed'].append(constr_node)
+        elif constr.attrib.get('score') != node_scores[constr_node]:
+            constraint_updates[constraint_id] = node_scores[constr_node]
+            result['nodes_updated'].append(constr_node)
+        seen_nodes.add(constr_node)
+
+    # missing constraints are created with one 'prefers' and one 'avoids' command
+    cmds_create = []
+    if state == 'present':
+        prefers, avoids = [], []
+        for node, score in sorted(node_scores.items()):
+            if node in seen_nodes:
+                continue
+            result['nodes_added'].append(node)
+            if score.startswith('-'):
+                avoids.append(node + '=' + score[1:])
+            else:
+                prefers.append(node + '=' + score.lstrip('+'))
+        if prefers:
+            cmds_create.append('pcs %(cib_file_param)s constraint location %(resource)s prefers ' % module.params + ' '.join(prefers))
+        if avoids:
+            cmds_create.append('pcs %(cib_file_param)s constraint location %(resource)s avoids ' % module.params + ' '.join(avoids))
+
+    # update scores and remove constraints in single CIB update
+    def compute_change(cib_root):
+        constraints = cib_root.find('./configuration/constraints')
+        for constr in constraints.findall('rsc_location'):
+            constraint_id = constr.attrib.get('id')
+            if constraint_id in constraints_to_remove:
+                constraints.remove(constr)
+            elif constraint_id in constraint_updates:
+                constr.set('score', constraint_updates[constraint_id])
         return True
 
-    def __repr__(self):
-        return (
-            "DateSpec(hours:%s, weekdays:%s, monthdays:%s, yeardays:%s, months:%s, weeks:%s, years:%s, weekyears:%s, moon:%s)"
-            % (
-                self.hours,
-                self.weekdays,
-                self.monthdays,
-                self.yeardays,
-                self.months,
-                self.weeks,
-                self.years,
-                self.weekyears,
-                self.moon,
-            )
-        )
-
-class RscLocationRuleExpression:
-    operation = None
-    attribute = None
-    value = None
-    start = None
-    end = None
-    date_spec = None
-
-    def __init__(self, expression):
-        # expression: date gt|lt <date>
-        exp_parsed = re.search(r"^date\s+(gt|lt)\s+(.*)$", expression)
-        if exp_parsed:
-            self.operation = exp_parsed.group(1)
-            self.start = exp_parsed.group(2)
-            return
-
-        # expression: date in_range <date> to duration <duration>
-        exp_parsed = re.search(r"^date\s+(in_range)\s+(.*)\s+to\s+duration\s+(.*)$", expression)
-        if exp_parsed:
-            self.operation = exp_parsed.group(1)
-            self.start = exp_parsed.group(2)
-            self.date_spec = DateSpec(exp_parsed.group(3))
-            return
-
-        # expression: date in_range <date> to <date>
-        exp_parsed = re.search(r"^date\s+(in_range)\s+(.*)\s+to\s+(.*)$", expression)
-        if exp_parsed:
-            self.operation = exp_parsed.group(1)
-            self.start = exp_parsed.group(2)
-            self.end = exp_parsed.group(3)
-            return
-
-        # expression: date-spec <duration>
-        exp_parsed = re.search(r"^date-spec\s+(.*)$", expression)
-        if exp_parsed:
-            self.operation = "date_spec"
-            self.date_spec = DateSpec(exp_parsed.group(1))
-            return
-
-        # expression: defined|not_defined <node attribute>
-        exp_parsed = re.search(r"^(defined|not_defined)\s+(.*)$", expression)
-        if exp_parsed:
-            self.attribute = exp_parsed.group(2)
-            self.operation = exp_parsed.group(1)
-            return
-
-        # expression: <node attribute> lt|gt|lte|gte|eq|ne <value>
-        exp_parsed = re.search(r"^(.*)\s+(lt|gt|lte|gte|eq|ne)\s+(.*)$", expression)
-        if exp_parsed:
-            self.attribute = exp_parsed.group(1)
-            self.operation = exp_parsed.group(2)
-            self.value = exp_parsed.group(3)
-            return
-
-    def compare(self, xml):
-        """Check if given XML element matches the rule expression."""
-        date_spec = xml.find("duration") or xml.find("date_spec")
-        if any(
-            [
-                xml.get("operation") != self.operation,
-                xml.get("attribute") != self.attribute,
-                xml.get("value") != self.value,
-                xml.get("start") != self.start,
-                xml.get("end") != self.end,
-                date_spec is None and self.date_spec is not None,
-                date_spec is not None and self.date_spec is None,
-            ]
-        ):
-            return False
-
-        if date_spec is None and self.date_spec is None:
-            return True
-
-        if date_spec is not None and self.date_spec is not None:
-            return self.date_spec.compare(date_spec)
-
-        return True
+    result['changed'] = bool(result['nodes_added'] or result['nodes_updated'] or result['nodes_removed'])
+    if result['changed']:
+        preview_impact(module, result, cib_root, pcs_cmds=cmds_create, compute_change=compute_change)
+    if module.check_mode or not result['changed']:
+        module.exit_json(**result)
+
+    if constraint_updates or constraints_to_remove:
+        rc, out, err, push_cmd = update_cib(module, cib_file, compute_change, cib_root=cib_root)
+        if rc != 0:
+            module.fail_json(msg="Failed to update constraints with cmd: '" + push_cmd + "'", output=out, error=err, **result)
+
+    for cmd_create in cmds_create:
+        rc, out, err = run_pcs_command(module, cmd_create)
+        if rc != 0:
+            module.fail_json(msg="Failed to create constraints with cmd: '" + cmd_create + "'", output=out, error=err, **result)
+    module.exit_json(**result)
 
-    def __repr__(self):
-        return (
-            "RscLocationRuleExpression(operation:%s, attribute:%s, value:%s, start:%s, end:%s, date_spec:%s)"
-            % (
-                self.operation,
-                self.attribute,
-                self.value,
-                self.start,
-                self.end,
-                self.date_spec,
-            )
-        )
-
-def compare_rule_to_element(rule_string, xml_rule):
-    boolean_op = xml_rule.attrib.get("boolean-op")
-    if boolean_op and " %s " % boolean_op not in rule_string:
-        return False
-
-    expression_list = re.split(r"\s+or\s+|\s+and\s+", rule_string)
-    rule_parsed_list = [
-        RscLocationRuleExpression(expression)
-        for expression in expression_list
-    ]
-    xml_expressions = xml_rule.findall("expression") or  xml_rule.findall("date_expression")
-
-    if len(rule_parsed_list) != len(xml_expressions):
-        return False
-
-    if all(
-        exp.compare(xml_expressions[idx])
-        for idx, exp in enumerate(rule_parsed_list)
-    ):
-        return True
-    return False
 
 def run_module():
     module = AnsibleModule(
@@ -314,21 +263,26 @@ def run_module():
             state=dict(default="present", choices=['present', 'absent']),
             resource=dict(required=True),
             node_name=dict(required=False),
+            node_scores=dict(required=False, type='dict'),
             rule=dict(required=False),
             constraint_id=dict(required=False),
             score=dict(required=False, default="INFINITY"),
             cib_file=dict(required=False),
-            resource_discovery=dict(required=False,choices=['always', 'never', 'exclusive'])
+            resource_discovery=dict(required=False,choices=['always', 'never', 'exclusive']),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True,
-        mutually_exclusive=[("node_name", "rule")],
-        required_one_of=[("node_name", "rule")],
+        mutually_exclusive=[("node_name", "rule", "node_scores"), ("score", "node_scores")],
+        required_one_of=[("node_name", "rule", "node_scores")],
         required_by={"rule": "constraint_id","resource_discovery": ("constraint_id", "node_name")},
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     resource = module.params['resource']
     node_name = module.params['node_name']
+    node_scores = module.params['node_scores']
     rule = module.params['rule']
     constraint_id = module.params['constraint_id']
     score = module.params['score']
@@ -347,12 +301,21 @@ def run_module():
     else:
         module.fail_json(msg="pcs --version exited with non-zero exit code (" + rc + "): " + out + err)
 
+    rule_expression = None
+    if rule is not None:
+        # pcs-0.9 evaluates 'and' and 'or' with same precedence, newer versions bind 'and' tighter
+        try:
+            rule_expression = parse_rule(rule, and_binds_tighter=(pcs_version != '0.9'))
+        except RuleParseError as e:
+            module.warn("Unable to parse rule '%s' for comparison with existing constraints - %s" % (rule, e))
+
     module.params['cib_file_param'] = ''
     if cib_file is not None:
         # use cib_file if specified
         if os.path.isfile(cib_file):
             try:
-                current_cib = ET.parse(cib_file)
+                with profile_phase(module, 'parse_cib'):
+                    current_cib = ET.parse(cib_file)
             except Exception as e:
                 module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
             current_cib_root = current_cib.getroot()
@@ -363,23 +326,25 @@ def run_module():
         # get running cluster configuration
         rc, out, err = module.run_command('pcs cluster cib')
         if rc == 0:
-            current_cib_root = ET.fromstring(out)
+            with profile_phase(module, 'parse_cib'):
+                current_cib_root = ET.fromstring(out)
         else:
             module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
 
+    if node_scores is not None:
+        reconcile_node_scores(module, current_cib_root, resource, node_scores, state, cib_file)
+
     # check if non-default resource_discovery was requested
     module.params['resource_discovery_string'] = 'resource-discovery='+resource_discovery if (resource_discovery is not None) else ''
 
     # try to find the constraint we have defined
     constraint = None
-    constraints = current_cib_root.findall("./configuration/constraints/rsc_location")
+    with profile_phase(module, 'index_cib'):
+        constraints = CibModel(current_cib_root).constraint_elements('rsc_location', resource=resource)
     for constr in constraints:
         # constraint is considered found if we see resource and node as got through attributes
         constr_node = constr.attrib.get('node')
-        if constr.attrib.get("rsc") == resource and (
-            constr.attrib.get("id") == constraint_id
-            or (constr_node is not None and constr_node == node_name)
-        ):
+        if constr.attrib.get("id") == constraint_id or (constr_node is not None and constr_node == node_name):
             constraint = constr
             break
 
@@ -403,8 +368,9 @@ def run_module():
     if state == 'present' and constraint is None:
         # constraint should be present, but we don't see it in configuration - lets create it
         result['changed'] = True
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_create])
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_create)
+            rc, out, err = run_pcs_command(module, cmd_create)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -412,23 +378,40 @@ def run_module():
 
     elif state == 'present' and constraint is not None:
         # constraint should be present and we see similar constraint so lets check if it is same
+        # when only the score differs the constraint can be updated in place
+        constraint_attributes_update = None
         if rule is not None:
             constr_rule = constraint.find('rule')
-            if not constr_rule:
+            if constr_rule is None or rule_expression is None:
                 constraint_match = False
             else:
-                constraint_match = compare_rule_to_element(rule, constr_rule) and score == constr_rule.attrib.get("score")
+                with profile_phase(module, 'compare'):
+                    constraint_match = expression_matches_element(rule_expression, constr_rule)
+                if constraint_match and score != constr_rule.attrib.get("score"):
+                    constraint_attributes_update = constraint_attributes_change(module, constraint.attrib.get('id'), {'score': score}, 'rule')
         else:
-            constraint_match = score == constraint.attrib.get('score')
+            constraint_match = True
+            if score != constraint.attrib.get('score'):
+                constraint_attributes_update = constraint_attributes_change(module, constraint.attrib.get('id'), {'score': score})
 
-        if not constraint_match:
+        if constraint_attributes_update is not None:
+            result['changed'] = True
+            preview_impact(module, result, current_cib_root, compute_change=constraint_attributes_update)
+            if not module.check_mode:
+                rc, out, err, push_cmd = update_cib(module, cib_file, constraint_attributes_update, cib_root=current_cib_root)
+                if rc == 0:
+                    module.exit_json(**result)
+                else:
+                    module.fail_json(msg="Failed to update constraint with cmd: '" + push_cmd + "'", output=out, error=err)
+        elif not constraint_match:
             result['changed'] = True
+            preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_delete, cmd_create])
             if not module.check_mode:
-                rc, out, err = module.run_command(cmd_delete)
+                rc, out, err = run_pcs_command(module, cmd_delete)
                 if rc != 0:
                     module.fail_json(msg="Failed to delete constraint for replacement with cmd: '" + cmd_delete + "'", output=out, error=err)
                 else:
-                    rc, out, err = module.run_command(cmd_create)
+                    rc, out, err = run_pcs_command(module, cmd_create)
                     if rc == 0:
                         module.exit_json(**result)
                     else:
@@ -437,8 +420,9 @@ def run_module():
     elif state == 'absent' and constraint is not None:
         # constraint should not be present but we have found something - lets remove that
         result['changed'] = True
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd_delete])
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_delete)
+            rc, out, err = run_pcs_command(module, cmd_delete)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -0,0 +1,362 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_node_standby
+short_description: "put cluster nodes into standby and back waiting for resources to move"
+description:
+  - "Module puts cluster nodes into standby or takes them out of standby and waits until the cluster actually
+    finished moving the resources instead of waiting for fixed time. Time when each node got drained of resources
+    (or became active again) is returned so the length of maintenance windows can be tracked."
+  - "Before putting nodes into standby the module checks that the remaining active nodes keep cluster quorum,
+    that at least C(min_active_nodes) nodes stay active and, when cluster uses utilization based placement,
+    that remaining nodes have enough capacity for resources."
+  - "With state 'plan' the module only splits C(nodes) into batches that can be in standby at the same time,
+    these can be then processed one after another by rolling maintenance."
+version_added: "2.10"
+options:
+  nodes:
+    description:
+      - "Names of cluster nodes."
+    required: true
+    type: list
+    elements: str
+  state:
+    description:
+      - "'standby' - put nodes into standby and wait until no resources run on them"
+      - "'unstandby' - take nodes out of standby and wait until cluster finishes moving resources back"
+      - "'plan' - return C(batches) of nodes that can be in standby together, cluster is not changed"
+    required: false
+    default: standby
+    choices: ['standby', 'unstandby', 'plan']
+    type: str
+  max_batch_size:
+    description:
+      - "Maximal number of nodes in one batch for state 'plan'."
+    required: false
+    default: 1
+    type: int
+  min_active_nodes:
+    description:
+      - "Minimal number of cluster nodes (not counting remote nodes) that must stay active (online and not in standby)."
+    required: false
+    default: 1
+    type: int
+  wait:
+    description:
+      - "Wait until resources moved away from nodes put into standby or until cluster finished actions after nodes
+        were taken out of standby."
+    required: false
+    default: true
+    type: bool
+  wait_timeout:
+    description:
+      - "Number of seconds to wait for the cluster before failing."
+    required: false
+    default: 600
+    type: int
+  sleep:
+    description:
+      - "Number of seconds to sleep between checks of cluster state."
+    required: false
+    default: 2
+    type: int
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(pcs), C(crm_mon), C(cibadmin) and C(crm_resource) binaries to be present on target system.
+   - "Quorum is computed from output of C(corosync-quorumtool) when available (taking quorum device and two_node
+     mode into account), otherwise majority of cluster nodes is required."
+   - "Capacity is checked only when cluster property 'placement-strategy' is not 'default'. Clone instances are not
+     counted as they stop on nodes in standby instead of moving."
+   - "Nodes that are offline or already in standby are counted as not active when checking quorum and capacity."
+'''
+
+EXAMPLES = '''
+- name: split nodes into batches of up to 2 nodes keeping at least 3 nodes active
+  pcs_node_standby:
+    nodes: ['node1', 'node2', 'node3', 'node4', 'node5']
+    state: 'plan'
+    max_batch_size: 2
+    min_active_nodes: 3
+  register: maintenance_plan
+
+- name: put node1 into standby and wait until its resources run elsewhere
+  pcs_node_standby:
+    nodes: ['node1']
+
+- name: take node1 out of standby and wait for cluster to rebalance resources
+  pcs_node_standby:
+    nodes: ['node1']
+    state: 'unstandby'
+'''
+
+RETURN = '''
+nodes:
+  description:
+    - "Nodes with information whether their standby state was changed, number of seconds until they had no
+      resources running (C(drain_seconds)) or until they were active again (C(return_seconds))."
+  returned: when state is 'standby' or 'unstandby'
+  type: list
+  elements: dict
+  sample: [{'name': 'node1', 'changed': true, 'drain_seconds': 14}]
+settle_seconds:
+  description: "Number of seconds until cluster finished all actions caused by the change."
+  returned: when cluster was changed and waited for
+  type: int
+  sample: 21
+batches:
+  description: "Batches of nodes that can be in standby at the same time."
+  returned: when state is 'plan'
+  type: list
+  elements: list
+  sample: [['node1', 'node2'], ['node3']]
+'''
+
+import re
+import time
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import run_pcs_command
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+
+def get_node_states(module, crm_mon_cmd):
+    """Return {node name: crm_mon 'node' element attributes} and crm_mon command that worked."""
+    rc, out, err = module.run_command(crm_mon_cmd)
+    if rc != 0 and crm_mon_cmd != 'crm_mon -1 --as-xml':
+        # crm_mon older than pacemaker 2.0.3 doesn't support section filtering
+        crm_mon_cmd = 'crm_mon -1 --as-xml'
+        rc, out, err = module.run_command(crm_mon_cmd)
+    if rc != 0:
+        module.fail_json(msg='Failed to get current cluster state from crm_mon', cmd=crm_mon_cmd, out=out, error=err)
+    with profile_phase(module, 'parse_cib'):
+        crm_root = ET.fromstring(out)
+    return dict((node.attrib.get('name'), node.attrib) for node in crm_root.findall('.//nodes/node')), crm_mon_cmd
+
+
+def is_active(node_state):
+    return node_state.get('online') == 'true' and node_state.get('standby') != 'true'
+
+
+def get_quorum_votes(module, member_count):
+    """Return (expected votes, votes needed for quorum, votes not belonging to cluster nodes)."""
+    if find_executable('corosync-quorumtool') is not None:
+        rc, out, err = module.run_command('corosync-quorumtool -s')
+        expected = re.search(r'^Expected votes:\s+(\d+)', out, re.M)
+        quorum = re.search(r'^Quorum:\s+(\d+)', out, re.M)
+        if rc in [0, 2] and expected and quorum:
+            # quorum device votes don't go away with nodes in standby
+            return int(expected.group(1)), int(quorum.group(1)), max(int(expected.group(1)) - member_count, 0)
+    return member_count, member_count // 2 + 1, 0
+
+
+def utilization(element):
+    values = {}
+    for nvset in element.findall('utilization'):
+        for nvpair in nvset.findall('nvpair'):
+            try:
+                values[nvpair.attrib.get('name')] = int(nvpair.attrib.get('value'))
+            except (TypeError, ValueError):
+                pass
+    return values
+
+
+def capacity_demand(model):
+    """Return {utilization attribute: sum} of resources that move between nodes, None for 'default' placement."""
+    strategy = 'default'
+    for nvset in model.nvsets:
+        if nvset.owner_id == 'crm_config' and 'placement-strategy' in nvset.nvpairs:
+            strategy = nvset.nvpairs['placement-strategy']
+    if strategy == 'default':
+        return None
+    demand = {}
+    for resource in model.resources.values():
+        if resource.tag != 'primitive':
+            continue
+        ancestors = []
+        parent_id = resource.parent_id
+        while parent_id is not None:
+            ancestors.append(model.resources[parent_id])
+            parent_id = model.resources[parent_id].parent_id
+        if any(ancestor.tag in ['clone', 'master', 'bundle'] for ancestor in ancestors):
+            continue
+        stopped = any(nvpair.attrib.get('name') == 'target-role' and nvpair.attrib.get('value') == 'Stopped'
+                      for element in [resource] + ancestors for nvpair in element.element.findall('./meta_attributes/nvpair'))
+        if stopped:
+            continue
+        for name, value in utilization(resource.element).items():
+            demand[name] = demand.get(name, 0) + value
+    return demand
+
+
+class StandbyPlanner:
+    """Checks whether set of nodes can be in standby together without losing quorum or capacity."""
+
+    def __init__(self, module, node_states, model, min_active_nodes):
+        self.node_states = node_states
+        self.members = [name for name, state in node_states.items() if state.get('type', 'member') == 'member']
+        self.expected_votes, self.quorum, self.extra_votes = get_quorum_votes(module, len(self.members))
+        self.min_active_nodes = min_active_nodes
+        self.demand = capacity_demand(model)
+        self.node_capacity = dict((node.uname, utilization(node.element)) for node in model.nodes.values())
+
+    def problems(self, standby_nodes):
+        """Return list of reasons why standby_nodes can't be in standby together (empty when they can)."""
+        active = [name for name in self.members if is_active(self.node_states[name]) and name not in standby_nodes]
+        problems = []
+        if len(active) + self.extra_votes < self.quorum:
+            problems.append("only %d of %d votes would remain (%d needed for quorum)" %
+                            (len(active) + self.extra_votes, self.expected_votes, self.quorum))
+        if len(active) < self.min_active_nodes:
+            problems.append("only %d nodes would stay active (min_active_nodes is %d)" % (len(active), self.min_active_nodes))
+        if self.demand:
+            remote_active = [name for name in self.node_states if name not in self.members and
+                             is_active(self.node_states[name]) and name not in standby_nodes]
+            for name, needed in sorted(self.demand.items()):
+                capacity = sum(self.node_capacity.get(node, {}).get(name, 0) for node in active + remote_active)
+                if capacity < needed:
+                    problems.append("resources need %d of '%s' but remaining nodes have capacity %d" % (needed, name, capacity))
+        return problems
+
+    def batches(self, nodes, max_batch_size):
+        batches = []
+        for node in nodes:
+            problems = self.problems([node])
+            if problems:
+                return None, "Node '%s' can't be put into standby: %s." % (node, ', '.join(problems))
+            if batches and len(batches[-1]) < max_batch_size and not self.problems(batches[-1] + [node]):
+                batches[-1].append(node)
+            else:
+                batches.append([node])
+        return batches, None
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            nodes=dict(required=True, type='list', elements='str'),
+            state=dict(required=False, default='standby', choices=['standby', 'unstandby', 'plan']),
+            max_batch_size=dict(required=False, default=1, type='int'),
+            min_active_nodes=dict(required=False, default=1, type='int'),
+            wait=dict(required=False, default=True, type='bool'),
+            wait_timeout=dict(required=False, default=600, type='int'),
+            sleep=dict(required=False, default=2, type='int'),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    nodes = module.params['nodes']
+    state = module.params['state']
+    result = {'changed': False}
+
+    for binary in ['pcs', 'crm_mon', 'cibadmin', 'crm_resource']:
+        if find_executable(binary) is None:
+            module.fail_json(msg="'%s' executable not found. Install '%s'." % (binary, 'pcs' if binary == 'pcs' else 'pacemaker-cli'))
+    if module.params['max_batch_size'] < 1:
+        module.fail_json(msg="max_batch_size must be at least 1.")
+
+    crm_mon_cmd = 'crm_mon -1 --output-as=xml --exclude=all --include=nodes'
+    node_states, crm_mon_cmd = get_node_states(module, crm_mon_cmd)
+    unknown_nodes = [node for node in nodes if node not in node_states]
+    if unknown_nodes:
+        module.fail_json(msg="Nodes %s are not present in cluster." % ', '.join(unknown_nodes), cluster_nodes=sorted(node_states))
+
+    if state in ['standby', 'plan']:
+        rc, out, err = module.run_command('cibadmin --query --scope configuration')
+        if rc != 0:
+            module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
+        with profile_phase(module, 'index_cib'):
+            cib_root = ET.Element('cib')
+            cib_root.append(ET.fromstring(out))
+            planner = StandbyPlanner(module, node_states, CibModel(cib_root), module.params['min_active_nodes'])
+        if state == 'plan':
+            result['batches'], error = planner.batches(nodes, module.params['max_batch_size'])
+            if error is not None:
+                module.fail_json(msg=error, **result)
+            module.exit_json(**result)
+        problems = planner.problems(nodes)
+        if problems:
+            module.fail_json(msg="Nodes %s can't be put into standby together: %s." % (', '.join(nodes), ', '.join(problems)))
+
+    standby = state == 'standby'
+    to_change = [node for node in nodes if (node_states[node].get('standby') == 'true') != standby]
+    result['nodes'] = [{'name': node, 'changed': node in to_change} for node in nodes]
+    result['changed'] = len(to_change) > 0
+    if not result['changed'] or module.check_mode:
+        module.exit_json(**result)
+
+    rc, out, err = module.run_command('pcs --version')
+    if rc != 0:
+        module.fail_json(msg="pcs --version exited with non-zero exit code (" + str(rc) + "): " + out + err)
+    if out.startswith('0.9'):
+        cmds = ['pcs cluster %s %s' % (state, node) for node in to_change]
+    else:
+        cmds = ['pcs node %s %s' % (state, ' '.join(to_change))]
+    start = time.time()
+    for cmd in cmds:
+        rc, out, err = run_pcs_command(module, cmd)
+        if rc != 0:
+            module.fail_json(msg="Failed to change standby state of nodes using command '" + cmd + "'", output=out, error=err, **result)
+
+    if not module.params['wait']:
+        module.exit_json(**result)
+
+    # wait for the actual state of nodes, drained node has no resources running
+    seconds_key = 'drain_seconds' if standby else 'return_seconds'
+    pending = dict((item['name'], item) for item in result['nodes'] if item['changed'])
+    deadline = start + module.params['wait_timeout']
+    while True:
+        node_states, crm_mon_cmd = get_node_states(module, crm_mon_cmd)
+        for node in list(pending):
+            node_state = node_states.get(node, {})
+            if standby:
+                done = node_state.get('standby') == 'true' and node_state.get('resources_running', '0') == '0'
+            else:
+                done = is_active(node_state)
+            if done:
+                pending.pop(node)[seconds_key] = int(round(time.time() - start))
+        if not pending:
+            break
+        if time.time() >= deadline:
+            module.fail_json(msg="Nodes %s didn't get into desired state in %ds." % (', '.join(sorted(pending)), module.params['wait_timeout']),
+                             **result)
+        time.sleep(module.params['sleep'])
+
+    # resources moved away from (or back to) nodes are started elsewhere in the same transition
+    cmd = 'crm_resource --wait --timeout=%ds' % max(int(deadline - time.time()), 1)
+    rc, out, err = module.run_command(cmd)
+    if rc != 0:
+        module.fail_json(msg="Cluster didn't finish moving resources in %ds, cmd: '%s'" % (module.params['wait_timeout'], cmd),
+                         output=out, error=err, **result)
+    result['settle_seconds'] = int(round(time.time() - start))
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_op_stats
+short_description: "statistics of resource operations from operation history in cluster status"
+description:
+  - "Module reads the operation history (lrm_rsc_op entries) from status section of cluster CIB and returns
+    for every resource and every resource agent and operation (start, stop, monitor, probe, ...) the number
+    of operations, failures and percentiles of execution and queue time across all nodes."
+  - "Status section is processed as a stream so the module can be used also on clusters with large operation history."
+  - "Statistics are returned as fact C(pacemaker_op_stats) and optionally written into Prometheus textfile."
+  - "Module doesn't change anything in cluster."
+version_added: "2.10"
+options:
+  cib_file:
+    description:
+      - "Read the operation history from CIB in this file instead of running cluster."
+    required: false
+    type: str
+  resources:
+    description:
+      - "Return statistics only for these resources (primitive resource names as seen in operation history)."
+      - "By default all resources are included."
+    required: false
+    type: list
+    elements: str
+  percentiles:
+    description:
+      - "Percentiles of execution and queue time to compute."
+    required: false
+    default: [50, 90, 99]
+    type: list
+    elements: int
+  prometheus_textfile:
+    description:
+      - "Write the statistics in Prometheus text format into this file (for example for textfile collector of node_exporter)."
+      - "File is replaced atomically and only when its content changes."
+    required: false
+    type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(cibadmin) binary to be present on target system when C(cib_file) is not used.
+   - "Pacemaker keeps in operation history only the last operation of each kind (and last failure) for every resource on every node,
+     the statistics describe these operations and not all operations ever run."
+   - "Operation is counted as failed when its result differs from expected one (recorded in 'transition-key') or when it
+     didn't complete (timeout, error of executor)."
+'''
+
+EXAMPLES = '''
+- name: get statistics of operations of all resources
+  pcs_op_stats:
+
+- name: show 90th percentile of start time of 'database' resource
+  debug:
+    msg: "{{ pacemaker_op_stats.by_resource.database.start.exec_time_ms.p90 }}"
+
+- name: export statistics for node_exporter textfile collector
+  pcs_op_stats:
+    prometheus_textfile: /var/lib/node_exporter/textfile_collector/pacemaker_op_stats.prom
+    percentiles: [50, 99]
+'''
+
+RETURN = '''
+ansible_facts:
+  description: Facts to add to ansible_facts.
+  returned: always
+  type: complex
+  contains:
+    pacemaker_op_stats:
+      description:
+        - "C(by_resource) and C(by_agent) contain for every resource or agent (for example 'ocf:heartbeat:IPaddr2') dictionary
+          of operations with C(count), C(failures), C(exec_time_ms) and C(queue_time_ms) (min, max, mean and requested percentiles),
+          C(intervals_ms), C(nodes) and C(last_failure)."
+        - "C(operations) and C(failures) are totals of all included operations."
+      type: dict
+      sample: {'operations': 2, 'failures': 0,
+               'by_resource': {'vip': {'start': {'count': 2, 'failures': 0, 'exec_time_ms': {'min': 40, 'max': 52, 'mean': 46.0,
+                               'p50': 40, 'p90': 52, 'p99': 52}, 'queue_time_ms': {'min': 0, 'max': 0, 'mean': 0.0, 'p50': 0,
+                               'p90': 0, 'p99': 0}, 'intervals_ms': [0], 'nodes': ['node1', 'node2'], 'last_failure': null}}},
+               'by_agent': {'ocf:heartbeat:IPaddr2': {'start': {'count': 2, 'failures': 0}}}}
+'''
+
+import os
+import tempfile
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six.moves import shlex_quote
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_stats import aggregate_op_records, iter_op_records, percentile
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+
+def prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_metrics(by_resource, agents, percentiles):
+    """Return statistics per resource and operation in Prometheus text format."""
+    lines = []
+    for name, kind, help_text in [
+            ('pacemaker_op_exec_time_seconds', 'summary', 'Execution time of resource operations in operation history.'),
+            ('pacemaker_op_queue_time_seconds', 'summary', 'Queue time of resource operations in operation history.'),
+            ('pacemaker_op_failures', 'gauge', 'Failed resource operations in operation history.')]:
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s %s' % (name, kind))
+        for resource in sorted(by_resource):
+            for operation in sorted(by_resource[resource]):
+                op_stats = by_resource[resource][operation]
+                labels = 'resource="%s",agent="%s",operation="%s"' % (
+                    prometheus_label(resource), prometheus_label(agents.get(resource, '')), prometheus_label(operation))
+                if kind == 'gauge':
+                    lines.append('%s{%s} %d' % (name, labels, op_stats.failures))
+                    continue
+                values = sorted(op_stats.exec_times if 'exec' in name else op_stats.queue_times)
+                for percent in percentiles:
+                    lines.append('%s{%s,quantile="%s"} %.3f' % (name, labels, percent / 100.0, percentile(values, percent) / 1000.0))
+                lines.append('%s_sum{%s} %.3f' % (name, labels, sum(values) / 1000.0))
+                lines.append('%s_count{%s} %d' % (name, labels, len(values)))
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(module, path, content):
+    """Atomically replace file at path with content, return True when content changed."""
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except (IOError, OSError):
+        pass
+    if module.check_mode:
+        return True
+    try:
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.pcs_op_stats')
+        with os.fdopen(tmp_fd, 'w') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        module.fail_json(msg="Failed to write Prometheus textfile %s - %s" % (path, e))
+    return True
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            cib_file=dict(required=False),
+            resources=dict(required=False, type='list', elements='str'),
+            percentiles=dict(required=False, type='list', elements='int', default=[50, 90, 99]),
+            prometheus_textfile=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    cib_file = module.params['cib_file']
+    resources = set(module.params['resources']) if module.params['resources'] is not None else None
+    percentiles = module.params['percentiles']
+    prometheus_textfile = module.params['prometheus_textfile']
+    result = {'changed': False}
+
+    if any(percent < 1 or percent > 100 for percent in percentiles):
+        module.fail_json(msg="Percentiles must be between 1 and 100.")
+
+    if cib_file is not None:
+        if not os.path.isfile(cib_file):
+            module.fail_json(msg="%(cib_file)s is not a file or doesn't exists" % module.params)
+        source = cib_file
+    else:
+        if find_executable('cibadmin') is None:
+            module.fail_json(msg="'cibadmin' executable not found. Install 'pacemaker-cli'.")
+        # only the status section is needed, it is written to file so it is parsed as a stream
+        # instead of holding whole output of cibadmin in memory
+        status_fd, source = tempfile.mkstemp(prefix='pcs_op_stats_', suffix='.xml')
+        os.close(status_fd)
+        module.add_cleanup_file(source)
+        rc, out, err = module.run_command('cibadmin --query --scope status > ' + shlex_quote(source), use_unsafe_shell=True)
+        if rc != 0:
+            module.fail_json(msg='Failed to load cluster status', out=out, error=err)
+
+    # agent of every resource for labels of Prometheus metrics
+    agents = {}
+
+    def records():
+        for record in iter_op_records(source, resources):
+            agents[record.resource] = record.agent
+            yield record
+
+    try:
+        with profile_phase(module, 'parse_cib'):
+            by_resource, by_agent = aggregate_op_records(records())
+    except Exception as e:
+        module.fail_json(msg="Error encountered parsing the operation history - %s" % (e))
+
+    with profile_phase(module, 'compare'):
+        op_stats = {
+            'operations': sum(stats.count for operations in by_resource.values() for stats in operations.values()),
+            'failures': sum(stats.failures for operations in by_resource.values() for stats in operations.values()),
+            'by_resource': dict((name, dict((operation, stats.as_dict(percentiles)) for operation, stats in operations.items()))
+                                for name, operations in by_resource.items()),
+            'by_agent': dict((name, dict((operation, stats.as_dict(percentiles)) for operation, stats in operations.items()))
+                             for name, operations in by_agent.items()),
+        }
+    result['ansible_facts'] = {'pacemaker_op_stats': op_stats}
+
+    if prometheus_textfile is not None:
+        result['changed'] = write_textfile(module, prometheus_textfile, prometheus_metrics(by_resource, agents, percentiles))
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -50,10 +50,14 @@ options:
       - "Apply changes to specified file containing cluster CIB instead of running cluster."
     required: false
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - Tested on CentOS 7.6, Fedora 28, 29
    - Tested on Red Hat Enterprise Linux 7.6
    - node property values with spaces are not idempotent
+   - "in check mode with diff (C(--check --diff)) the effect of property change on resources is computed by 'crm_simulate'
+     on copy of cluster CIB and returned in C(impact)"
 '''
 
 EXAMPLES = '''
@@ -84,6 +88,10 @@ import os.path
 import re
 from distutils.spawn import find_executable
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import run_pcs_command
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
@@ -94,9 +102,12 @@ def run_module():
             node=dict(required=False),
             value=dict(required=False),
             cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     name = module.params['name']
@@ -180,8 +191,10 @@ def run_module():
             cmd_set = 'pcs %(cib_file_param)s node attribute %(node)s %(name)s=%(value)s' % module.params
         else:
             result['changed'] = False
+        if result['changed']:
+            preview_impact(module, result, pcs_cmds=[cmd_set])
         if not module.check_mode and result['changed']:
-            rc, out, err = module.run_command(cmd_set)
+            rc, out, err = run_pcs_command(module, cmd_set)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -197,8 +210,10 @@ def run_module():
             cmd_unset = 'pcs %(cib_file_param)s node attribute %(node)s %(name)s=' % module.params
         else:
             result['changed'] = False
+        if result['changed']:
+            preview_impact(module, result, pcs_cmds=[cmd_unset])
         if not module.check_mode and result['changed']:
-            rc, out, err = module.run_command(cmd_unset)
+            rc, out, err = run_pcs_command(module, cmd_unset)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -48,6 +48,8 @@ options:
     required: false
     choices: ['none', 'update']
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - Tested on Debian 10
    - "When adding/removing qdevice, make sure to use 'run_once=True' on a cluster node"
@@ -83,6 +85,8 @@ import re
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
@@ -92,9 +96,12 @@ def run_module():
             qdevice=dict(required=False, type='str'),
             algorithm=dict(required=False, default="ffsplit", choices=['ffsplit', 'lms']),
             allowed_qdevice_changes=dict(required=False, default="none", choices=['none', 'update']),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     allowed_qdevice_changes = module.params['allowed_qdevice_changes']
@@ -0,0 +1,362 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_remote_node
+short_description: "add or remove pacemaker remote nodes"
+description:
+  - "Module adds or removes many pacemaker remote nodes in one run. Existing remote nodes are detected from
+    'ocf:pacemaker:remote' resources in cluster configuration, only missing nodes are added and only
+    existing nodes are removed."
+  - "With C(method=cib) (default) the remote node resources of all nodes are created, updated (when the address
+    changed) or removed in single CIB update. Pacemaker authkey must be already present on remote nodes and
+    'pacemaker_remote' service must be running on them."
+  - "With C(method=pcs) every missing node is added by 'pcs cluster node add-remote' which also distributes
+    the authkey to the node and starts 'pacemaker_remote' service there, nodes are removed by
+    'pcs cluster node remove-remote'."
+version_added: "2.10"
+options:
+  nodes:
+    description:
+      - "Remote nodes to add or remove, either names of nodes or dictionaries with keys C(name) (required),
+        C(address) (address of remote node, defaults to name) and C(port) (TCP port on which 'pacemaker_remote'
+        listens on remote node when it is not default 3121)."
+    required: true
+    type: list
+    elements: raw
+  state:
+    description:
+      - "'present' - ensure that remote nodes are present in cluster"
+      - "'absent' - ensure that remote nodes are not present in cluster"
+    required: false
+    default: present
+    choices: ['present', 'absent']
+    type: str
+  method:
+    description:
+      - "'cib' - create/remove remote node resources in single CIB update"
+      - "'pcs' - use 'pcs cluster node add-remote/remove-remote' for every node that needs change"
+    required: false
+    default: cib
+    choices: ['cib', 'pcs']
+    type: str
+  cib_file:
+    description:
+      - "Apply changes to specified file containing cluster CIB instead of running cluster. Only with C(method=cib)."
+    required: false
+    type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(pcs) binary to be present on target system.
+   - "Remote nodes removed with C(method=cib) are also removed from cluster node list with 'crm_node --force --remove'
+     when C(crm_node) is available (same as pcs does)."
+   - "Address of existing remote node is updated only with C(method=cib), C(method=pcs) reports the difference as warning."
+   - "In check mode with diff (C(--check --diff)) the resources that would start or stop are returned in C(impact)."
+'''
+
+EXAMPLES = '''
+- name: add remote nodes in one CIB update (authkey and pacemaker_remote prepared beforehand)
+  pcs_remote_node:
+    nodes:
+      - name: 'remote1'
+      - name: 'remote2'
+        address: '192.168.1.12'
+
+- name: add remote node using pcs that also distributes the authkey
+  pcs_remote_node:
+    nodes: ['remote3']
+    method: 'pcs'
+
+- name: remove remote nodes
+  pcs_remote_node:
+    nodes: ['remote1', 'remote2']
+    state: 'absent'
+'''
+
+RETURN = '''
+added:
+  description: "Names of remote nodes that were (or in check mode would be) added."
+  returned: always
+  type: list
+  elements: str
+  sample: ['remote1', 'remote2']
+updated:
+  description: "Names of existing remote nodes which address or port was (or would be) changed."
+  returned: always
+  type: list
+  elements: str
+  sample: []
+removed:
+  description: "Names of remote nodes that were (or in check mode would be) removed."
+  returned: always
+  type: list
+  elements: str
+  sample: []
+commands:
+  description: "pcs commands run by module (or that would be run in check mode)."
+  returned: when method is 'pcs' and some node is added or removed
+  type: list
+  elements: str
+  sample: ['pcs cluster node add-remote remote3 remote3']
+'''
+
+import os.path
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import fetch_live_cib, run_pcs_command, update_cib
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+# operations of remote node resource as created by 'pcs cluster node add-remote'
+REMOTE_OPS = [('migrate_from', '0s', '60s'), ('migrate_to', '0s', '60s'), ('monitor', '60s', '30s'), ('reload', '0s', '60s'),
+              ('start', '0s', '60s'), ('stop', '0s', '60s')]
+
+
+def is_remote_primitive(element):
+    return (element.tag == 'primitive' and element.attrib.get('class') == 'ocf' and
+            element.attrib.get('provider') == 'pacemaker' and element.attrib.get('type') == 'remote')
+
+
+def instance_attributes(element):
+    return dict((nvpair.attrib.get('name'), nvpair.attrib.get('value')) for nvpair in element.findall('./instance_attributes/nvpair'))
+
+
+def remote_nodes(model):
+    """Return {remote node name: {'address': ..., 'port': ...}} from remote node resources."""
+    nodes = {}
+    for resource in model.resources.values():
+        if is_remote_primitive(resource.element):
+            attributes = instance_attributes(resource.element)
+            nodes[resource.id] = {'address': attributes.get('server', resource.id), 'port': attributes.get('port')}
+    return nodes
+
+
+def wanted_attributes(node):
+    attributes = [('server', node['address'] or node['name'])]
+    if node['port'] is not None:
+        attributes.append(('port', str(node['port'])))
+    return attributes
+
+
+def differs(node, existing):
+    return (existing['address'] != (node['address'] or node['name']) or
+            existing['port'] != (str(node['port']) if node['port'] is not None else None))
+
+
+def remote_primitive(node):
+    name = node['name']
+    element = ET.Element('primitive', {'id': name, 'class': 'ocf', 'provider': 'pacemaker', 'type': 'remote'})
+    nvset = ET.SubElement(element, 'instance_attributes', {'id': name + '-instance_attributes'})
+    for attr_name, value in wanted_attributes(node):
+        ET.SubElement(nvset, 'nvpair', {'id': '%s-instance_attributes-%s' % (name, attr_name), 'name': attr_name, 'value': value})
+    operations = ET.SubElement(element, 'operations')
+    for op_name, interval, timeout in REMOTE_OPS:
+        ET.SubElement(operations, 'op', {'id': '%s-%s-interval-%s' % (name, op_name, interval), 'name': op_name,
+                                         'interval': interval, 'timeout': timeout})
+    return element
+
+
+def set_remote_attributes(element, node):
+    nvset = element.find('instance_attributes')
+    if nvset is None:
+        nvset = ET.SubElement(element, 'instance_attributes', {'id': node['name'] + '-instance_attributes'})
+    wanted = dict(wanted_attributes(node))
+    for nvpair in nvset.findall('nvpair'):
+        if nvpair.attrib.get('name') == 'port' and 'port' not in wanted:
+            nvset.remove(nvpair)
+        elif nvpair.attrib.get('name') in wanted:
+            nvpair.set('value', wanted.pop(nvpair.attrib.get('name')))
+    for attr_name, value in sorted(wanted.items()):
+        ET.SubElement(nvset, 'nvpair', {'id': '%s-%s' % (nvset.attrib.get('id'), attr_name), 'name': attr_name, 'value': value})
+
+
+def normalize_nodes(module, nodes):
+    """Return nodes as list of dicts with keys 'name', 'address' and 'port'."""
+    normalized = []
+    for node in nodes:
+        if not isinstance(node, dict):
+            node = {'name': node}
+        unknown = set(node) - set(['name', 'address', 'port'])
+        if not node.get('name') or unknown:
+            module.fail_json(msg="Remote node must be name or dictionary with 'name' and optional 'address' and 'port', got: %s" % node)
+        try:
+            port = int(node['port']) if node.get('port') is not None else None
+        except (TypeError, ValueError):
+            module.fail_json(msg="Port of remote node '%s' must be a number, got: %s" % (node['name'], node['port']))
+        normalized.append({'name': str(node['name']), 'address': str(node['address']) if node.get('address') else None, 'port': port})
+    return normalized
+
+
+def remove_constraints(cib_root, model, name):
+    # constraints of removed resource are removed with it same as 'pcs resource delete' does
+    constraints = cib_root.find('./configuration/constraints')
+    for constraint in model.constraints_by_resource.get(name, []):
+        if not constraint.has_resource_sets:
+            constraints.remove(constraint.element)
+            continue
+        for resource_set in constraint.element.findall('resource_set'):
+            for resource_ref in resource_set.findall("resource_ref[@id='%s']" % name):
+                resource_set.remove(resource_ref)
+            if resource_set.find('resource_ref') is None:
+                constraint.element.remove(resource_set)
+        if constraint.element.find('resource_set') is None:
+            constraints.remove(constraint.element)
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            nodes=dict(required=True, type='list', elements='raw'),
+            state=dict(required=False, default='present', choices=['present', 'absent']),
+            method=dict(required=False, default='cib', choices=['cib', 'pcs']),
+            cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    nodes = normalize_nodes(module, module.params['nodes'])
+    state = module.params['state']
+    method = module.params['method']
+    cib_file = module.params['cib_file']
+    result = {'changed': False, 'added': [], 'updated': [], 'removed': []}
+
+    if find_executable('pcs') is None:
+        module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
+    if cib_file is not None and method != 'cib':
+        module.fail_json(msg="Option 'cib_file' can be used only with method 'cib'.")
+
+    if cib_file is not None:
+        if not os.path.isfile(cib_file):
+            module.fail_json(msg="%(cib_file)s is not a file or doesn't exists" % module.params)
+        try:
+            with profile_phase(module, 'parse_cib'):
+                cib_root = ET.parse(cib_file).getroot()
+        except Exception as e:
+            module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
+    else:
+        cib_root = fetch_live_cib(module)
+
+    with profile_phase(module, 'index_cib'):
+        model = CibModel(cib_root)
+        existing = remote_nodes(model)
+    with profile_phase(module, 'compare'):
+        for node in nodes:
+            name = node['name']
+            if state == 'absent':
+                if name in existing:
+                    result['removed'].append(name)
+                continue
+            if name in existing:
+                if differs(node, existing[name]):
+                    result['updated'].append(name)
+                continue
+            if name in model.nodes_by_uname and model.nodes_by_uname[name].element.attrib.get('type', 'member') == 'member':
+                module.fail_json(msg="Node '%s' is a full member of cluster, it can't be added as remote node." % name)
+            if name in model.by_id:
+                module.fail_json(msg="Remote node '%s' can't be added, element with same id already exists in cluster configuration." % name)
+            result['added'].append(name)
+    if method == 'pcs' and result['updated']:
+        module.warn("Address of remote nodes %s differs from configuration, it is updated only with method 'cib'." % ', '.join(result['updated']))
+        result['updated'] = []
+    if not (result['added'] or result['updated'] or result['removed']):
+        module.exit_json(**result)
+    result['changed'] = True
+
+    if method == 'pcs':
+        rc, out, err = module.run_command('pcs --version')
+        if rc != 0:
+            module.fail_json(msg="pcs --version exited with non-zero exit code (" + str(rc) + "): " + out + err)
+        nodes_by_name = dict((node['name'], node) for node in nodes)
+        cmds = []
+        for name in result['added']:
+            node = nodes_by_name[name]
+            port_param = ' port=%d' % node['port'] if node['port'] is not None else ''
+            if out.startswith('0.9'):
+                # pcs-0.9 takes the address first and the node name second
+                cmds.append('pcs cluster node add-remote %s %s%s' % (node['address'] or name, name, port_param))
+            else:
+                cmds.append('pcs cluster node add-remote %s %s%s' % (name, node['address'] or name, port_param))
+        cmds.extend('pcs cluster node remove-remote ' + name for name in result['removed'])
+        result['commands'] = cmds
+        preview_impact(module, result, cib_root, pcs_cmds=[cmd for cmd in cmds if 'remove-remote' not in cmd])
+        if module.check_mode:
+            module.exit_json(**result)
+        for cmd in cmds:
+            rc, out, err = run_pcs_command(module, cmd)
+            if rc != 0:
+                module.fail_json(msg="Failed to change remote node using command '" + cmd + "'", output=out, error=err, **result)
+        module.exit_json(**result)
+
+    def change_remote_nodes(cib_root):
+        model = CibModel(cib_root)
+        resources = cib_root.find('./configuration/resources')
+        changed = False
+        for node in nodes:
+            name = node['name']
+            element = model.resource_element(name)
+            if name in result['added'] and element is None:
+                resources.append(remote_primitive(node))
+            elif name in result['updated'] and element is not None:
+                set_remote_attributes(element, node)
+            elif name in result['removed'] and element is not None:
+                # remote node resource can be also member of group, group left empty is removed as pcs does
+                parent_id = model.resources[name].parent_id
+                parent = resources if parent_id is None else model.resources[parent_id].element
+                parent.remove(element)
+                remove_constraints(cib_root, model, name)
+                if parent_id is not None and parent.tag == 'group' and parent.find('primitive') is None:
+                    grandparent_id = model.resources[parent_id].parent_id
+                    (resources if grandparent_id is None else model.resources[grandparent_id].element).remove(parent)
+                    remove_constraints(cib_root, model, parent_id)
+                if name in model.nodes_by_uname:
+                    cib_root.find('./configuration/nodes').remove(model.nodes_by_uname[name].element)
+            else:
+                continue
+            changed = True
+        return changed
+
+    preview_impact(module, result, cib_root, compute_change=change_remote_nodes)
+    if module.check_mode:
+        module.exit_json(**result)
+
+    rc, out, err, push_cmd = update_cib(module, cib_file, change_remote_nodes, cib_root=cib_root if cib_file is None else None)
+    if rc != 0:
+        module.fail_json(msg="Failed to push updated configuration to cluster using command '" + push_cmd + "'", output=out, error=err)
+
+    if cib_file is None and result['removed'] and find_executable('crm_node') is not None:
+        for name in result['removed']:
+            cmd = 'crm_node --force --remove ' + name
+            rc, out, err = module.run_command(cmd)
+            if rc != 0:
+                module.warn("Failed to remove remote node '%s' from cluster node list using command '%s': %s" % (name, cmd, (err or out).strip()))
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
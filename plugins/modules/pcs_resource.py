@@ -82,11 +82,56 @@ options:
     default: []
     type: list
     elements: str
+  keep_ignored_meta_attributes:
+    description:
+      - "When 'true' the meta attributes from C(ignored_meta_attributes) (for example 'target-role') of existing resource
+        are kept when the resource is updated, otherwise they are replaced by ones from C(options) (removed when not there)."
+    required: false
+    default: false
+    type: bool
+  create_disabled:
+    description:
+      - "When 'true' the resource is created disabled (with meta attribute target-role=Stopped) so it doesn't start before
+        its constraints are configured. Use M(ondrejhome.ha_cluster.pcs_resource_enable) to enable it later."
+      - "Meta attribute 'target-role' is then ignored when comparing existing resource (as if it was in C(ignored_meta_attributes))
+        and target-role of existing resource is kept when the resource is updated."
+    required: false
+    default: false
+    type: bool
+  op_advisor:
+    description:
+      - "'report' - compare timeouts and intervals of operations of resource defined by C(options) (or by defaults of agent
+        when not specified there) with execution times of operations in operation history of cluster and agent metadata
+        and return the recommended values in C(op_advice)"
+      - "'apply' - same as 'report' and the recommended timeouts of existing operations are also applied to the resource"
+    required: false
+    default: none
+    choices: ['none', 'report', 'apply']
+    type: str
+  op_advisor_margin:
+    description:
+      - "recommended timeout is the longest observed execution time of operation multiplied by this value"
+    required: false
+    default: 2.0
+    type: float
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - tested on CentOS 6.8, 7.3
    - module can create and delete clones, groups and master resources indirectly -
      resource can specify --clone, --group, --master option which will cause them to create
      or become part of clone/group/master
+   - "Resource updates are pushed to running cluster as a diff against the CIB they were computed from.
+     When the cluster configuration changed meanwhile the CIB is fetched again, the change is recomputed
+     and the push is retried (up to 5 times with increasing delay)."
+   - "In check mode with diff (C(--check --diff)) the change is applied to copy of running cluster CIB and 'crm_simulate'
+     is used to find which resources would start, stop, move or restart. They are returned in C(impact) together with
+     size of the resulting transition and result of 'crm_verify'."
+   - "Operation advisor works only for resources that already exist in cluster, operation history of the resource is used
+     and when the resource has none then the history of other resources with same agent. Timeout is never recommended
+     below the one from agent metadata ('crm_resource --show-metadata'). Monitor intervals are only reported as changing
+     the interval creates a different operation. With C(op_advisor=apply) the resource differs from C(options) so keep
+     the option enabled on later runs or put the recommended values into C(options)."
 '''
 
 EXAMPLES = '''
@@ -141,6 +186,50 @@ EXAMPLES = '''
     name: 'test'
     resource_type: 'ocf:pacemaker:Dummy'
     ignored_meta_attributes: [ 'target-role' ]
+
+- name: create resource 'test' disabled so it starts only after it is enabled together with other resources
+  pcs_resource:
+    name: 'test'
+    resource_type: 'ocf:pacemaker:Dummy'
+    create_disabled: true
+
+- name: report operation timeouts of resource 'database' that don't match the observed operation times
+  pcs_resource:
+    name: 'database'
+    resource_type: 'ocf:heartbeat:pgsql'
+    options: 'op start timeout=60s op monitor interval=10s timeout=20s'
+    op_advisor: report
+  register: database
+
+- name: apply recommended operation timeouts with timeout at least 3 times the longest observed operation
+  pcs_resource:
+    name: 'database'
+    resource_type: 'ocf:heartbeat:pgsql'
+    options: 'op start timeout=60s op monitor interval=10s timeout=20s'
+    op_advisor: apply
+    op_advisor_margin: 3
+'''
+
+RETURN = '''
+created:
+  description: "'true' when the resource was (or in check mode would be) created."
+  returned: when resource is created
+  type: bool
+  sample: true
+op_advice:
+  description:
+    - "List of operations of resource with C(status) - 'ok', 'too_low' (timeout is shorter than longest observed execution
+      time multiplied by C(op_advisor_margin)), 'too_high' (timeout is more than 3 times the recommended one),
+      'interval_too_short' (monitor runs less than twice its longest execution time) or 'no_history'."
+    - "Failed and timed out operations are counted in C(observed.failures), but their execution times are not used
+      for C(observed.max_exec_time_ms), C(observed.mean_exec_time_ms) and the recommended values.
+      Operation with only failed history has status 'no_history'."
+  returned: when C(op_advisor) is 'report' or 'apply' and resource exists
+  type: list
+  elements: dict
+  sample: [{'resource': 'database', 'operation': 'start', 'interval': '0s', 'configured_timeout': '60s', 'effective_timeout': '60s',
+            'metadata_timeout': '120s', 'history_source': 'resource', 'observed': {'count': 2, 'failures': 0,
+            'max_exec_time_ms': 95000, 'mean_exec_time_ms': 80000.0}, 'recommended_timeout': '190s', 'status': 'too_low'}]
 '''
 
 # TODO if group exists and is not part of group, then specifying group won't put it into group
@@ -151,8 +240,17 @@ import os.path
 import xml.etree.ElementTree as ET
 import tempfile
 import re
+import copy
 from distutils.spawn import find_executable
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import (
+    run_pcs_command,
+    update_cib_file,
+    update_live_cib,
+)
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_advisor import advise_op_timeouts, apply_op_advice
 
 # determine if we have 'to_native' function that we can use for 'ansible --diff' output
 to_native_support = False
@@ -161,6 +259,8 @@ try:
     to_native_support = True
 except ImportError:
     pass
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
 
 
 def replace_element(elem, replacement):
@@ -220,19 +320,6 @@ def compare_resources(module, res1, res2):
     return rc, diff
 
 
-def find_resource(cib, resource_id):
-    my_resource = None
-    tags = ['group', 'clone', 'master', 'primitive']
-    for elem in list(cib):
-        if elem.attrib.get('id') == resource_id:
-            return elem
-        elif elem.tag in tags:
-            my_resource = find_resource(elem, resource_id)
-            if my_resource is not None:
-                break
-    return my_resource
-
-
 def rename_multistate_element(multistate_resource, resource_name, child_name, resource_suffix):
     multistate_resource.set('id', resource_name)
     # search for meta_attributes tag
@@ -254,6 +341,25 @@ def remove_ignored_meta_attributes(resource, ignored_meta_attributes):
                     elem.remove(nvpair)
 
 
+def keep_ignored_meta_attributes(resource, replacement, ignored_meta_attributes):
+    # copy ignored meta attributes (for example target-role of disabled resource) to resource replacing the existing one
+    replacement_meta = None
+    for elem in list(replacement):
+        if elem.tag == 'meta_attributes':
+            replacement_meta = elem
+            break
+    replacement_names = set(nvpair.attrib.get('name') for nvpair in replacement_meta) if replacement_meta is not None else set()
+    for elem in list(resource):
+        if elem.tag != 'meta_attributes':
+            continue
+        for nvpair in list(elem):
+            if nvpair.tag == 'nvpair' and nvpair.attrib.get('name') in ignored_meta_attributes and nvpair.attrib.get('name') not in replacement_names:
+                if replacement_meta is None:
+                    replacement_meta = ET.SubElement(replacement, 'meta_attributes', {'id': elem.attrib.get('id')})
+                replacement_meta.append(copy.deepcopy(nvpair))
+                replacement_names.add(nvpair.attrib.get('name'))
+
+
 def remove_empty_meta_attributes_tag(resource):
     # remove the meta_attribute element to make comparison clean - Issue #10
     # some versions of 'pcs' left empty 'meta_attributes' tag after 'pcs resource enable'
@@ -274,9 +380,16 @@ def run_module():
             cib_file=dict(required=False),
             child_name=dict(required=False),
             ignored_meta_attributes=dict(required=False, type='list', elements='str', default=[]),
+            keep_ignored_meta_attributes=dict(required=False, default=False, type='bool'),
+            create_disabled=dict(required=False, default=False, type='bool'),
+            op_advisor=dict(required=False, default='none', choices=['none', 'report', 'apply']),
+            op_advisor_margin=dict(required=False, default=2.0, type='float'),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     resource_name = module.params['name']
@@ -287,6 +400,13 @@ def run_module():
     child_name = module.params['child_name']
     resource_options = module.params['options']
     ignored_meta_attributes = module.params['ignored_meta_attributes']
+    # resource created disabled is enabled outside of this module so its target-role must not be compared
+    if module.params['create_disabled'] and 'target-role' not in ignored_meta_attributes:
+        ignored_meta_attributes = ignored_meta_attributes + ['target-role']
+    # meta attributes of existing resource that are kept when it is replaced
+    kept_meta_attributes = ignored_meta_attributes if module.params['keep_ignored_meta_attributes'] else []
+    if module.params['create_disabled'] and 'target-role' not in kept_meta_attributes:
+        kept_meta_attributes = kept_meta_attributes + ['target-role']
     # Issue #39: Use scope=resources when dealing with master/promotable resource as default
     # In many cases these resources needs this option as they quickly create node attributes causing error.
     if module.params['force_resource_update'] is None and resource_class in ['master', 'promotable']:
@@ -320,7 +440,8 @@ def run_module():
         # use cib_file if specified
         if os.path.isfile(cib_file):
             try:
-                current_cib = ET.parse(cib_file)
+                with profile_phase(module, 'parse_cib'):
+                    current_cib = ET.parse(cib_file)
             except Exception as e:
                 module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
             current_cib_root = current_cib.getroot()
@@ -331,68 +452,64 @@ def run_module():
         # get running cluster configuration
         rc, out, err = module.run_command('pcs cluster cib')
         if rc == 0:
-            current_cib_root = ET.fromstring(out)
+            with profile_phase(module, 'parse_cib'):
+                current_cib_root = ET.fromstring(out)
         else:
             module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
 
     # try to find the resource that we seek
-    resource = None
-    cib_resources = current_cib_root.find('./configuration/resources')
-    resource = find_resource(cib_resources, resource_name)
+    with profile_phase(module, 'index_cib'):
+        resource = CibModel(current_cib_root).resource_element(resource_name)
 
     if state == 'present' and resource is None:
         # resource should be present, but we don't see it in configuration - lets create it
         result['changed'] = True
+        if resource_class == 'stonith':
+            cmd = 'pcs %(cib_file_param)s stonith create %(name)s %(resource_type)s %(options)s' % module.params
+        elif resource_class == 'master' or resource_class == 'promotable':
+            # we first create Master/Slave or Promotable resource with child_name and later rename it
+            cmd = 'pcs %(cib_file_param)s resource create %(child_name)s %(resource_type)s %(options)s' % module.params
+        else:
+            cmd = 'pcs %(cib_file_param)s resource create %(name)s %(resource_type)s %(options)s' % module.params
+        if module.params['create_disabled']:
+            cmd += ' --disabled'
+        result['created'] = True
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd])
         if not module.check_mode:
-            if resource_class == 'stonith':
-                cmd = 'pcs %(cib_file_param)s stonith create %(name)s %(resource_type)s %(options)s' % module.params
-            elif resource_class == 'master' or resource_class == 'promotable':
-                # we first create Master/Slave or Promotable resource with child_name and later rename it
-                cmd = 'pcs %(cib_file_param)s resource create %(child_name)s %(resource_type)s %(options)s' % module.params
-            else:
-                cmd = 'pcs %(cib_file_param)s resource create %(name)s %(resource_type)s %(options)s' % module.params
-            rc, out, err = module.run_command(cmd)
-            if rc != 0 and "Call cib_replace failed (-62): Timer expired" in err:
-                # EL6: special retry when we failed to create resource because of timer waiting on cib expired
-                rc, out, err = module.run_command(cmd)
+            # retry on CIB conflicts also covers EL6 error 'Call cib_replace failed (-62): Timer expired'
+            rc, out, err = run_pcs_command(module, cmd)
             if rc == 0:
                 if resource_class == 'master' or resource_class == 'promotable':
                     # rename the resource to desirable name
-                    rc, out, err = module.run_command('pcs cluster cib')
-                    if rc == 0:
-                        updated_cib_root = ET.fromstring(out)
-                        multistate_resource = None
-                        updated_cib_resources = updated_cib_root.find('./configuration/resources')
-                        resource_suffix = '-master' if pcs_version == '0.9' else '-clone'
-                        multistate_resource = find_resource(updated_cib_resources, child_name + resource_suffix)
-                        if multistate_resource is not None:
-                            rename_multistate_element(multistate_resource, resource_name, child_name, resource_suffix)
-                            ##
-                            # when not using cib_file then we continue preparing changes for cib-push into running cluster
-                            new_cib = ET.ElementTree(updated_cib_root)
-                            new_cib_fd, new_cib_path = tempfile.mkstemp()
-                            module.add_cleanup_file(new_cib_path)
-                            new_cib.write(new_cib_path)
-                            push_scope = 'scope=resources' if module.params['force_resource_update'] else ''
-                            push_cmd = 'pcs cluster cib-push ' + push_scope + ' ' + new_cib_path
-                            rc, out, err = module.run_command(push_cmd)
-                            if rc == 0:
-                                module.exit_json(changed=True)
-                            else:
-                                # rollback the failed rename by deleting the multistate resource
-                                cmd = 'pcs %(cib_file_param)s resource delete %(child_name)s' % module.params
-                                rc2, out2, err2 = module.run_command(cmd)
-                                if rc2 == 0:
-                                    module.fail_json(msg="Failed to push updated configuration for multistate resource to cluster using command '" + push_cmd +
-                                                     "'. Creation of multistate resource was rolled back. You can retry this task with " +
-                                                     "'force_resource_update=true' to see if that helps.", output=out, error=err)
-                                else:
-                                    module.fail_json(msg="Failed to delete resource after unsuccessful multistate resource configuration update using command '"
-                                                     + cmd + "'", output=out2, error=err2)
-                        else:
+                    resource_suffix = '-master' if pcs_version == '0.9' else '-clone'
+
+                    def rename_multistate_resource(cib_root):
+                        multistate_resource = CibModel(cib_root).resource_element(child_name + resource_suffix)
+                        if multistate_resource is None:
                             module.fail_json(msg="Failed to detect multistate resource after creating it with cmd '" + cmd + "'!",
-                                             output=out, error=err, previous_cib=current_cib)
-                module.exit_json(changed=True)
+                                             output=out, error=err)
+                        rename_multistate_element(multistate_resource, resource_name, child_name, resource_suffix)
+                        return True
+
+                    # when we use cib_file then we can do the rename directly in file
+                    if cib_file is not None:
+                        update_cib_file(module, cib_file, rename_multistate_resource)
+                        module.exit_json(**result)
+                    # when not using cib_file then we push the rename into running cluster
+                    push_scope = 'resources' if module.params['force_resource_update'] else None
+                    rc, out, err, push_cmd = update_live_cib(module, rename_multistate_resource, push_scope)
+                    if rc != 0:
+                        # rollback the failed rename by deleting the multistate resource
+                        cmd = 'pcs %(cib_file_param)s resource delete %(child_name)s' % module.params
+                        rc2, out2, err2 = run_pcs_command(module, cmd)
+                        if rc2 == 0:
+                            module.fail_json(msg="Failed to push updated configuration for multistate resource to cluster using command '" + push_cmd +
+                                             "'. Creation of multistate resource was rolled back. You can retry this task with " +
+                                             "'force_resource_update=true' to see if that helps.", output=out, error=err)
+                        else:
+                            module.fail_json(msg="Failed to delete resource after unsuccessful multistate resource configuration update using command '"
+                                             + cmd + "'", output=out2, error=err2)
+                module.exit_json(**result)
             else:
                 module.fail_json(msg="Failed to create resource using command '" + cmd + "'", output=out, error=err)
 
@@ -417,10 +534,8 @@ def run_module():
                 # deal with multistate resources
                 clean_cib = ET.parse(clean_cib_path)
                 clean_cib_root = clean_cib.getroot()
-                multistate_resource = None
-                updated_cib_resources = clean_cib_root.find('./configuration/resources')
                 resource_suffix = '-master' if pcs_version == '0.9' else '-clone'
-                multistate_resource = find_resource(updated_cib_resources, child_name + resource_suffix)
+                multistate_resource = CibModel(clean_cib_root).resource_element(child_name + resource_suffix)
                 if multistate_resource is not None:
                     rename_multistate_element(multistate_resource, resource_name, child_name, resource_suffix)
                     # we try to write the changes into temporary cib_file
@@ -435,12 +550,18 @@ def run_module():
             # we have a comparable resource created in clean cluster, so lets select it and compare it
             clean_cib = ET.parse(clean_cib_path)
             clean_cib_root = clean_cib.getroot()
-            clean_resource = None
-            cib_clean_resources = clean_cib_root.find('./configuration/resources')
-            clean_resource = find_resource(cib_clean_resources, resource_name)
+            clean_resource = CibModel(clean_cib_root).resource_element(resource_name)
 
             if clean_resource is not None:
-                # cleanup the definition of resource and clean_resource before comparison
+                # advice is computed for operations as defined by options so the applied values don't change on next run
+                if module.params['op_advisor'] != 'none':
+                    with profile_phase(module, 'op_advisor'):
+                        result['op_advice'] = advise_op_timeouts(module, current_cib_root, clean_resource, module.params['op_advisor_margin'])
+                        if module.params['op_advisor'] == 'apply':
+                            apply_op_advice(clean_resource, result['op_advice'])
+                # cleanup the definition of resource and clean_resource before comparison, resource is copied
+                # so the fetched configuration stays unmodified as base for computing the change pushed into running cluster
+                resource = copy.deepcopy(resource)
                 remove_ignored_meta_attributes(resource, ignored_meta_attributes)
                 remove_empty_meta_attributes_tag(resource)
 
@@ -448,33 +569,39 @@ def run_module():
                 remove_empty_meta_attributes_tag(clean_resource)
 
                 # compare the existing resource in cluster and simulated clean_resource
-                rc, diff = compare_resources(module, resource, clean_resource)
+                with profile_phase(module, 'compare'):
+                    rc, diff = compare_resources(module, resource, clean_resource)
                 if rc == 0:
                     # if no differnces were find there is no need to update the resource
-                    module.exit_json(changed=False)
+                    result['changed'] = False
+                    module.exit_json(**result)
                 else:
                     # otherwise lets replace the resource with new one
                     result['changed'] = True
                     result['diff'] = diff
+
+                    def replace_resource(cib_root):
+                        cib_resource = CibModel(cib_root).resource_element(resource_name)
+                        if cib_resource is None:
+                            module.fail_json(msg="Resource '" + resource_name + "' disappeared from cluster configuration while updating it.")
+                        replacement = copy.deepcopy(clean_resource)
+                        keep_ignored_meta_attributes(cib_resource, replacement, kept_meta_attributes)
+                        replace_element(cib_resource, replacement)
+                        return True
+
+                    fetched_cib_root = current_cib_root if cib_file is None else None
+                    preview_impact(module, result, fetched_cib_root, compute_change=replace_resource)
                     if not module.check_mode:
-                        replace_element(resource, clean_resource)
                         # when we use cib_file then we can dump the changed CIB directly into file
                         if cib_file is not None:
-                            try:
-                                current_cib.write(cib_file)  # FIXME add try/catch for writing into file
-                            except Exception as e:
-                                module.fail_json(msg="Error encountered writing result to cib_file - %s" % (e))
-                            module.exit_json(changed=True)
-                        # when not using cib_file then we continue preparing changes for cib-push into running cluster
-                        new_cib = ET.ElementTree(current_cib_root)
-                        new_cib_fd, new_cib_path = tempfile.mkstemp()
-                        module.add_cleanup_file(new_cib_path)
-                        new_cib.write(new_cib_path)
-                        push_scope = 'scope=resources' if module.params['force_resource_update'] else ''
-                        push_cmd = 'pcs cluster cib-push ' + push_scope + ' ' + new_cib_path
-                        rc, out, err = module.run_command(push_cmd)
+                            update_cib_file(module, cib_file, replace_resource)
+                            module.exit_json(**result)
+                        # when not using cib_file then we push the change into running cluster,
+                        # on conflict the CIB is fetched again and the resource is replaced in it again
+                        push_scope = 'resources' if module.params['force_resource_update'] else None
+                        rc, out, err, push_cmd = update_live_cib(module, replace_resource, push_scope, fetched_cib_root)
                         if rc == 0:
-                            module.exit_json(changed=True)
+                            module.exit_json(**result)
                         else:
                             module.fail_json(msg="Failed to push updated configuration to cluster using command '" + push_cmd + "'", output=out, error=err)
             else:
@@ -485,12 +612,13 @@ def run_module():
     elif state == 'absent' and resource is not None:
         # resource should not be present but we have found something - lets remove that
         result['changed'] = True
+        if resource_class == 'stonith':
+            cmd = 'pcs %(cib_file_param)s stonith delete %(name)s' % module.params
+        else:
+            cmd = 'pcs %(cib_file_param)s resource delete %(name)s' % module.params
+        preview_impact(module, result, current_cib_root, pcs_cmds=[cmd])
         if not module.check_mode:
-            if resource_class == 'stonith':
-                cmd = 'pcs %(cib_file_param)s stonith delete %(name)s' % module.params
-            else:
-                cmd = 'pcs %(cib_file_param)s resource delete %(name)s' % module.params
-            rc, out, err = module.run_command(cmd)
+            rc, out, err = run_pcs_command(module, cmd)
             if rc == 0:
                 module.exit_json(changed=True)
             else:
@@ -0,0 +1,282 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_resource_cleanup
+short_description: "clean up failures of cluster resources only where they are"
+description:
+  - "Module reads the status section of cluster CIB and finds selected resources that have failed operations or
+    fail counts on some node, or operation history while they are no longer configured. Only these resources are
+    then cleaned up and only on nodes where they have failures, so the cluster doesn't re-probe resources
+    that are fine."
+  - "When all resources with failures are to be cleaned up, it is done by one 'crm_resource --cleanup' command.
+    Otherwise the cleanup requests for all resources are sent one after another without waiting for the cluster
+    in between, so they are handled together."
+  - "Optionally the module waits until the cluster finishes the probes and other actions caused by the cleanup."
+version_added: "2.10"
+options:
+  resources:
+    description:
+      - "Resources to clean up. Resource can be primitive or group/clone/bundle with primitives to clean up."
+      - "By default all resources are considered."
+    required: false
+    type: list
+    elements: str
+  agent:
+    description:
+      - "Clean up only resources of this agent, either full name (for example 'ocf:heartbeat:IPaddr2') or just its type ('IPaddr2')."
+    required: false
+    type: str
+  node:
+    description:
+      - "Clean up resources only on this node."
+    required: false
+    type: str
+  only_failed:
+    description:
+      - "When 'true' only resources with failures are cleaned up ('crm_resource --cleanup') and operation history of resources
+        that are not configured is removed ('crm_resource --refresh')."
+      - "When 'false' operation history of all selected resources is removed and resources are re-probed on all their nodes ('crm_resource --refresh')."
+    required: false
+    default: true
+    type: bool
+  wait:
+    description:
+      - "Wait until cluster finishes the actions (probes, restarts) caused by the cleanup ('crm_resource --wait')."
+    required: false
+    default: false
+    type: bool
+  wait_timeout:
+    description:
+      - "Number of seconds to wait for the cluster before failing."
+    required: false
+    default: 300
+    type: int
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(cibadmin) and C(crm_resource) binaries to be present on target system.
+   - "Resource is considered failed on node when result of some operation in its operation history differs from expected one
+     or when it has non-zero fail count on node."
+   - "In check mode module only reports what would be cleaned up."
+'''
+
+EXAMPLES = '''
+- name: clean up all failed resources (single 'crm_resource --cleanup')
+  pcs_resource_cleanup:
+
+- name: clean up failed IPaddr2 resources and wait for the resulting probes
+  pcs_resource_cleanup:
+    agent: 'IPaddr2'
+    wait: true
+
+- name: clean up failures of resources of database group on node2
+  pcs_resource_cleanup:
+    resources: ['database-group']
+    node: 'node2'
+'''
+
+RETURN = '''
+cleaned:
+  description:
+    - "Resources and nodes that were (or in check mode would be) cleaned up with reasons - 'failed_operation', 'fail_count', 'orphan'
+      (resource is not configured) or 'history' (with C(only_failed=false))."
+  returned: always
+  type: list
+  elements: dict
+  sample: [{'resource': 'vip', 'node': 'node2', 'reasons': ['failed_operation', 'fail_count']}]
+commands:
+  description: "Cleanup commands run by module (or that would be run in check mode)."
+  returned: always
+  type: list
+  elements: str
+  sample: ['crm_resource --cleanup --resource vip --node node2']
+'''
+
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_stats import OpRecord, agent_name
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+FAIL_COUNT_PREFIX = 'fail-count-'
+
+
+def history_resource_id(resource_id):
+    # instances of unique clones are recorded in operation history as 'resource:N'
+    return resource_id.split(':')[0]
+
+
+def agent_matches(agent, wanted_agent):
+    return wanted_agent is None or agent == wanted_agent or agent.split(':')[-1] == wanted_agent
+
+
+def selected_primitives(model, resources, wanted_agent):
+    """Return ids of primitives selected by resources (primitive or its ancestor) and agent."""
+    selected = set()
+    for resource in model.resources.values():
+        if resource.tag != 'primitive' or not agent_matches(agent_name(resource.element), wanted_agent):
+            continue
+        if resources is not None:
+            ancestor_ids = [resource.id]
+            parent_id = resource.parent_id
+            while parent_id is not None:
+                ancestor_ids.append(parent_id)
+                parent_id = model.resources[parent_id].parent_id
+            if not resources.intersection(ancestor_ids):
+                continue
+        selected.add(resource.id)
+    return selected
+
+
+def find_cleanup_candidates(cib_root, resources, wanted_agent, wanted_node, only_failed):
+    """Return {(resource, node): set of reasons} of selected resources that need cleanup on node.
+
+    Second returned value is {resource: set of nodes} where resource has operation history.
+    """
+    model = CibModel(cib_root)
+    selected = selected_primitives(model, resources, wanted_agent)
+    candidates = {}
+    history_nodes = {}
+    for node_state in cib_root.findall('./status/node_state'):
+        node = node_state.attrib.get('uname') or node_state.attrib.get('id')
+        for lrm_resource in node_state.findall('./lrm/lrm_resources/lrm_resource'):
+            resource_id = history_resource_id(lrm_resource.attrib.get('id'))
+            history_nodes.setdefault(resource_id, set()).add(node)
+            if wanted_node is not None and node != wanted_node:
+                continue
+            reasons = set()
+            if resource_id in selected:
+                if any(OpRecord(node, resource_id, None, element).failed for element in lrm_resource.findall('lrm_rsc_op')):
+                    reasons.add('failed_operation')
+                if not only_failed:
+                    reasons.add('history')
+            elif resource_id not in model.resources and agent_matches(agent_name(lrm_resource), wanted_agent):
+                # history of resource that was removed from configuration
+                if resources is None or resource_id in resources:
+                    reasons.add('orphan')
+            if reasons:
+                candidates.setdefault((resource_id, node), set()).update(reasons)
+        for nvpair in node_state.findall('./transient_attributes/instance_attributes/nvpair'):
+            name = nvpair.attrib.get('name', '')
+            if not name.startswith(FAIL_COUNT_PREFIX) or nvpair.attrib.get('value') in ['0', None]:
+                continue
+            # 'fail-count-<resource>#<operation>_<interval>' (pacemaker-2) or 'fail-count-<resource>'
+            resource_id = history_resource_id(name[len(FAIL_COUNT_PREFIX):].split('#')[0])
+            if resource_id in selected and (wanted_node is None or node == wanted_node):
+                candidates.setdefault((resource_id, node), set()).add('fail_count')
+    return candidates, history_nodes
+
+
+def cleanup_commands(candidates, history_nodes, unrestricted, wanted_node, only_failed):
+    node_param = ' --node ' + wanted_node if wanted_node is not None else ''
+    nodes_by_resource = {}
+    orphans = set()
+    for (resource_id, node), reasons in candidates.items():
+        nodes_by_resource.setdefault(resource_id, set()).add(node)
+        if 'orphan' in reasons:
+            orphans.add(resource_id)
+    commands = []
+    if unrestricted and len(orphans) < len(nodes_by_resource):
+        # cleanup of all resources is one request for the cluster
+        commands.append('crm_resource ' + ('--cleanup' if only_failed else '--refresh') + node_param)
+        nodes_by_resource = dict((resource_id, nodes) for resource_id, nodes in nodes_by_resource.items() if resource_id in orphans)
+    for resource_id in sorted(nodes_by_resource):
+        nodes = nodes_by_resource[resource_id]
+        # history without failures (of resources that are not configured) is removed only by refresh
+        action = '--cleanup' if only_failed and resource_id not in orphans else '--refresh'
+        if wanted_node is None and nodes == history_nodes.get(resource_id, set()):
+            commands.append('crm_resource ' + action + ' --resource ' + resource_id)
+        else:
+            # don't re-probe resource on nodes where it has no failures
+            commands.extend('crm_resource ' + action + ' --resource ' + resource_id + ' --node ' + node for node in sorted(nodes))
+    return commands
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            resources=dict(required=False, type='list', elements='str'),
+            agent=dict(required=False),
+            node=dict(required=False),
+            only_failed=dict(required=False, default=True, type='bool'),
+            wait=dict(required=False, default=False, type='bool'),
+            wait_timeout=dict(required=False, default=300, type='int'),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    resources = set(module.params['resources']) if module.params['resources'] is not None else None
+    wanted_agent = module.params['agent']
+    wanted_node = module.params['node']
+    only_failed = module.params['only_failed']
+    result = {'changed': False, 'cleaned': [], 'commands': []}
+
+    for binary in ['cibadmin', 'crm_resource']:
+        if find_executable(binary) is None:
+            module.fail_json(msg="'%s' executable not found. Install 'pacemaker-cli'." % binary)
+
+    rc, out, err = module.run_command('cibadmin --query')
+    if rc != 0:
+        module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
+    try:
+        with profile_phase(module, 'parse_cib'):
+            cib_root = ET.fromstring(out)
+    except Exception as e:
+        module.fail_json(msg="Error encountered parsing the cluster configuration - %s" % (e))
+
+    with profile_phase(module, 'compare'):
+        candidates, history_nodes = find_cleanup_candidates(cib_root, resources, wanted_agent, wanted_node, only_failed)
+    if wanted_node is not None and cib_root.find("./status/node_state[@uname='%s']" % wanted_node) is None:
+        module.warn("Node '%s' has no status in cluster, nothing to clean up on it." % wanted_node)
+    if not candidates:
+        module.exit_json(**result)
+
+    result['changed'] = True
+    result['cleaned'] = [{'resource': resource_id, 'node': node, 'reasons': sorted(reasons)}
+                         for (resource_id, node), reasons in sorted(candidates.items())]
+    unrestricted = resources is None and wanted_agent is None
+    result['commands'] = cleanup_commands(candidates, history_nodes, unrestricted, wanted_node, only_failed)
+    if module.check_mode:
+        module.exit_json(**result)
+
+    for cmd in result['commands']:
+        rc, out, err = module.run_command(cmd)
+        if rc != 0:
+            module.fail_json(msg="Failed to clean up resources using command '" + cmd + "'", output=out, error=err, **result)
+
+    if module.params['wait']:
+        cmd = 'crm_resource --wait --timeout=%ds' % module.params['wait_timeout']
+        rc, out, err = module.run_command(cmd)
+        if rc != 0:
+            module.fail_json(msg="Cluster didn't finish actions after cleanup in %ds, cmd: '%s'" % (module.params['wait_timeout'], cmd),
+                             output=out, error=err, **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -52,6 +52,8 @@ options:
       - "Apply changes to specified file containing cluster CIB instead of running cluster."
     required: false
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - tested on CentOS 6.10 - pcs 0.9.155
    - tested on CentOS 7.9 - pcs 0.9.169
@@ -88,6 +90,9 @@ EXAMPLES = '''
 import os.path
 from distutils.spawn import find_executable
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import run_pcs_command
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling
 
 
 def run_module():
@@ -98,9 +103,12 @@ def run_module():
             name=dict(required=True),
             value=dict(required=False),
             cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     name = module.params['name']
@@ -163,7 +171,7 @@ def run_module():
                     cmd_set = 'pcs %(cib_file_param)s resource op defaults update %(name)s=%(value)s' % module.params
             else:
                 module.fail_json(msg="'" + defaults_type + "' is not implemented by this module")
-            rc, out, err = module.run_command(cmd_set)
+            rc, out, err = run_pcs_command(module, cmd_set)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -183,7 +191,7 @@ def run_module():
                     cmd_unset = 'pcs %(cib_file_param)s resource op defaults update %(name)s=' % module.params
             else:
                 module.fail_json(msg="'" + defaults_type + "' is not implemented by this module")
-            rc, out, err = module.run_command(cmd_unset)
+            rc, out, err = run_pcs_command(module, cmd_unset)
             if rc == 0:
                 module.exit_json(**result)
             else:
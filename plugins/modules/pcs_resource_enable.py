@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_resource_enable
+short_description: "enable or disable list of cluster resources in one CIB update"
+description:
+  - "Module enables (removes meta attribute target-role=Stopped) or disables (sets target-role=Stopped) all given
+    resources in a single CIB update, so cluster computes one transition for all of them instead of one per resource."
+  - "Together with C(create_disabled) option of M(ondrejhome.ha_cluster.pcs_resource) it allows to create resources
+    and their constraints first and start the resources only once their placement is known."
+version_added: "2.10"
+options:
+  resources:
+    description:
+      - "Names of resources to enable or disable."
+    required: true
+    type: list
+    elements: str
+  state:
+    description:
+      - "'enabled' - remove target-role=Stopped from resources (and their children and the clone/bundle containing them)"
+      - "'disabled' - set target-role=Stopped on resources"
+    required: false
+    default: enabled
+    choices: ['enabled', 'disabled']
+    type: str
+  wait:
+    description:
+      - "Wait until cluster finishes starting/stopping the resources ('crm_resource --wait'). Ignored with C(cib_file)."
+    required: false
+    default: false
+    type: bool
+  wait_timeout:
+    description:
+      - "Number of seconds to wait for the cluster before failing."
+    required: false
+    default: 300
+    type: int
+  cib_file:
+    description:
+      - "Apply changes to specified file containing cluster CIB instead of running cluster."
+    required: false
+    type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(pcs) binary to be present on target system and C(crm_resource) when C(wait) is used.
+   - "Resources that don't exist cause failure of module, in check mode only a warning is shown as they may be created
+     by preceding tasks that didn't run."
+   - "In check mode with diff (C(--check --diff)) the resources that would start or stop are returned in C(impact)."
+'''
+
+EXAMPLES = '''
+- name: create resources disabled
+  pcs_resource:
+    name: "{{ item }}"
+    resource_type: 'ocf:pacemaker:Dummy'
+    create_disabled: true
+  loop: ['resA', 'resB']
+
+- name: colocate resources
+  pcs_constraint_colocation:
+    resource1: 'resA'
+    resource2: 'resB'
+
+- name: start all resources at once
+  pcs_resource_enable:
+    resources: ['resA', 'resB']
+    wait: true
+'''
+
+RETURN = '''
+resources:
+  description: "Resources whose target-role was (or in check mode would be) changed."
+  returned: always
+  type: list
+  elements: str
+  sample: ['resA', 'resB']
+'''
+
+import os.path
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import fetch_live_cib, update_cib
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import RESOURCE_TAGS, CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import preview_impact
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+# containers that are enabled together with the resource they contain (unlike groups that contain other resources)
+SINGLE_RESOURCE_CONTAINERS = ['clone', 'master', 'bundle']
+
+
+def target_role_elements(model, resource_id, state):
+    """Return resource elements of resource_id whose target-role has to be changed."""
+    resource = model.resources[resource_id]
+    if state == 'disabled':
+        return [resource.element]
+    # resource stays stopped while any of its children or containing clone/bundle has target-role=Stopped
+    elements = [element for element in resource.element.iter() if element.tag in RESOURCE_TAGS]
+    parent_id = resource.parent_id
+    while parent_id is not None and model.resources[parent_id].tag in SINGLE_RESOURCE_CONTAINERS:
+        elements.append(model.resources[parent_id].element)
+        parent_id = model.resources[parent_id].parent_id
+    return elements
+
+
+def set_target_role(element, stopped):
+    """Set target-role=Stopped on element or remove target-role=Stopped from it, return True on change."""
+    changed = False
+    meta_attributes = element.findall('meta_attributes')
+    for meta in meta_attributes:
+        for nvpair in meta.findall('nvpair'):
+            if nvpair.attrib.get('name') != 'target-role':
+                continue
+            if stopped and nvpair.attrib.get('value') != 'Stopped':
+                nvpair.set('value', 'Stopped')
+                changed = True
+            elif not stopped and nvpair.attrib.get('value') == 'Stopped':
+                meta.remove(nvpair)
+                changed = True
+            if stopped:
+                return changed
+    if stopped:
+        if not meta_attributes:
+            meta_attributes = [ET.SubElement(element, 'meta_attributes', {'id': element.attrib.get('id') + '-meta_attributes'})]
+        ET.SubElement(meta_attributes[0], 'nvpair', {'id': meta_attributes[0].attrib.get('id') + '-target-role',
+                                                     'name': 'target-role', 'value': 'Stopped'})
+        changed = True
+    return changed
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            resources=dict(required=True, type='list', elements='str'),
+            state=dict(required=False, default='enabled', choices=['enabled', 'disabled']),
+            wait=dict(required=False, default=False, type='bool'),
+            wait_timeout=dict(required=False, default=300, type='int'),
+            cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    cib_file = module.params['cib_file']
+    state = module.params['state']
+    result = {'changed': False, 'resources': []}
+
+    module.params['cib_file_param'] = ''
+    if cib_file is not None:
+        if not os.path.isfile(cib_file):
+            module.fail_json(msg="%(cib_file)s is not a file or doesn't exists" % module.params)
+        try:
+            with profile_phase(module, 'parse_cib'):
+                cib_root = ET.parse(cib_file).getroot()
+        except Exception as e:
+            module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
+        module.params['cib_file_param'] = '-f ' + cib_file
+        if module.params['wait']:
+            module.warn("Option 'wait' is ignored when changing CIB in 'cib_file'.")
+    else:
+        if find_executable('pcs') is None:
+            module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
+        if module.params['wait'] and find_executable('crm_resource') is None:
+            module.fail_json(msg="'crm_resource' executable not found. Install 'pacemaker-cli'.")
+        cib_root = fetch_live_cib(module)
+
+    with profile_phase(module, 'index_cib'):
+        model = CibModel(cib_root)
+    missing = [resource_id for resource_id in module.params['resources'] if resource_id not in model.resources]
+    if missing and not module.check_mode:
+        module.fail_json(msg="Resources %s don't exist in cluster configuration." % ', '.join(missing))
+    elif missing:
+        module.warn("Resources %s don't exist in cluster configuration." % ', '.join(missing))
+    resources = [resource_id for resource_id in module.params['resources'] if resource_id not in missing]
+
+    def change_target_role(cib_root):
+        # returns ids of resources whose target-role changed
+        model = CibModel(cib_root)
+        changed_resources = []
+        for resource_id in resources:
+            if resource_id not in model.resources:
+                module.fail_json(msg="Resource '%s' disappeared from cluster configuration while updating it." % resource_id)
+            changed = False
+            for element in target_role_elements(model, resource_id, state):
+                changed = set_target_role(element, state == 'disabled') or changed
+            if changed:
+                changed_resources.append(resource_id)
+        return changed_resources
+
+    with profile_phase(module, 'compare'):
+        # compute the change on copy so the result can be reported also in check mode
+        result['resources'] = change_target_role(ET.fromstring(ET.tostring(cib_root)))
+    if not result['resources']:
+        module.exit_json(**result)
+
+    result['changed'] = True
+    preview_impact(module, result, cib_root, compute_change=lambda cib_root: bool(change_target_role(cib_root)))
+    if module.check_mode:
+        module.exit_json(**result)
+
+    rc, out, err, push_cmd = update_cib(module, cib_file, lambda cib_root: bool(change_target_role(cib_root)),
+                                        cib_root=cib_root if cib_file is None else None)
+    if rc != 0:
+        module.fail_json(msg="Failed to push updated configuration to cluster using command '" + push_cmd + "'", output=out, error=err)
+
+    if module.params['wait'] and cib_file is None:
+        cmd = 'crm_resource --wait --timeout=%ds' % module.params['wait_timeout']
+        rc, out, err = module.run_command(cmd)
+        if rc != 0:
+            module.fail_json(msg="Cluster didn't finish starting/stopping resources in %ds, cmd: '%s'" % (module.params['wait_timeout'], cmd),
+                             output=out, error=err, **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
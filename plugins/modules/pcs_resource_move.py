@@ -0,0 +1,329 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_resource_move
+short_description: "move, ban or clear cluster resource and measure how long it took"
+description:
+  - "Module moves resource to other node ('pcs resource move'), bans it from node ('pcs resource ban') or removes
+    constraints created by these commands ('pcs resource clear'). By default it waits for the cluster to finish
+    the move using C(--wait) option of pcs, so no separate waiting task is needed."
+  - "Temporary 'cli-prefer-*' constraint created by move is removed once the resource was moved, unless
+    C(keep_constraint) or C(lifetime) is given."
+  - "After waiting for the cluster the module reports stop, start, migrate_to, migrate_from, promote and demote
+    operations of the resource that were run during the move together with their durations."
+version_added: "2.10"
+options:
+  resource:
+    description:
+      - "Name of resource to move, ban or clear."
+    required: true
+    type: str
+  state:
+    description:
+      - "'moved' - move resource to C(node) or away from node where it runs now when C(node) is not given"
+      - "'banned' - ban resource from C(node) or from node where it runs now when C(node) is not given"
+      - "'cleared' - remove constraints created by move and ban of resource (only these for C(node) when given)"
+    required: false
+    default: moved
+    choices: ['moved', 'banned', 'cleared']
+    type: str
+  node:
+    description:
+      - "Name of cluster node."
+    required: false
+    type: str
+  lifetime:
+    description:
+      - "Lifetime of constraint created by move or ban as ISO 8601 duration (for example 'PT1H'), it expires after this time."
+      - "Constraint with lifetime is not removed by module after move."
+    required: false
+    type: str
+  promoted:
+    description:
+      - "Move or ban only promoted (Master) role of promotable resource."
+    required: false
+    default: false
+    type: bool
+  keep_constraint:
+    description:
+      - "Keep 'cli-prefer-*' constraint created by move so resource stays on the node until the constraint is cleared."
+    required: false
+    default: false
+    type: bool
+  wait:
+    description:
+      - "Wait until cluster finishes moving resource (pcs C(--wait)). Without waiting the constraint created by move is always kept
+        and no operations are reported."
+    required: false
+    default: true
+    type: bool
+  wait_timeout:
+    description:
+      - "Number of seconds to wait for the cluster before failing."
+    required: false
+    default: 300
+    type: int
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(pcs), C(crm_mon) and C(cibadmin) binaries to be present on target system.
+   - "Resource moved without keeping the constraint stays on new node only when it has resource-stickiness,
+     otherwise cluster may move it back once the constraint is removed."
+   - "Move of resource that already runs only on C(node) (and has 'cli-prefer-*' constraint for it when C(keep_constraint)
+     or C(lifetime) is given), ban of resource that already has 'cli-ban-*' constraint for the node and clear that would
+     not remove any constraint don't change anything."
+'''
+
+EXAMPLES = '''
+- name: move resource 'vm1' to node2 and report how long the live migration took
+  pcs_resource_move:
+    resource: 'vm1'
+    node: 'node2'
+  register: vm1_move
+
+- name: keep 'resA' away from node1 for 2 hours
+  pcs_resource_move:
+    resource: 'resA'
+    node: 'node1'
+    state: 'banned'
+    lifetime: 'PT2H'
+
+- name: remove all constraints created by move and ban of 'resA'
+  pcs_resource_move:
+    resource: 'resA'
+    state: 'cleared'
+'''
+
+RETURN = '''
+from_nodes:
+  description: "Nodes where resource was active before the change."
+  returned: always
+  type: list
+  elements: str
+  sample: ['node1']
+to_nodes:
+  description: "Nodes where resource was active after the change."
+  returned: when module waited for cluster
+  type: list
+  elements: str
+  sample: ['node2']
+commands:
+  description: "pcs commands run by module (or that would be run in check mode)."
+  returned: always
+  type: list
+  elements: str
+  sample: ['pcs resource move-with-constraint vm1 node2 --wait=300', 'pcs resource clear vm1 node2']
+elapsed_seconds:
+  description: "Number of seconds the move or ban took including waiting for the cluster."
+  returned: when resource was moved or banned
+  type: float
+  sample: 12.4
+operations:
+  description: "Operations of resource run during move or ban with their duration in milliseconds."
+  returned: when module waited for cluster
+  type: list
+  elements: dict
+  sample: [{'resource': 'vm1', 'node': 'node1', 'operation': 'migrate_to', 'exec_time_ms': 8210, 'queue_time_ms': 0}]
+migrated:
+  description: "'true' when resource was live migrated (migrate_to/migrate_from) instead of stopped and started."
+  returned: when module waited for cluster
+  type: bool
+'''
+
+import time
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import run_pcs_command
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_stats import element_op_records
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+MOVE_OPERATIONS = ['stop', 'start', 'migrate_to', 'migrate_from', 'promote', 'demote']
+PROMOTED_ROLES = ['Master', 'Promoted']
+ACTIONS = {'moved': 'move', 'banned': 'ban', 'cleared': 'clear'}
+
+
+def query_cib_section(module, section):
+    """Return CIB with only given section ('configuration', 'status') of running cluster."""
+    rc, out, err = module.run_command('cibadmin --query --scope ' + section)
+    if rc != 0:
+        module.fail_json(msg="Failed to load '%s' section of CIB from cluster" % section, out=out, error=err)
+    with profile_phase(module, 'parse_cib'):
+        cib_root = ET.Element('cib')
+        cib_root.append(ET.fromstring(out))
+    return cib_root
+
+
+def active_nodes(module, resource, primitive_ids, promoted):
+    """Return sorted list of nodes where primitives of resource are active (in promoted role when requested)."""
+    cmd = 'crm_mon -1 --output-as=xml --exclude=all --include=resources --resource=' + resource
+    rc, out, err = module.run_command(cmd)
+    if rc != 0:
+        # crm_mon older than pacemaker 2.0.3 doesn't support section filtering
+        cmd = 'crm_mon -1r --as-xml'
+        rc, out, err = module.run_command(cmd)
+    if rc != 0:
+        module.fail_json(msg='Failed to get current cluster state from crm_mon', cmd=cmd, out=out, error=err)
+    nodes = set()
+    for element in ET.fromstring(out).iter('resource'):
+        # instances of unique clones are 'resource:N'
+        if element.attrib.get('id', '').split(':')[0] not in primitive_ids:
+            continue
+        if promoted and element.attrib.get('role') not in PROMOTED_ROLES:
+            continue
+        nodes.update(node.attrib.get('name') for node in element.findall('node'))
+    return sorted(nodes)
+
+
+def cli_constraints(model, resource, node=None, kind=None):
+    """Return ids of location constraints of resource created by 'pcs resource move/ban' (on node when given).
+
+    kind 'prefer' returns only constraints created by move, 'ban' only these created by ban, None both.
+    """
+    prefixes = ['cli-%s-' % kind] if kind is not None else ['cli-prefer-', 'cli-ban-']
+    constraint_ids = []
+    for constraint in model.constraints_by_resource.get(resource, []):
+        if constraint.tag != 'rsc_location':
+            continue
+        if not any(constraint.id.startswith(prefix) for prefix in prefixes):
+            continue
+        # constraints with lifetime have the node in rule expression instead of 'node' attribute
+        constraint_nodes = [constraint.element.attrib.get('node')] + [expression.attrib.get('value') for expression in
+                                                                      constraint.element.iter('expression')
+                                                                      if expression.attrib.get('attribute') == '#uname']
+        if node is None or node in constraint_nodes:
+            constraint_ids.append(constraint.id)
+    return constraint_ids
+
+
+def move_operations(module, primitive_ids, since):
+    """Return operations from status section of primitives that finished at 'since' (epoch seconds) or later."""
+    with profile_phase(module, 'compare'):
+        records = [record for record in element_op_records(query_cib_section(module, 'status'))
+                   if record.resource.split(':')[0] in primitive_ids and record.operation in MOVE_OPERATIONS and
+                   record.last_rc_change >= since]
+    records.sort(key=lambda record: (record.last_rc_change, int(record.call_id or 0)))
+    return [{'resource': record.resource, 'node': record.node, 'operation': record.operation, 'rc': record.rc,
+             'exec_time_ms': record.exec_time, 'queue_time_ms': record.queue_time} for record in records]
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            resource=dict(required=True),
+            state=dict(required=False, default='moved', choices=['moved', 'banned', 'cleared']),
+            node=dict(required=False),
+            lifetime=dict(required=False),
+            promoted=dict(required=False, default=False, type='bool'),
+            keep_constraint=dict(required=False, default=False, type='bool'),
+            wait=dict(required=False, default=True, type='bool'),
+            wait_timeout=dict(required=False, default=300, type='int'),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    resource = module.params['resource']
+    state = module.params['state']
+    node = module.params['node']
+    promoted = module.params['promoted']
+    result = {'changed': False, 'commands': []}
+
+    for binary in ['pcs', 'crm_mon', 'cibadmin']:
+        if find_executable(binary) is None:
+            module.fail_json(msg="'%s' executable not found. Install '%s'." % (binary, 'pcs' if binary == 'pcs' else 'pacemaker-cli'))
+    if state == 'cleared' and module.params['lifetime'] is not None:
+        module.fail_json(msg="Option 'lifetime' can't be used with state 'cleared'.")
+
+    rc, out, err = module.run_command('pcs --version')
+    if rc != 0:
+        module.fail_json(msg="pcs --version exited with non-zero exit code (" + str(rc) + "): " + out + err)
+    pcs_version = out.split('.')[0] + '.' + out.split('.')[1]
+    if pcs_version not in ['0.9', '0.10', '0.11', '0.12']:
+        module.fail_json(msg="unsupported version of pcs (" + pcs_version + "). Only versions 0.9, 0.10, 0.11 and 0.12 are supported.")
+    # pcs 0.11 renamed 'move' that keeps the constraint and '--master' option
+    move_cmd = 'move' if pcs_version in ['0.9', '0.10'] else 'move-with-constraint'
+    role_param = (' --master' if pcs_version in ['0.9', '0.10'] else ' --promoted') if promoted else ''
+    wait_param = ' --wait=%d' % module.params['wait_timeout'] if module.params['wait'] else ''
+    node_param = ' ' + node if node is not None else ''
+    lifetime_param = ' lifetime=' + module.params['lifetime'] if module.params['lifetime'] is not None else ''
+
+    with profile_phase(module, 'index_cib'):
+        model = CibModel(query_cib_section(module, 'configuration'))
+    if resource not in model.resources:
+        module.fail_json(msg="Resource '%s' doesn't exist in cluster configuration." % resource)
+    element = model.resources[resource].element
+    primitive_ids = set([resource]) if element.tag == 'primitive' else set(primitive.attrib.get('id') for primitive in element.iter('primitive'))
+    result['from_nodes'] = active_nodes(module, resource, primitive_ids, promoted)
+
+    if state == 'cleared':
+        if cli_constraints(model, resource, node):
+            result['commands'].append('pcs resource clear ' + resource + node_param + role_param + wait_param)
+    elif state == 'banned':
+        ban_nodes = [node] if node is not None else result['from_nodes']
+        if not ban_nodes:
+            module.fail_json(msg="Resource '%s' is not active, 'node' to ban it from must be given." % resource)
+        if any(not cli_constraints(model, resource, ban_node, 'ban') for ban_node in ban_nodes):
+            result['commands'].append('pcs resource ban ' + resource + node_param + lifetime_param + role_param + wait_param)
+    elif (node is None or result['from_nodes'] != [node] or
+          ((module.params['keep_constraint'] or module.params['lifetime'] is not None) and not cli_constraints(model, resource, node, 'prefer'))):
+        result['commands'].append('pcs resource ' + move_cmd + ' ' + resource + node_param + lifetime_param + role_param + wait_param)
+        if module.params['wait'] and not module.params['keep_constraint'] and module.params['lifetime'] is None:
+            # constraint was needed only to make cluster move the resource, move without node bans the current node
+            clear_node = node if node is not None else (result['from_nodes'] or [''])[0]
+            result['commands'].append(('pcs resource clear ' + resource + ' ' + clear_node).rstrip() + role_param)
+    if not result['commands']:
+        module.exit_json(**result)
+
+    result['changed'] = True
+    if module.check_mode:
+        module.exit_json(**result)
+
+    # operation history records time with precision of seconds
+    since = int(time.time())
+    start = time.time()
+    for index, cmd in enumerate(result['commands']):
+        rc, out, err = run_pcs_command(module, cmd)
+        if rc != 0:
+            module.fail_json(msg="Failed to %s resource using command '%s'" % (ACTIONS[state], cmd), output=out, error=err, **result)
+        if index > 0:
+            continue
+        if state != 'cleared':
+            result['elapsed_seconds'] = round(time.time() - start, 1)
+        if module.params['wait']:
+            # state right after the move, before its temporary constraint is removed
+            result['to_nodes'] = active_nodes(module, resource, primitive_ids, promoted)
+            if state != 'cleared':
+                result['operations'] = move_operations(module, primitive_ids, since)
+                result['migrated'] = any(operation['operation'] == 'migrate_from' for operation in result['operations'])
+            if state == 'moved' and node is not None and result['to_nodes'] != [node]:
+                module.warn("Resource '%s' is active on %s after move instead of '%s'." % (resource, ', '.join(result['to_nodes']) or 'no node', node))
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
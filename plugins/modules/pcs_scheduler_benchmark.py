@@ -0,0 +1,279 @@
+#!/usr/bin/python
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+author: "Ondrej Famera (@OndrejHome)"
+module: pcs_scheduler_benchmark
+short_description: "measure how long pacemaker scheduler takes to compute transition for given CIB"
+description:
+  - "Module runs pacemaker scheduler on running cluster CIB or on CIB from file using 'crm_simulate --profile'
+    and returns the time of one scheduler run, size of resulting transition and allocation scores with the
+    constraints of resources that have most of them ('crm_simulate --show-scores')."
+  - "When C(compare_cib_file) is given the same is measured for it, so the scheduler cost of two variants
+    of configuration (for example constraints between pairs of resources and constraints with resource sets)
+    can be compared."
+  - "Module doesn't change anything in cluster."
+version_added: "2.10"
+options:
+  cib_file:
+    description:
+      - "CIB file to measure. When not specified the running cluster CIB is used."
+      - "File should contain also the status section (for example file created by 'pcs cluster cib <file>'
+        or by M(ondrejhome.ha_cluster.pcs_cib_transaction)), without it scheduler sees all nodes offline."
+    required: false
+    type: str
+  compare_cib_file:
+    description:
+      - "Second CIB file to measure and compare with C(cib_file) (or running cluster CIB)."
+    required: false
+    type: str
+  repeat:
+    description:
+      - "How many times to run scheduler on each CIB, reported time is the average of one run."
+    required: false
+    default: 10
+    type: int
+  top:
+    description:
+      - "Number of highest allocation scores and constraints to return."
+    required: false
+    default: 10
+    type: int
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
+notes:
+   - This module requires the C(crm_simulate) binary to be present on target system.
+   - "Time reported by 'crm_simulate --profile' is the processor time of scheduler with resolution of 10ms, use higher
+     C(repeat) for small CIBs. When 'crm_simulate' doesn't support C(--repeat) it is run C(repeat) times."
+   - "Allocation scores are not attributed to constraints by pacemaker. Constraints in C(top_constraints) are ordered
+     by number of non-zero allocation scores of resources they refer to as an estimate of their share on scheduler work."
+'''
+
+EXAMPLES = '''
+- name: measure scheduler run time on running cluster CIB
+  pcs_scheduler_benchmark:
+  register: scheduler
+
+- name: compare the running cluster CIB with variant prepared in CIB transaction file
+  pcs_scheduler_benchmark:
+    compare_cib_file: "{{ transaction.cib_file }}"
+    repeat: 20
+  register: scheduler
+
+- name: show the results
+  debug:
+    msg: "{{ scheduler.scheduler.seconds }}s -> {{ scheduler.compared_scheduler.seconds }}s ({{ scheduler.seconds_ratio }}x)"
+'''
+
+RETURN = '''
+scheduler:
+  description:
+    - "Results for C(cib_file) or running cluster CIB."
+    - "C(seconds) - time of one scheduler run, C(method) - 'profile' when measured by 'crm_simulate --profile' or 'wall'
+      when measured as duration of 'crm_simulate' command."
+    - "C(transition_actions) - number of actions in transition computed by scheduler."
+    - "C(top_scores) - highest non-zero allocation scores, C(top_constraints) - constraints of resources with most allocation scores."
+  returned: always
+  type: dict
+  sample: {'source': 'live', 'cib_bytes': 1843200, 'resources': 2000, 'constraints': 1500, 'repeat': 10, 'seconds': 0.412,
+           'method': 'profile', 'transition_actions': 0, 'allocation_scores': 6000,
+           'top_scores': [{'resource': 'vip', 'node': 'node1', 'score': 'INFINITY', 'source': 'pcmk__primitive_assign'}],
+           'top_constraints': [{'id': 'colocation-vip-db-INFINITY', 'tag': 'rsc_colocation', 'resources': ['vip', 'db'],
+                                'allocation_scores': 6}]}
+compared_scheduler:
+  description: "Results for C(compare_cib_file) in same format as C(scheduler)."
+  returned: when C(compare_cib_file) is given
+  type: dict
+seconds_ratio:
+  description: "Time of scheduler run for C(compare_cib_file) divided by time for C(cib_file) or running cluster CIB."
+  returned: when C(compare_cib_file) is given and both times are non-zero
+  type: float
+  sample: 0.42
+'''
+
+import os.path
+import re
+import shutil
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from distutils.spawn import find_executable
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import fetch_live_cib, write_cib_tmp_file
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.impact import simulate_transition
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
+
+# 'Testing /tmp/dir/cib.xml ... 0.42 secs'
+PROFILE_RE = re.compile(r'([\d.]+)\s+secs')
+# 'pcmk__primitive_assign: rsc1 allocation score on node1: 100' ('native_color:' in older pacemaker)
+SCORE_RE = re.compile(r'^\s*(?P<source>[\w-]+):\s+(?P<resource>\S+) allocation score on (?P<node>\S+):\s+(?P<score>\S+)\s*$')
+
+
+def score_value(score):
+    # numeric value of score for ordering, (-)INFINITY is bigger than any other score
+    score = score.lstrip('+')
+    if score.lstrip('-') == 'INFINITY':
+        return 1000000 * (-1 if score.startswith('-') else 1)
+    try:
+        return int(score)
+    except ValueError:
+        return 0
+
+
+def measure_scheduler_time(module, cib_path, repeat):
+    """Return (seconds of one scheduler run, method) for CIB in cib_path."""
+    # crm_simulate --profile processes all CIB files in directory
+    profile_dir = tempfile.mkdtemp()
+    try:
+        shutil.copyfile(cib_path, os.path.join(profile_dir, 'cib.xml'))
+        rc, out, err = module.run_command('crm_simulate --profile ' + profile_dir + ' --repeat %d' % repeat)
+        if rc == 0 and PROFILE_RE.search(out):
+            return float(PROFILE_RE.search(out).group(1)) / repeat, 'profile'
+        # older crm_simulate without --repeat
+        total = 0.0
+        method = 'profile'
+        for run in range(repeat):
+            start = time.time()
+            rc, out, err = module.run_command('crm_simulate --profile ' + profile_dir)
+            wall = time.time() - start
+            if rc != 0:
+                module.fail_json(msg="Failed to run scheduler with cmd: 'crm_simulate --profile " + profile_dir + "'", output=out, error=err)
+            match = PROFILE_RE.search(out)
+            if match:
+                total += float(match.group(1))
+            else:
+                total += wall
+                method = 'wall'
+        return total / repeat, method
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def allocation_scores(module, cib_path):
+    # non-zero allocation scores from 'crm_simulate --show-scores'
+    cmd = 'crm_simulate --show-scores --xml-file ' + cib_path
+    rc, out, err = module.run_command(cmd)
+    if rc != 0:
+        module.fail_json(msg="Failed to get allocation scores with cmd: '" + cmd + "'", output=out, error=err)
+    scores = []
+    for line in out.splitlines():
+        match = SCORE_RE.match(line)
+        if match and score_value(match.group('score')) != 0:
+            scores.append(match.groupdict())
+    return scores
+
+
+def top_constraints(model, scores, top):
+    # constraints ordered by number of allocation scores of resources (and their children) they refer to
+    scores_per_resource = {}
+    for score in scores:
+        scores_per_resource[score['resource']] = scores_per_resource.get(score['resource'], 0) + 1
+
+    def resource_scores(resource_id):
+        count = scores_per_resource.get(resource_id, 0)
+        resource = model.resources.get(resource_id)
+        for child_id in resource.children_ids if resource is not None else []:
+            count += resource_scores(child_id)
+        return count
+
+    constraints = []
+    for constraint in model.constraints:
+        constraints.append({
+            'id': constraint.id,
+            'tag': constraint.tag,
+            'resources': constraint.resources,
+            'allocation_scores': sum(resource_scores(resource_id) for resource_id in set(constraint.resources)),
+        })
+    constraints.sort(key=lambda constraint: -constraint['allocation_scores'])
+    return constraints[:top]
+
+
+def benchmark_cib(module, source, cib_path, repeat, top):
+    try:
+        with profile_phase(module, 'parse_cib'):
+            cib_root = ET.parse(cib_path).getroot()
+    except Exception as e:
+        module.fail_json(msg="Error encountered parsing the CIB %s - %s" % (source, e))
+    with profile_phase(module, 'index_cib'):
+        model = CibModel(cib_root)
+    stats = {
+        'source': source,
+        'cib_bytes': os.path.getsize(cib_path),
+        'resources': len(model.resources),
+        'constraints': len(model.constraints),
+        'repeat': repeat,
+    }
+    seconds, stats['method'] = measure_scheduler_time(module, cib_path, repeat)
+    stats['seconds'] = round(seconds, 6)
+    stats['transition_actions'] = simulate_transition(module, cib_path)[1]
+    scores = allocation_scores(module, cib_path)
+    stats['allocation_scores'] = len(scores)
+    with profile_phase(module, 'compare'):
+        stats['top_scores'] = sorted(scores, key=lambda score: -abs(score_value(score['score'])))[:top]
+        stats['top_constraints'] = top_constraints(model, scores, top)
+    return stats
+
+
+def run_module():
+    module = AnsibleModule(
+        argument_spec=dict(
+            cib_file=dict(required=False),
+            compare_cib_file=dict(required=False),
+            repeat=dict(required=False, default=10, type='int'),
+            top=dict(required=False, default=10, type='int'),
+            profile=dict(required=False, default=False, type='bool'),
+        ),
+        supports_check_mode=True
+    )
+    enable_command_runner(module)
+    enable_profiling(module)
+
+    cib_file = module.params['cib_file']
+    compare_cib_file = module.params['compare_cib_file']
+    repeat = max(module.params['repeat'], 1)
+    top = module.params['top']
+    result = {'changed': False}
+
+    if find_executable('crm_simulate') is None:
+        module.fail_json(msg="'crm_simulate' executable not found. Install 'pacemaker-cli'.")
+    for path in [cib_file, compare_cib_file]:
+        if path is not None and not os.path.isfile(path):
+            module.fail_json(msg="%s is not a file or doesn't exists" % path)
+
+    if cib_file is None:
+        if find_executable('pcs') is None:
+            module.fail_json(msg="'pcs' executable not found. Install 'pcs'.")
+        cib_path = write_cib_tmp_file(module, fetch_live_cib(module))
+        result['scheduler'] = benchmark_cib(module, 'live', cib_path, repeat, top)
+    else:
+        result['scheduler'] = benchmark_cib(module, cib_file, cib_file, repeat, top)
+
+    if compare_cib_file is not None:
+        result['compared_scheduler'] = benchmark_cib(module, compare_cib_file, compare_cib_file, repeat, top)
+        if result['scheduler']['seconds'] and result['compared_scheduler']['seconds']:
+            result['seconds_ratio'] = round(result['compared_scheduler']['seconds'] / result['scheduler']['seconds'], 3)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
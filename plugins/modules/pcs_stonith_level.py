@@ -51,6 +51,8 @@ options:
       - "This module requires the file to already contain cluster configuration."
     required: false
     type: str
+extends_documentation_fragment:
+  - ondrejhome.ha_cluster.profiling
 notes:
    - when deleting the stonith level only exact match is being deleted - same behaviour as pcs
    - tested on CentOS 7.9/8.3
@@ -76,6 +78,10 @@ import xml.etree.ElementTree as ET
 from distutils.spawn import find_executable
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib import run_pcs_command
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.command_runner import enable_command_runner
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.profiling import enable_profiling, profile_phase
 
 
 def run_module():
@@ -86,9 +92,12 @@ def run_module():
             node_name=dict(required=True, type='str'),
             stonith_device=dict(required=True, type='str'),
             cib_file=dict(required=False),
+            profile=dict(required=False, default=False, type='bool'),
         ),
         supports_check_mode=True
     )
+    enable_command_runner(module)
+    enable_profiling(module)
 
     state = module.params['state']
     level = module.params['level']
@@ -106,7 +115,8 @@ def run_module():
         # use cib_file if specified
         if os.path.isfile(cib_file):
             try:
-                current_cib = ET.parse(cib_file)
+                with profile_phase(module, 'parse_cib'):
+                    current_cib = ET.parse(cib_file)
             except Exception as e:
                 module.fail_json(msg="Error encountered parsing the cib_file - %s" % (e))
             current_cib_root = current_cib.getroot()
@@ -117,13 +127,15 @@ def run_module():
         # get running cluster configuration
         rc, out, err = module.run_command('pcs cluster cib')
         if rc == 0:
-            current_cib_root = ET.fromstring(out)
+            with profile_phase(module, 'parse_cib'):
+                current_cib_root = ET.fromstring(out)
         else:
             module.fail_json(msg='Failed to load cluster configuration', out=out, error=err)
 
     # try to find the fencing-level
     fencing_level = None
-    fencing_levels = current_cib_root.findall("./configuration/fencing-topology/fencing-level")
+    with profile_phase(module, 'index_cib'):
+        fencing_levels = CibModel(current_cib_root).fencing_level_elements(node_name)
     for flevel in fencing_levels:
         # level must match all criteria (level, node_name, stonith_device)
         if (flevel.attrib.get('index') == str(level)
@@ -151,7 +163,7 @@ def run_module():
         # stonith level should be present, but we don't see it in configuration - lets create it
         result['changed'] = True
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_create)
+            rc, out, err = run_pcs_command(module, cmd_create)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -165,7 +177,7 @@ def run_module():
         # stonith level should not be present but we have found something - lets remove that
         result['changed'] = True
         if not module.check_mode:
-            rc, out, err = module.run_command(cmd_delete)
+            rc, out, err = run_pcs_command(module, cmd_delete)
             if rc == 0:
                 module.exit_json(**result)
             else:
@@ -0,0 +1,168 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.cib_model import CibModel
+
+CIB = '''
+<cib admin_epoch="0" epoch="12" num_updates="3">
+  <configuration>
+    <crm_config>
+      <cluster_property_set id="cib-bootstrap-options">
+        <nvpair id="cib-bootstrap-options-stonith-enabled" name="stonith-enabled" value="false"/>
+      </cluster_property_set>
+    </crm_config>
+    <nodes>
+      <node id="1" uname="node1">
+        <instance_attributes id="nodes-1">
+          <nvpair id="nodes-1-site" name="site" value="A"/>
+        </instance_attributes>
+      </node>
+      <node id="2" uname="node2"/>
+    </nodes>
+    <resources>
+      <primitive id="vip" class="ocf" provider="heartbeat" type="IPaddr2">
+        <instance_attributes id="vip-instance_attributes">
+          <nvpair id="vip-instance_attributes-ip" name="ip" value="192.168.1.10"/>
+        </instance_attributes>
+        <operations>
+          <op id="vip-monitor-interval-10s" name="monitor" interval="10s"/>
+        </operations>
+      </primitive>
+      <group id="web">
+        <primitive id="fs" class="ocf" provider="heartbeat" type="Filesystem"/>
+        <primitive id="httpd" class="systemd" type="httpd"/>
+      </group>
+      <clone id="ping-clone">
+        <primitive id="ping" class="ocf" provider="pacemaker" type="ping"/>
+        <meta_attributes id="ping-clone-meta_attributes">
+          <nvpair id="ping-clone-meta_attributes-interleave" name="interleave" value="true"/>
+        </meta_attributes>
+      </clone>
+      <primitive id="fence-node1" class="stonith" type="fence_xvm"/>
+    </resources>
+    <constraints>
+      <rsc_location id="location-vip-node1" rsc="vip" node="node1" score="100"/>
+      <rsc_colocation id="colocation-web-vip" rsc="web" with-rsc="vip" score="INFINITY"/>
+      <rsc_order id="order-vip-web" first="vip" then="web"/>
+      <rsc_order id="order-set">
+        <resource_set id="order-set-1">
+          <resource_ref id="vip"/>
+          <resource_ref id="ping-clone"/>
+        </resource_set>
+        <resource_set id="order-set-2">
+          <resource_ref id="vip"/>
+        </resource_set>
+      </rsc_order>
+      <rsc_location id="location-vip-node2" rsc="vip" node="node2" score="-100"/>
+    </constraints>
+    <fencing-topology>
+      <fencing-level id="fl-node1-1" index="1" target="node1" devices="fence-node1"/>
+      <fencing-level id="fl-node1-2" index="2" target="node1" devices="fence-node2"/>
+      <fencing-level id="fl-site-1" index="1" target-attribute="site" target-value="A" devices="fence-node1"/>
+    </fencing-topology>
+    <rsc_defaults>
+      <meta_attributes id="rsc_defaults-options">
+        <nvpair id="rsc_defaults-options-stickiness" name="resource-stickiness" value="100"/>
+      </meta_attributes>
+    </rsc_defaults>
+  </configuration>
+  <status/>
+</cib>
+'''
+
+
+@pytest.fixture
+def model():
+    return CibModel(ET.fromstring(CIB))
+
+
+def test_resources_hierarchy(model):
+    assert sorted(model.resources) == ['fence-node1', 'fs', 'httpd', 'ping', 'ping-clone', 'vip', 'web']
+    assert model.resources['web'].tag == 'group'
+    assert model.resources['web'].children_ids == ['fs', 'httpd']
+    assert model.resources['httpd'].parent_id == 'web'
+    assert model.resources['ping'].parent_id == 'ping-clone'
+    assert model.resources['vip'].parent_id is None
+    assert model.resources['vip'].children_ids == []
+
+
+def test_resource_element(model):
+    assert model.resource_element('httpd').attrib['type'] == 'httpd'
+    assert model.resource_element('missing') is None
+
+
+def test_constraints_by_resource(model):
+    assert [c.id for c in model.constraints_by_resource['vip']] == [
+        'location-vip-node1', 'colocation-web-vip', 'order-vip-web', 'order-set', 'location-vip-node2']
+    assert [c.id for c in model.constraints_by_resource['web']] == ['colocation-web-vip', 'order-vip-web']
+    assert [c.id for c in model.constraints_by_resource['ping-clone']] == ['order-set']
+    assert 'httpd' not in model.constraints_by_resource
+
+
+def test_constraint_with_resource_sets(model):
+    constraint = model.by_id['order-set']
+    assert constraint.has_resource_sets
+    assert constraint.resources == ['vip', 'ping-clone', 'vip']
+    assert not model.by_id['order-vip-web'].has_resource_sets
+    assert model.by_id['order-vip-web'].resources == ['vip', 'web']
+
+
+def test_constraint_elements(model):
+    assert [e.attrib['id'] for e in model.constraint_elements('rsc_location')] == ['location-vip-node1', 'location-vip-node2']
+    assert [e.attrib['id'] for e in model.constraint_elements('rsc_order', resource='vip')] == ['order-vip-web', 'order-set']
+    assert model.constraint_elements('rsc_colocation', resource='ping-clone') == []
+    assert model.constraint_elements('rsc_ticket') == []
+
+
+def test_fencing_levels(model):
+    assert [e.attrib['id'] for e in model.fencing_level_elements('node1')] == ['fl-node1-1', 'fl-node1-2']
+    assert [e.attrib['id'] for e in model.fencing_level_elements('site')] == ['fl-site-1']
+    assert model.fencing_level_elements('node2') == []
+    assert model.by_id['fl-node1-2'].devices == 'fence-node2'
+
+
+def test_nodes(model):
+    assert sorted(model.nodes) == ['1', '2']
+    assert model.nodes_by_uname['node1'].id == '1'
+    assert model.nodes_by_uname['node1'].attributes == {'site': 'A'}
+    assert model.nodes_by_uname['node2'].attributes == {}
+
+
+def test_nvsets(model):
+    owners = dict((nvset.id, nvset.owner_id) for nvset in model.nvsets)
+    assert owners == {
+        'cib-bootstrap-options': 'crm_config',
+        'vip-instance_attributes': 'vip',
+        'ping-clone-meta_attributes': 'ping-clone',
+        'rsc_defaults-options': 'rsc_defaults',
+    }
+    assert model.by_id['rsc_defaults-options'].nvpairs == {'resource-stickiness': '100'}
+    # operations are not nvsets
+    assert 'vip-monitor-interval-10s' not in model.by_id
+
+
+def test_by_id_indexes_all_records(model):
+    for record_id in ['vip', 'web', 'location-vip-node1', 'order-set', 'fl-site-1', 'cib-bootstrap-options']:
+        assert model.by_id[record_id].id == record_id
+    # nodes have their own indexes by id and uname
+    assert '1' not in model.by_id
+
+
+def test_records_keep_elements(model):
+    assert model.resources['vip'].element is model.cib_root.find("./configuration/resources/primitive[@id='vip']")
+
+
+def test_cib_without_configuration():
+    model = CibModel(ET.fromstring('<cib><status/></cib>'))
+    assert model.resources == {}
+    assert model.constraints == []
+    assert model.constraint_elements('rsc_location', resource='vip') == []
+    assert model.resource_element('vip') is None
@@ -0,0 +1,156 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import io
+import xml.etree.ElementTree as ET
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils import op_stats
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.op_stats import (
+    aggregate_op_records,
+    distribution,
+    element_op_records,
+    iter_op_records,
+    percentile,
+)
+
+CIB = b'''<cib>
+  <configuration>
+    <resources/>
+  </configuration>
+  <status>
+    <node_state id="1" uname="node1">
+      <lrm id="1">
+        <lrm_resources>
+          <lrm_resource id="vip" class="ocf" provider="heartbeat" type="IPaddr2">
+            <lrm_rsc_op id="vip_last_0" operation="start" call-id="10" rc-code="0" op-status="0" interval="0"
+                        exec-time="120" queue-time="1" last-rc-change="1000" transition-key="3:1:0:uuid"/>
+            <lrm_rsc_op id="vip_monitor_10000" operation="monitor" call-id="11" rc-code="0" op-status="0" interval="10000"
+                        exec-time="30" queue-time="0" last-rc-change="1001" transition-key="4:1:0:uuid"/>
+          </lrm_resource>
+          <lrm_resource id="db" class="ocf" provider="heartbeat" type="pgsql">
+            <lrm_rsc_op id="db_last_0" operation="monitor" call-id="5" rc-code="7" op-status="0" interval="0"
+                        exec-time="40" queue-time="0" last-rc-change="900" transition-key="1:1:7:uuid"/>
+            <lrm_rsc_op id="db_last_failure_0" operation="start" call-id="6" rc-code="1" op-status="0" interval="0"
+                        exec-time="500" queue-time="2" last-rc-change="950" transition-key="2:1:0:uuid"/>
+          </lrm_resource>
+        </lrm_resources>
+      </lrm>
+    </node_state>
+    <node_state id="2" uname="node2">
+      <lrm id="2">
+        <lrm_resources>
+          <lrm_resource id="vip" class="ocf" provider="heartbeat" type="IPaddr2">
+            <lrm_rsc_op id="vip_last_0" operation="start" call-id="7" rc-code="0" op-status="0" interval="0"
+                        exec-time="200" queue-time="3" last-rc-change="800" transition-key="5:1:0:uuid"/>
+            <lrm_rsc_op id="vip_last_failure_0" operation="start" call-id="7" rc-code="0" op-status="0" interval="0"
+                        exec-time="200" queue-time="3" last-rc-change="800" transition-key="5:1:0:uuid"/>
+          </lrm_resource>
+          <lrm_resource id="db" class="ocf" provider="heartbeat" type="pgsql">
+            <lrm_rsc_op id="db_last_failure_0" operation="start" call-id="3" rc-code="1" op-status="2" interval="0"
+                        exec-time="60000" queue-time="0" last-rc-change="970" transition-key="6:1:0:uuid"/>
+          </lrm_resource>
+        </lrm_resources>
+      </lrm>
+    </node_state>
+  </status>
+</cib>
+'''
+
+
+def records_by_id(records):
+    return sorted((record.node, record.resource, record.operation, record.exec_time) for record in records)
+
+
+def test_iter_op_records():
+    records = list(iter_op_records(io.BytesIO(CIB)))
+    assert records_by_id(records) == [
+        ('node1', 'db', 'probe', 40),
+        ('node1', 'db', 'start', 500),
+        ('node1', 'vip', 'monitor', 30),
+        ('node1', 'vip', 'start', 120),
+        ('node2', 'db', 'start', 60000),
+        # operation present also as last failure is returned only once
+        ('node2', 'vip', 'start', 200),
+    ]
+    assert set(record.agent for record in records) == set(['ocf:heartbeat:IPaddr2', 'ocf:heartbeat:pgsql'])
+
+
+def test_iter_op_records_same_as_element_op_records():
+    assert records_by_id(iter_op_records(io.BytesIO(CIB))) == records_by_id(element_op_records(ET.fromstring(CIB)))
+
+
+def test_iter_op_records_of_selected_resources():
+    records = list(iter_op_records(io.BytesIO(CIB), resources=set(['db'])))
+    assert set(record.resource for record in records) == set(['db'])
+    assert len(records) == 3
+
+
+def test_iter_op_records_from_status_section_only():
+    status = ET.tostring(ET.fromstring(CIB).find('./status'))
+    assert len(list(iter_op_records(io.BytesIO(status)))) == 6
+
+
+def test_iter_op_records_releases_processed_elements(monkeypatch):
+    roots = []
+    iterparse = ET.iterparse
+
+    def recording_iterparse(source, events=None):
+        for event, element in iterparse(source, events):
+            if not roots:
+                roots.append(element)
+            yield event, element
+
+    monkeypatch.setattr(op_stats.ET, 'iterparse', recording_iterparse)
+    assert len(list(iter_op_records(io.BytesIO(CIB)))) == 6
+    # processed node states are removed from the tree while parsing
+    assert roots[0].findall('./status/node_state') == []
+
+
+def test_failed_records():
+    failed = dict(((record.node, record.resource, record.operation), record.failed) for record in iter_op_records(io.BytesIO(CIB)))
+    # probe of stopped resource expects 'not running' (7)
+    assert failed[('node1', 'db', 'probe')] is False
+    assert failed[('node1', 'db', 'start')] is True
+    # timed out operation
+    assert failed[('node2', 'db', 'start')] is True
+    assert failed[('node1', 'vip', 'start')] is False
+
+
+def test_aggregate_op_records():
+    by_resource, by_agent = aggregate_op_records(iter_op_records(io.BytesIO(CIB)))
+    assert sorted(by_resource) == ['db', 'vip']
+    assert sorted(by_resource['vip']) == ['monitor', 'start']
+    vip_start = by_resource['vip']['start'].as_dict()
+    assert vip_start['count'] == 2
+    assert vip_start['failures'] == 0
+    assert vip_start['nodes'] == ['node1', 'node2']
+    assert vip_start['exec_time_ms']['min'] == 120
+    assert vip_start['exec_time_ms']['max'] == 200
+    assert vip_start['exec_time_ms']['mean'] == 160.0
+    assert vip_start['last_failure'] is None
+    assert by_resource['vip']['monitor'].as_dict()['intervals_ms'] == [10000]
+
+    db_start = by_resource['db']['start'].as_dict()
+    assert (db_start['count'], db_start['failures']) == (2, 2)
+    assert db_start['last_failure'] == {'node': 'node2', 'rc': 1, 'op_status': 2, 'last_rc_change': 970}
+
+    assert sorted(by_agent) == ['ocf:heartbeat:IPaddr2', 'ocf:heartbeat:pgsql']
+    assert by_agent['ocf:heartbeat:IPaddr2']['start'].count == 2
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 90) == 90
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_distribution():
+    assert distribution([]) == {}
+    assert distribution([30, 10, 20], percentiles=[50]) == {'min': 10, 'max': 30, 'mean': 20.0, 'p50': 20}
@@ -0,0 +1,213 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.module_utils.pcs_rule import (
+    AttributeExpression,
+    BoolExpression,
+    DateExpression,
+    ParenthesizedExpression,
+    RuleParseError,
+    expression_matches_element,
+    parse_rule,
+    tokenize_rule,
+)
+
+
+def matches(rule_string, rule_xml, and_binds_tighter=True):
+    return expression_matches_element(parse_rule(rule_string, and_binds_tighter), ET.fromstring(rule_xml))
+
+
+@pytest.mark.parametrize('rule_string, tokens', [
+    ('#uname eq node1', ['#uname', 'eq', 'node1']),
+    ('(a eq 1 or b eq 2)', ['(', 'a', 'eq', '1', 'or', 'b', 'eq', '2', ')']),
+    ('attr eq "two words"', ['attr', 'eq', '"two words"']),
+    ("attr eq 'single (quoted)'", ['attr', 'eq', "'single (quoted)'"]),
+    ('date-spec hours=9-16 weekdays="1-5"', ['date-spec', 'hours=9-16', 'weekdays="1-5"']),
+    ('  defined   pingd  ', ['defined', 'pingd']),
+])
+def test_tokenize_rule(rule_string, tokens):
+    assert tokenize_rule(rule_string) == tokens
+
+
+def test_attribute_expression():
+    expression = parse_rule('#uname eq node1')
+    assert isinstance(expression, AttributeExpression)
+    assert (expression.operation, expression.attribute, expression.value, expression.value_type) == ('eq', '#uname', 'node1', None)
+
+
+def test_attribute_expression_with_type():
+    expression = parse_rule('pingd gt integer 5')
+    assert (expression.operation, expression.attribute, expression.value, expression.value_type) == ('gt', 'pingd', '5', 'integer')
+
+
+def test_type_name_as_value():
+    # type keyword at the end of expression is its value
+    expression = parse_rule('kind eq string')
+    assert (expression.value, expression.value_type) == ('string', None)
+
+
+def test_defined_expression():
+    expression = parse_rule('not_defined pingd')
+    assert (expression.operation, expression.attribute, expression.value) == ('not_defined', 'pingd', None)
+
+
+def test_and_binds_tighter_than_or():
+    expression = parse_rule('a eq 1 or b eq 2 and c eq 3')
+    assert expression.operation == 'or'
+    assert isinstance(expression.children[0], AttributeExpression)
+    assert expression.children[1].operation == 'and'
+    assert [child.attribute for child in expression.children[1].children] == ['b', 'c']
+
+
+def test_same_precedence_from_left_to_right():
+    # pcs-0.9 evaluates 'and' and 'or' from left to right
+    expression = parse_rule('a eq 1 or b eq 2 and c eq 3', and_binds_tighter=False)
+    assert expression.operation == 'and'
+    assert expression.children[0].operation == 'or'
+    assert [child.attribute for child in expression.children[0].children] == ['a', 'b']
+    assert expression.children[1].attribute == 'c'
+
+
+def test_chain_of_same_operation_is_flattened():
+    expression = parse_rule('a eq 1 and b eq 2 and c eq 3')
+    assert expression.operation == 'and'
+    assert [child.attribute for child in expression.children] == ['a', 'b', 'c']
+
+
+def test_parentheses_are_not_flattened():
+    expression = parse_rule('(a eq 1 and b eq 2) and c eq 3')
+    assert expression.operation == 'and'
+    assert len(expression.children) == 2
+    assert isinstance(expression.children[0], ParenthesizedExpression)
+    assert isinstance(expression.children[0], BoolExpression)
+
+
+def test_parentheses_override_precedence():
+    expression = parse_rule('(a eq 1 or b eq 2) and c eq 3')
+    assert expression.operation == 'and'
+    assert expression.children[0].operation == 'or'
+
+
+def test_date_expressions():
+    expression = parse_rule('date gt 2026-01-01')
+    assert (expression.operation, expression.start, expression.end) == ('gt', '2026-01-01', None)
+    expression = parse_rule('date lt 2026-01-01')
+    assert (expression.operation, expression.start, expression.end) == ('lt', None, '2026-01-01')
+    expression = parse_rule('date in_range 2026-01-01 to 2026-02-01')
+    assert (expression.operation, expression.start, expression.end) == ('in_range', '2026-01-01', '2026-02-01')
+    expression = parse_rule('date in_range 2026-01-01 to duration months=1')
+    assert (expression.start, expression.options) == ('2026-01-01', {'months': '1'})
+    expression = parse_rule('date-spec hours="9-16" weekdays=1-5')
+    assert isinstance(expression, DateExpression)
+    assert (expression.operation, expression.options) == ('date_spec', {'hours': '9-16', 'weekdays': '1-5'})
+
+
+@pytest.mark.parametrize('rule_string', [
+    'a eq',
+    'a like 1',
+    '(a eq 1',
+    'a eq 1 )',
+    'date between 1 to 2',
+    'date-spec',
+    'a eq 1 and',
+])
+def test_invalid_rule(rule_string):
+    with pytest.raises(RuleParseError):
+        parse_rule(rule_string)
+
+
+def test_parsed_rules_are_memoized():
+    assert parse_rule('x eq 1') is parse_rule('x eq 1')
+    assert parse_rule('x eq 1 or y eq 2') is not parse_rule('x eq 1 or y eq 2', and_binds_tighter=False)
+
+
+def test_match_single_expression():
+    assert matches('#uname eq node1', '''
+        <rule id="r" score="INFINITY">
+          <expression id="r-expr" attribute="#uname" operation="eq" value="node1"/>
+        </rule>''')
+    assert not matches('#uname eq node2', '''
+        <rule id="r" score="INFINITY">
+          <expression id="r-expr" attribute="#uname" operation="eq" value="node1"/>
+        </rule>''')
+
+
+def test_match_ignores_order_of_sub_expressions():
+    assert matches('a eq 1 and b eq 2', '''
+        <rule id="r" boolean-op="and">
+          <expression id="r-1" attribute="b" operation="eq" value="2"/>
+          <expression id="r-2" attribute="a" operation="eq" value="1"/>
+        </rule>''')
+
+
+def test_match_requires_same_boolean_operation():
+    assert not matches('a eq 1 or b eq 2', '''
+        <rule id="r" boolean-op="and">
+          <expression id="r-1" attribute="a" operation="eq" value="1"/>
+          <expression id="r-2" attribute="b" operation="eq" value="2"/>
+        </rule>''')
+
+
+def test_match_requires_same_number_of_sub_expressions():
+    assert not matches('a eq 1 and b eq 2', '''
+        <rule id="r" boolean-op="and">
+          <expression id="r-1" attribute="a" operation="eq" value="1"/>
+          <expression id="r-2" attribute="b" operation="eq" value="2"/>
+          <expression id="r-3" attribute="c" operation="eq" value="3"/>
+        </rule>''')
+    # the same sub-expression can't match two elements
+    assert not matches('a eq 1 and a eq 1', '''
+        <rule id="r" boolean-op="and">
+          <expression id="r-1" attribute="a" operation="eq" value="1"/>
+          <expression id="r-2" attribute="b" operation="eq" value="2"/>
+        </rule>''')
+
+
+def test_match_nested_rule_by_precedence():
+    rule_xml = '''
+        <rule id="r" boolean-op="or">
+          <expression id="r-1" attribute="a" operation="eq" value="1"/>
+          <rule id="r-2" boolean-op="and">
+            <expression id="r-2-1" attribute="b" operation="eq" value="2"/>
+            <expression id="r-2-2" attribute="c" operation="eq" value="3"/>
+          </rule>
+        </rule>'''
+    assert matches('a eq 1 or b eq 2 and c eq 3', rule_xml)
+    assert matches('a eq 1 or (b eq 2 and c eq 3)', rule_xml, and_binds_tighter=False)
+    assert not matches('a eq 1 or b eq 2 and c eq 3', rule_xml, and_binds_tighter=False)
+
+
+def test_match_value_type():
+    rule_xml = '''
+        <rule id="r">
+          <expression id="r-1" attribute="pingd" operation="gt" type="number" value="5"/>
+        </rule>'''
+    # 'integer' is called 'number' in older pacemaker versions and type is compared only when requested
+    assert matches('pingd gt integer 5', rule_xml)
+    assert matches('pingd gt 5', rule_xml)
+    assert not matches('pingd gt version 5', rule_xml)
+
+
+def test_match_date_expressions():
+    assert matches('date lt 2026-01-01', '''
+        <rule id="r"><date_expression id="r-1" operation="lt" start="2026-01-01"/></rule>''')
+    assert matches('date-spec hours=9-16', '''
+        <rule id="r">
+          <date_expression id="r-1" operation="date_spec"><date_spec id="r-1-spec" hours="9-16"/></date_expression>
+        </rule>''')
+    assert not matches('date-spec hours=9-17', '''
+        <rule id="r">
+          <date_expression id="r-1" operation="date_spec"><date_spec id="r-1-spec" hours="9-16"/></date_expression>
+        </rule>''')
+    assert not matches('date gt 2026-01-01', '''
+        <rule id="r">
+          <date_expression id="r-1" operation="gt" start="2026-01-01"><duration id="r-1-d" days="1"/></date_expression>
+        </rule>''')
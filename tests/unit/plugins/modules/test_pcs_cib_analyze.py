@@ -0,0 +1,167 @@
+# Copyright: (c) 2026, Ondrej Famera <ondrej-xa2iel8u@famera.cz>
+# GNU General Public License v3.0+ (see LICENSE-GPLv3.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# Apache License v2.0 (see LICENSE-APACHE2.txt or http://www.apache.org/licenses/LICENSE-2.0)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET
+
+from ansible_collections.ondrejhome.ha_cluster.plugins.modules.pcs_cib_analyze import CompactionPlanner
+
+
+def cib(resources='', constraints='', extra=''):
+    return ET.fromstring('''
+        <cib>
+          <configuration>
+            <crm_config/>
+            <nodes/>
+            <resources>
+              <primitive id="A" class="ocf" provider="pacemaker" type="Dummy"/>
+              <primitive id="B" class="ocf" provider="pacemaker" type="Dummy"/>
+              %s
+            </resources>
+            <constraints>%s</constraints>
+            %s
+          </configuration>
+          <status/>
+        </cib>''' % (resources, constraints, extra))
+
+
+def plan(cib_root, kind=None):
+    planner = CompactionPlanner(cib_root)
+    items = planner.compute()
+    return planner, [item for item in items if kind is None or item['kind'] == kind]
+
+
+def apply_plan(items):
+    for item in items:
+        item['_apply']()
+
+
+def constraint_ids(cib_root):
+    return [constraint.attrib['id'] for constraint in cib_root.find('./configuration/constraints')]
+
+
+def test_orphaned_constraint_is_removed():
+    cib_root = cib(constraints='''
+        <rsc_location id="loc-A" rsc="A" node="node1" score="100"/>
+        <rsc_location id="loc-gone" rsc="gone" node="node1" score="100"/>
+        <rsc_order id="order-A-gone" first="A" then="gone"/>''')
+    planner, items = plan(cib_root, 'orphans')
+    assert [(item['action'], item['constraints']) for item in items] == [
+        ('remove_constraint', ['loc-gone']), ('remove_constraint', ['order-A-gone'])]
+    assert planner.findings['missing_references'] == [
+        {'constraint': 'loc-gone', 'missing': ['gone']}, {'constraint': 'order-A-gone', 'missing': ['gone']}]
+    apply_plan(items)
+    assert constraint_ids(cib_root) == ['loc-A']
+
+
+def test_missing_references_are_removed_from_resource_sets():
+    cib_root = cib(constraints='''
+        <rsc_order id="order-set">
+          <resource_set id="order-set-1"><resource_ref id="A"/><resource_ref id="gone"/></resource_set>
+          <resource_set id="order-set-2"><resource_ref id="gone2"/></resource_set>
+          <resource_set id="order-set-3"><resource_ref id="B"/></resource_set>
+        </rsc_order>''')
+    planner, items = plan(cib_root, 'orphans')
+    assert [(item['action'], item['constraints']) for item in items] == [('remove_references', ['order-set'])]
+    apply_plan(items)
+    constraint = cib_root.find("./configuration/constraints/rsc_order")
+    assert [resource_set.attrib['id'] for resource_set in constraint.findall('resource_set')] == ['order-set-1', 'order-set-3']
+    assert [ref.attrib['id'] for ref in constraint.iter('resource_ref')] == ['A', 'B']
+
+
+def test_resource_set_constraint_without_existing_resources_is_removed():
+    cib_root = cib(constraints='''
+        <rsc_colocation id="colocation-set" score="INFINITY">
+          <resource_set id="colocation-set-1"><resource_ref id="gone"/><resource_ref id="gone2"/></resource_set>
+        </rsc_colocation>''')
+    planner, items = plan(cib_root, 'orphans')
+    assert [(item['action'], item['constraints']) for item in items] == [('remove_constraint', ['colocation-set'])]
+
+
+def test_references_to_templates_tags_and_patterns_are_not_orphans():
+    cib_root = cib(
+        resources='<template id="web-template" class="ocf" provider="heartbeat" type="apache"/>',
+        constraints='''
+            <rsc_location id="loc-template" rsc="web-template" node="node1" score="100"/>
+            <rsc_location id="loc-tag" rsc="all-dummies" node="node1" score="100"/>
+            <rsc_location id="loc-pattern" rsc-pattern="dummy-.*" node="node1" score="100"/>''',
+        extra='<tags><tag id="all-dummies"><obj_ref id="A"/><obj_ref id="B"/></tag></tags>')
+    planner, items = plan(cib_root, 'orphans')
+    assert items == []
+    assert planner.findings['missing_references'] == []
+
+
+def test_duplicate_constraints_are_removed():
+    cib_root = cib(constraints='''
+        <rsc_colocation id="col-1" rsc="A" with-rsc="B" score="INFINITY"/>
+        <rsc_order id="order-1" first="A" then="B"/>
+        <rsc_colocation id="col-2" with-rsc="B" rsc="A" score="INFINITY"/>
+        <rsc_colocation id="col-3" rsc="A" with-rsc="B" score="100"/>
+        <rsc_colocation id="col-4" rsc="A" with-rsc="B" score="INFINITY"/>''')
+    planner, items = plan(cib_root, 'duplicates')
+    assert [(item['action'], item['constraints']) for item in items] == [('remove_constraint', ['col-2', 'col-4'])]
+    assert planner.findings['duplicate_constraints'] == [{'kept': 'col-1', 'duplicates': ['col-2', 'col-4']}]
+    apply_plan(items)
+    assert constraint_ids(cib_root) == ['col-1', 'order-1', 'col-3']
+
+
+def test_duplicates_compare_resource_sets_by_references():
+    cib_root = cib(constraints='''
+        <rsc_order id="order-set-1">
+          <resource_set id="order-set-1-set"><resource_ref id="A"/><resource_ref id="B"/></resource_set>
+        </rsc_order>
+        <rsc_order id="order-set-2">
+          <resource_set id="order-set-2-set"><resource_ref id="A"/><resource_ref id="B"/></resource_set>
+        </rsc_order>
+        <rsc_order id="order-set-3">
+          <resource_set id="order-set-3-set"><resource_ref id="B"/><resource_ref id="A"/></resource_set>
+        </rsc_order>''')
+    planner, items = plan(cib_root, 'duplicates')
+    # order of resources in set matters
+    assert [item['constraints'] for item in items] == [['order-set-2']]
+
+
+def test_orphaned_duplicates_are_removed_only_once():
+    cib_root = cib(constraints='''
+        <rsc_location id="loc-gone-1" rsc="gone" node="node1" score="100"/>
+        <rsc_location id="loc-gone-2" rsc="gone" node="node1" score="100"/>''')
+    planner, items = plan(cib_root)
+    assert [(item['kind'], item['constraints']) for item in items] == [('orphans', ['loc-gone-1']), ('orphans', ['loc-gone-2'])]
+    apply_plan(items)
+    assert constraint_ids(cib_root) == []
+
+
+def test_empty_nvsets_are_removed():
+    cib_root = cib(resources='''
+        <primitive id="C" class="ocf" provider="pacemaker" type="Dummy">
+          <meta_attributes id="C-meta_attributes"/>
+          <instance_attributes id="C-instance_attributes"><nvpair id="C-ia-state" name="state" value="x"/></instance_attributes>
+        </primitive>''')
+    planner, items = plan(cib_root, 'empty_nvsets')
+    assert planner.findings['empty_nvsets'] == 1
+    assert [item['action'] for item in items] == ['remove_nvsets']
+    apply_plan(items)
+    primitive = cib_root.find("./configuration/resources/primitive[@id='C']")
+    assert [child.attrib['id'] for child in primitive] == ['C-instance_attributes']
+
+
+def test_referenced_and_referencing_nvsets_are_kept():
+    cib_root = cib(resources='''
+        <primitive id="C" class="ocf" provider="pacemaker" type="Dummy">
+          <meta_attributes id="shared-meta"/>
+        </primitive>
+        <primitive id="D" class="ocf" provider="pacemaker" type="Dummy">
+          <meta_attributes id-ref="shared-meta"/>
+        </primitive>''')
+    planner, items = plan(cib_root, 'empty_nvsets')
+    assert planner.findings['empty_nvsets'] == 0
+    assert items == []
+
+
+def test_plan_without_constraints_section():
+    cib_root = ET.fromstring('<cib><configuration><resources/></configuration><status/></cib>')
+    planner, items = plan(cib_root)
+    assert items == []